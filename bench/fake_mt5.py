@@ -0,0 +1,220 @@
+# fake_mt5.py
+"""
+MetaTrader5 모듈 대신 쓰는 가짜 터미널 (리눅스 벤치마크/리플레이용, 네트워크/터미널 없음).
+
+    from bench.fake_mt5 import FakeMT5, install
+    mt5 = install(FakeMT5(history=100000))  # sys.modules['MetaTrader5'] + 공용 세션 backend 교체
+    get_mt5_ohlcv("GBPJPY", n=300)          # 가짜 봉
+    mt5.advance(60)                         # 가짜 시계 60초 진행 -> 새 틱/봉이 보임
+
+- 시세는 bench.synthetic 으로 (심볼, 타임프레임)마다 처음 요청할 때 생성 (시드 고정)
+- 시계(now) 이전의 봉/틱만 보임. 시작 시점 기준 과거 history 개 봉 + 앞으로 future 개 봉을 미리 생성
+- disconnect() 로 연결 끊김 흉내 (initialize 전까지 모든 호출이 None)
+- 타임프레임별 시세는 서로 독립 (M1 을 모아도 M5 와 같지 않음)
+- 주문/포지션/체결 조회는 bench.sim_broker.SimBroker 가 처리 (지연/슬리피지/거부/브로커 TP·SL 흉내)
+"""
+import sys
+from collections import Counter
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+from bench.sim_broker import SimBroker
+from bench.synthetic import DEFAULT_START, symbol_seed, synthetic_rates, synthetic_ticks
+
+# MetaTrader5 패키지와 같은 값
+TIMEFRAMES = {
+    'TIMEFRAME_M1': 1, 'TIMEFRAME_M5': 5, 'TIMEFRAME_M15': 15, 'TIMEFRAME_M30': 30,
+    'TIMEFRAME_H1': 16385, 'TIMEFRAME_H4': 16388, 'TIMEFRAME_D1': 16408,
+}
+TIMEFRAME_TO_SECONDS = {
+    1: 60, 5: 300, 15: 900, 30: 1800, 16385: 3600, 16388: 14400, 16408: 86400,
+}
+TRADE_CONSTANTS = {
+    'TRADE_ACTION_DEAL': 1, 'ORDER_TYPE_BUY': 0, 'ORDER_TYPE_SELL': 1,
+    'ORDER_TIME_GTC': 0, 'ORDER_FILLING_IOC': 1, 'ORDER_FILLING_FOK': 0,
+    'TRADE_RETCODE_REJECT': 10006, 'TRADE_RETCODE_PLACED': 10008, 'TRADE_RETCODE_DONE': 10009,
+    'TRADE_RETCODE_DONE_PARTIAL': 10010, 'TRADE_RETCODE_INVALID': 10013,
+    'DEAL_ENTRY_IN': 0, 'DEAL_ENTRY_OUT': 1, 'DEAL_REASON_SL': 4, 'DEAL_REASON_TP': 5,
+}
+RES_S_OK = 1
+RES_E_INTERNAL_FAIL_INIT = -10005
+RES_E_NO_IPC = -10004
+
+
+def base_price(symbol):
+    if 'XAU' in symbol:
+        return 2000.0
+    if 'JPY' in symbol:
+        return 150.0
+    return 1.1
+
+
+def _epoch(t):
+    if isinstance(t, datetime):
+        return t.timestamp()
+    return float(t)
+
+
+class FakeMT5:
+    COPY_TICKS_ALL = -1
+    COPY_TICKS_INFO = 1
+    COPY_TICKS_TRADE = 2
+
+    def __init__(self, history=100000, future=20000, seed=0, now=DEFAULT_START, tick_count=200000,
+                 balance=10000.0, currency='JPY', broker=None):
+        """
+        history: 시작 시점(now) 이전 봉 개수 (타임프레임마다)
+        future: advance 로 시계를 돌렸을 때 새로 보일 봉 개수
+        tick_count: 심볼마다 now 이후로 미리 만들 틱 개수
+        """
+        for name, value in {**TIMEFRAMES, **TRADE_CONSTANTS}.items():
+            setattr(self, name, value)
+        self.history = history
+        self.future = future
+        self.seed = seed
+        self.now = float(now)
+        self.tick_count = tick_count
+        self.balance = balance
+        self.currency = currency
+        self.initialized = False
+        self.calls = Counter()
+        self._error = (RES_S_OK, 'Success')
+        self._rates = {}  # (symbol, timeframe) -> RATE_DTYPE 배열
+        self._ticks = {}  # symbol -> TICK_DTYPE 배열
+        self._start = float(now)
+        self.broker = broker or SimBroker()
+        self.broker.terminal = self
+
+    # ---- 시계/장애 흉내 ----
+    def advance(self, seconds):
+        self.now += seconds
+        self.broker.process()
+
+    def disconnect(self):
+        self.initialized = False
+        self._error = (RES_E_NO_IPC, 'No IPC connection')
+
+    def _ok(self, name):
+        self.calls[name] += 1
+        if not self.initialized:
+            self._error = (RES_E_NO_IPC, 'No IPC connection')
+            return False
+        return True
+
+    # ---- 데이터 ----
+    def rates(self, symbol, timeframe):
+        """(심볼, 타임프레임) 전체 봉 (미래 포함)"""
+        key = (symbol, timeframe)
+        arr = self._rates.get(key)
+        if arr is None:
+            seconds = TIMEFRAME_TO_SECONDS[timeframe]
+            first = int(self._start) // seconds * seconds - (self.history - 1) * seconds
+            arr = self._rates[key] = synthetic_rates(
+                self.history + self.future, seed=symbol_seed(f"{symbol}/{timeframe}", self.seed),
+                start=first, seconds=seconds, price=base_price(symbol)
+            )
+        return arr
+
+    def ticks(self, symbol):
+        arr = self._ticks.get(symbol)
+        if arr is None:
+            arr = self._ticks[symbol] = synthetic_ticks(
+                self.tick_count, seed=symbol_seed(symbol, self.seed),
+                start_msc=int(self._start * 1000), price=base_price(symbol)
+            )
+        return arr
+
+    def _visible_rates(self, symbol, timeframe):
+        arr = self.rates(symbol, timeframe)
+        return arr[:np.searchsorted(arr['time'], self.now, side='right')]
+
+    def _visible_ticks(self, symbol):
+        arr = self.ticks(symbol)
+        return arr[:np.searchsorted(arr['time_msc'], self.now * 1000, side='right')]
+
+    # ---- MetaTrader5 API ----
+    def initialize(self, *args, **kwargs):
+        self.calls['initialize'] += 1
+        self.initialized = True
+        self._error = (RES_S_OK, 'Success')
+        return True
+
+    def shutdown(self):
+        self.calls['shutdown'] += 1
+        self.initialized = False
+        return True
+
+    def last_error(self):
+        return self._error
+
+    def terminal_info(self):
+        if not self._ok('terminal_info'):
+            return None
+        return SimpleNamespace(connected=True, trade_allowed=True, name='FakeMT5', build=0)
+
+    def account_info(self):
+        if not self._ok('account_info'):
+            return None
+        return SimpleNamespace(login=10000001, balance=self.balance, equity=self.balance,
+                               currency=self.currency, leverage=100, server='FakeServer')
+
+    def symbol_info(self, symbol):
+        if not self._ok('symbol_info'):
+            return None
+        digits = 2 if base_price(symbol) >= 100 else 5
+        return SimpleNamespace(name=symbol, digits=digits, point=10.0 ** -digits, visible=True,
+                               trade_contract_size=100000.0, volume_min=0.01, volume_step=0.01)
+
+    def symbol_info_tick(self, symbol):
+        if not self._ok('symbol_info_tick'):
+            return None
+        ticks = self._visible_ticks(symbol)
+        tick = ticks[-1] if len(ticks) else self.ticks(symbol)[0]
+        return SimpleNamespace(**{name: tick[name].item() for name in tick.dtype.names})
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        if not self._ok('copy_rates_from_pos'):
+            return None
+        arr = self._visible_rates(symbol, timeframe)
+        end = len(arr) - start_pos
+        return arr[max(0, end - count):max(0, end)].copy()
+
+    def copy_rates_from(self, symbol, timeframe, date_from, count):
+        if not self._ok('copy_rates_from'):
+            return None
+        arr = self._visible_rates(symbol, timeframe)
+        end = np.searchsorted(arr['time'], _epoch(date_from), side='right')
+        return arr[max(0, end - count):end].copy()
+
+    def copy_ticks_from(self, symbol, date_from, count, flags):
+        if not self._ok('copy_ticks_from'):
+            return None
+        arr = self._visible_ticks(symbol)
+        start = np.searchsorted(arr['time_msc'], int(_epoch(date_from) * 1000), side='left')
+        return arr[start:start + count].copy()
+
+    def order_send(self, request):
+        if not self._ok('order_send'):
+            return None
+        return self.broker.order_send(request)
+
+    def positions_get(self, symbol=None, ticket=None):
+        if not self._ok('positions_get'):
+            return None
+        return self.broker.positions_get(symbol=symbol, ticket=ticket)
+
+    def history_deals_get(self, *args, **kwargs):
+        if not self._ok('history_deals_get'):
+            return None
+        return self.broker.history_deals_get(*args, **kwargs)
+
+
+def install(fake=None):
+    """가짜 모듈을 MetaTrader5 로 등록하고 공용 세션 backend 로 지정. 등록한 FakeMT5 반환"""
+    from dataMT5.session import set_backend
+    fake = fake or FakeMT5()
+    sys.modules['MetaTrader5'] = fake
+    set_backend(fake)
+    return fake
@@ -0,0 +1,323 @@
+# run.py
+"""
+벤치마크 실행기 (MetaTrader5 / 터미널 없이 리눅스에서 실행).
+
+    python -m bench.run                  # 전체 (봉 100 ~ 1M, 심볼 1 ~ 100)
+    python -m bench.run --quick          # 봉 10k, 심볼 10 까지만
+    python -m bench.run --only ichimoku  # 이름에 포함된 케이스만
+
+결과는 bench/results/bench-<시각>.json 에 저장하고, 같은 폴더의 직전 결과(또는 --compare 파일)와
+케이스별 best 시간을 비교해서 threshold 배 이상 느려진 케이스를 표시함.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+LENGTHS = [100, 1_000, 10_000, 100_000, 1_000_000]
+SYMBOL_COUNTS = [1, 10, 100]
+QUICK_LENGTHS = [100, 1_000, 10_000]
+QUICK_SYMBOL_COUNTS = [1, 10]
+REPLAY_TICKS = [10_000]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def measure(fn, min_time=0.2, repeat=5, max_time=5.0):
+    """
+    fn() 1회 시간 (us). 1회 샘플이 min_time/repeat 이상 되도록 반복 횟수를 맞춘 뒤 repeat 번 측정.
+    1회가 max_time 보다 오래 걸리면 그 1번만 사용
+    """
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= max_time and number == 1:
+            samples = [elapsed]
+            break
+        if elapsed >= min_time / repeat:
+            samples = [elapsed / number]
+            for _ in range(repeat - 1):
+                t0 = time.perf_counter()
+                for _ in range(number):
+                    fn()
+                samples.append((time.perf_counter() - t0) / number)
+            break
+        number *= 10 if elapsed < min_time / repeat / 10 else 2
+    samples.sort()
+    return {
+        'best_us': samples[0] * 1e6,
+        'median_us': samples[len(samples) // 2] * 1e6,
+        'number': number,
+        'repeat': len(samples),
+    }
+
+
+# ---- 케이스 ----
+# 각 케이스 함수는 (이름, make) 를 yield. make() 가 준비 작업 후 측정 대상 fn 을 반환
+# (--only 로 걸러진 케이스는 준비 작업도 하지 않음)
+
+def bench_strategy(lengths):
+    from bench.synthetic import synthetic_frame
+    from strategy.real_Ichimoku_Strategy import IchimokuBreakoutStrategyRT
+    for n in lengths:
+        frame = {}
+
+        def df(n=n, frame=frame):
+            if 'df' not in frame:
+                frame['df'] = synthetic_frame(n, seed=n)
+            return frame['df']
+
+        def make_calc(df=df):
+            strat, data = IchimokuBreakoutStrategyRT(), df()
+            return lambda: strat.calculate_ichimoku(data)
+        yield f"calculate_ichimoku[{n}]", make_calc
+
+        def make_full(df=df):
+            strat, data = IchimokuBreakoutStrategyRT(incremental=False), df()
+            return lambda: strat.check_entry_signal(data)
+        yield f"check_entry_signal_full[{n}]", make_full
+
+        def make_check(df=df):
+            # 지표 그래프는 첫 호출에서 rolling 스트림을 채움 -> 이후 호출(같은 봉, 캐시)만 측정
+            strat, data = IchimokuBreakoutStrategyRT(), df()
+            strat.check_entry_signal(data)
+            return lambda: strat.check_entry_signal(data)
+        yield f"check_entry_signal[{n}]", make_check
+
+        def make_on_tick(df=df):
+            strat, data = IchimokuBreakoutStrategyRT(), df()
+            price = float(data['close'].iat[-1])
+            strat.on_tick(data, price)
+
+            def on_tick():
+                strat.position = 0
+                strat.on_tick(data, price)
+            return on_tick
+        yield f"on_tick[{n}]", make_on_tick
+
+        def make_on_tick_cached(df=df):
+            # 엔진 경로: 봉 상태가 그대로인 틱 (캐시된 진입 판단만)
+            strat, data = IchimokuBreakoutStrategyRT(), df()
+            price = float(data['close'].iat[-1])
+            strat.on_tick(data, price, bar_state=(1, 1))
+
+            def on_tick():
+                strat.position = 0
+                strat.on_tick(data, price, bar_state=(1, 1))
+            return on_tick
+        yield f"on_tick_cached[{n}]", make_on_tick_cached
+
+
+def bench_bars(lengths):
+    from bench.synthetic import synthetic_rates
+    from dataMT5.resampler import Bar, BarSeries
+    for n in lengths:
+        def make_new_bar(n=n):
+            # 새 봉 마감 -> 봉 이력에 추가 + sync (링 버퍼 값 쓰기만)
+            series = BarSeries(300, history=n)
+            series.set_rates(synthetic_rates(n, seed=n))
+            t = int(series.bars.last('time'))
+            bar = Bar(t, 150.0)
+
+            def new_bar():
+                bar.time += 300
+                series.apply(bar)
+                series.sync()
+            return new_bar
+        yield f"bar_series_new_bar[{n}]", make_new_bar
+
+
+def bench_collector(lengths):
+    from dataMT5.collector import get_mt5_ohlcv
+    for n in lengths:
+        yield f"get_mt5_ohlcv_nocache[{n}]", lambda n=n: lambda: get_mt5_ohlcv("GBPJPY", n=n, cache=False)
+
+        def make_cached(n=n):
+            get_mt5_ohlcv("GBPJPY", n=n)  # 캐시 채우기
+            return lambda: get_mt5_ohlcv("GBPJPY", n=n)
+        yield f"get_mt5_ohlcv_cached[{n}]", make_cached
+
+
+def bench_symbols(symbol_counts, bars=300):
+    from bench.fake_mt5 import FakeMT5, install
+    from bench.synthetic import synthetic_frame, symbol_seed
+    from strategy.batch_ichimoku import stack_ohlc, batch_entry_signal
+    from strategy.real_Ichimoku_Strategy import IchimokuBreakoutStrategyRT
+    from engine.trading_engine import TradingEngine, SymbolTrader
+    from engine.latency import LatencyRecorder
+
+    for k in symbol_counts:
+        symbols = [f"SYM{i:03d}JPY" for i in range(k)]
+
+        def make_loop(symbols=symbols):
+            strats = [IchimokuBreakoutStrategyRT(symbol=s) for s in symbols]
+            frames = [synthetic_frame(bars, seed=symbol_seed(s)) for s in symbols]
+            for strat, df in zip(strats, frames):
+                strat.check_entry_signal(df)
+
+            def loop():
+                for strat, df in zip(strats, frames):
+                    strat.check_entry_signal(df)
+            return loop
+        yield f"symbols_check_entry_signal[{k}]", make_loop
+
+        def make_batch(symbols=symbols):
+            frames = [synthetic_frame(bars, seed=symbol_seed(s)) for s in symbols]
+
+            def batch():
+                high, low, close, lengths = stack_ohlc(frames, bars)
+                batch_entry_signal(high, low, close, 0.01, lengths)
+            return batch
+        yield f"symbols_batch_entry_signal[{k}]", make_batch
+
+        def make_cycle(symbols=symbols):
+            # 엔진 1주기 (가짜 터미널에서 틱 수집 + 봉 반영 + 전략 판단)
+            # 심볼이 많으므로 이력/틱을 작게 만든 터미널로 교체 (1M 봉 x 100 심볼은 메모리 초과)
+            # 초기 이력은 M1 을 받아 M5 로 리샘플하므로 M1 이 (bars + 1) x 5 개 이상 필요
+            fake = install(FakeMT5(history=bars * 6, future=bars, tick_count=10000))
+            engine = TradingEngine(log_fn=lambda text: None, latency=LatencyRecorder(enabled=False))
+            for s in symbols:
+                engine.add(SymbolTrader(IchimokuBreakoutStrategyRT(symbol=s), s, latency=engine.latency))
+            engine.run_once()
+
+            def cycle():
+                fake.advance(0.2)
+                engine.run_once()
+            return cycle
+        yield f"engine_cycle[{k}]", make_cycle
+
+
+def bench_replay(tick_counts, bars=400):
+    from bench.synthetic import synthetic_frame, synthetic_ticks
+    from engine.replay import Replay
+    from strategy.real_Ichimoku_Strategy import IchimokuBreakoutStrategyRT
+    for n in tick_counts:
+        def make_replay(n=n):
+            # 실시간 경로 전체 (틱 수집 -> 봉 집계 -> 진입/청산 판단 -> 결과 처리) 를 최대 속도로
+            start = 1_700_000_000 // 300 * 300
+            history = synthetic_frame(bars, seed=3, start=start - bars * 300)
+            ticks = synthetic_ticks(n, seed=4, start_msc=start * 1000, price=float(history['close'].iat[-1]),
+                                    vol=0.0002, trend_period=3000)
+
+            def replay():
+                r = Replay()
+                r.add(IchimokuBreakoutStrategyRT(symbol="GBPJPY"), "GBPJPY", ticks, history)
+                r.run()
+            return replay
+        yield f"replay_ticks[{n}]", make_replay
+
+
+# ---- 결과 저장/비교 ----
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    except OSError:
+        return None
+
+
+def _meta():
+    import numpy as np
+    import pandas as pd
+    return {
+        'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+    }
+
+
+def latest_result(results_dir):
+    files = sorted(glob.glob(os.path.join(results_dir, 'bench-*.json')))
+    return files[-1] if files else None
+
+
+def compare(results, previous, threshold=1.25):
+    """케이스별 (이름, 이번, 이전, 비율) 목록과 threshold 배 이상 느려진 이름 목록"""
+    rows, regressions = [], []
+    for name, stat in results.items():
+        prev = previous.get(name)
+        if prev is None:
+            rows.append((name, stat['best_us'], None, None))
+            continue
+        ratio = stat['best_us'] / prev['best_us'] if prev['best_us'] > 0 else None
+        rows.append((name, stat['best_us'], prev['best_us'], ratio))
+        if ratio is not None and ratio >= threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="autoTradeMT5 벤치마크")
+    parser.add_argument('--quick', action='store_true', help="봉 10k, 심볼 10 까지만")
+    parser.add_argument('--only', default=None, help="이름에 이 문자열이 들어간 케이스만")
+    parser.add_argument('--out', default=RESULTS_DIR, help="결과 저장 폴더")
+    parser.add_argument('--compare', default=None, help="비교할 이전 결과 파일 (기본: 폴더의 최근 결과)")
+    parser.add_argument('--threshold', type=float, default=1.25, help="이 배율 이상 느려지면 회귀로 표시")
+    parser.add_argument('--min-time', type=float, default=0.2, help="케이스당 최소 측정 시간 (초)")
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args(argv)
+
+    # 캐시는 임시 폴더로 (실제 ~/.autoTradeMT5 캐시를 건드리지 않음). dataMT5 import 전에 설정
+    os.environ['AUTOTRADE_CACHE_DIR'] = tempfile.mkdtemp(prefix='autotrade-bench-')
+    from bench.fake_mt5 import FakeMT5, install
+
+    lengths = QUICK_LENGTHS if args.quick else LENGTHS
+    symbol_counts = QUICK_SYMBOL_COUNTS if args.quick else SYMBOL_COUNTS
+    install(FakeMT5(history=max(lengths)))
+    groups = [
+        bench_strategy(lengths),
+        bench_bars(lengths),
+        bench_collector(lengths),
+        bench_symbols(symbol_counts),
+        bench_replay(REPLAY_TICKS),
+    ]
+
+    results = {}
+    for group in groups:
+        for name, make in group:
+            if args.only and args.only not in name:
+                continue
+            stat = measure(make(), min_time=args.min_time)
+            results[name] = stat
+            print(f"{name:<40} {stat['best_us']:>14.1f} us  (x{stat['number']})", flush=True)
+
+    previous_path = args.compare or latest_result(args.out)
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, time.strftime('bench-%Y%m%d-%H%M%S.json'))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': _meta(), 'results': results}, f, indent=1)
+    print(f"\n결과 저장: {path}")
+
+    if not previous_path:
+        return 0
+    with open(previous_path, encoding='utf-8') as f:
+        previous = json.load(f)
+    rows, regressions = compare(results, previous['results'], args.threshold)
+    print(f"비교 대상: {previous_path} (commit {previous['meta'].get('commit')})")
+    for name, cur, prev, ratio in rows:
+        if prev is None:
+            print(f"{name:<40} {cur:>14.1f} us  (새 케이스)")
+            continue
+        mark = "  <-- 느려짐" if name in regressions else ""
+        print(f"{name:<40} {cur:>14.1f} us  이전 {prev:>14.1f} us  x{ratio:.2f}{mark}")
+    if regressions:
+        print(f"\n{len(regressions)}개 케이스가 {args.threshold}배 이상 느려짐")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+# sim_broker.py
+"""
+FakeMT5 에 붙는 가짜 브로커 (order_send / positions_get / history_deals_get).
+
+    broker = SimBroker(ack_latency=0.02, fill_latency=0.1, slippage_pips=0.3, pip=0.01)
+    mt5 = install(FakeMT5(broker=broker))
+
+- ack_latency: order_send 가 돌아오기까지 실제로 기다리는 시간 (초, 네트워크 왕복 흉내)
+- fill_latency: 0 이면 order_send 응답에 체결(deal) 포함, 아니면 PLACED 로 응답하고 이 시간(초) 뒤 체결
+- 체결가 = 체결 시점 호가 (매수 ask / 매도 bid) + 불리한 방향 slippage_pips (+ 0~slippage_jitter 무작위)
+- reject_rate: 이 확률로 거부 (TRADE_RETCODE_REJECT)
+- TP/SL 은 브로커 쪽에서 처리: 가짜 시계가 진행될 때 보이는 틱으로 도달 여부 확인 (롱은 bid, 숏은 ask)
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+TRADE_RETCODE_PLACED = 10008
+TRADE_RETCODE_DONE = 10009
+TRADE_RETCODE_REJECT = 10006
+TRADE_RETCODE_INVALID = 10013
+DEAL_ENTRY_IN = 0
+DEAL_ENTRY_OUT = 1
+DEAL_REASON_EXPERT = 3
+DEAL_REASON_SL = 4
+DEAL_REASON_TP = 5
+
+
+class SimBroker:
+    def __init__(self, ack_latency=0.0, fill_latency=0.0, slippage_pips=0.0, slippage_jitter=0.0,
+                 reject_rate=0.0, pip=0.01, seed=0):
+        self.ack_latency = ack_latency
+        self.fill_latency = fill_latency
+        self.slippage_pips = slippage_pips
+        self.slippage_jitter = slippage_jitter
+        self.reject_rate = reject_rate
+        self.pip = pip
+        self.terminal = None       # FakeMT5 (FakeMT5.__init__ 에서 연결)
+        self.positions = {}        # ticket -> position
+        self.deals = []
+        self._pending = []         # (체결 시각 monotonic, 주문 ticket, request)
+        self._checked_msc = {}     # ticket -> TP/SL 확인한 마지막 틱 시각
+        self._next_ticket = 1000
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.RLock()
+
+    def _ticket(self):
+        self._next_ticket += 1
+        return self._next_ticket
+
+    def _quote(self, symbol):
+        ticks = self.terminal._visible_ticks(symbol)
+        tick = ticks[-1] if len(ticks) else self.terminal.ticks(symbol)[0]
+        return float(tick['bid']), float(tick['ask']), int(tick['time_msc'])
+
+    # ---- MetaTrader5 API ----
+    def order_send(self, request):
+        if self.ack_latency > 0:
+            time.sleep(self.ack_latency)
+        with self._lock:
+            self.process()
+            ticket = self._ticket()
+            if request.get('type') not in (0, 1) or request.get('volume', 0) <= 0:
+                return self._result(TRADE_RETCODE_INVALID, request, ticket, comment='Invalid request')
+            if self.reject_rate > 0 and self._rng.random() < self.reject_rate:
+                return self._result(TRADE_RETCODE_REJECT, request, ticket, comment='Rejected')
+            if self.fill_latency > 0:
+                self._pending.append((time.monotonic() + self.fill_latency, ticket, dict(request)))
+                return self._result(TRADE_RETCODE_PLACED, request, ticket, comment='Placed')
+            deal = self._open(ticket, request)
+            return self._result(TRADE_RETCODE_DONE, request, ticket, deal=deal.ticket, price=deal.price,
+                                comment='Request executed')
+
+    def positions_get(self, symbol=None, ticket=None):
+        with self._lock:
+            self.process()
+            return tuple(p for p in self.positions.values()
+                         if (symbol is None or p.symbol == symbol) and (ticket is None or p.ticket == ticket))
+
+    def history_deals_get(self, *args, position=None, ticket=None, **kwargs):
+        with self._lock:
+            self.process()
+            return tuple(d for d in self.deals
+                         if (position is None or d.position_id == position) and (ticket is None or d.ticket == ticket))
+
+    # ---- 내부 처리 ----
+    def _result(self, retcode, request, ticket, deal=0, price=0.0, comment=''):
+        return SimpleNamespace(retcode=retcode, deal=deal, order=ticket, volume=request.get('volume', 0.0),
+                               price=price, bid=0.0, ask=0.0, comment=comment, request_id=ticket,
+                               request=request)
+
+    def _open(self, ticket, request):
+        symbol, side = request['symbol'], 1 if request['type'] == 0 else -1
+        bid, ask, msc = self._quote(symbol)
+        slip = self.slippage_pips
+        if self.slippage_jitter > 0:
+            slip += self._rng.random() * self.slippage_jitter
+        price = (ask if side == 1 else bid) + side * slip * self.pip
+        position = SimpleNamespace(ticket=ticket, symbol=symbol, type=request['type'], volume=request['volume'],
+                                   price_open=price, sl=request.get('sl', 0.0), tp=request.get('tp', 0.0),
+                                   time_msc=msc, magic=request.get('magic', 0), comment=request.get('comment', ''))
+        self.positions[ticket] = position
+        self._checked_msc[ticket] = msc
+        return self._deal(position, DEAL_ENTRY_IN, price, msc, DEAL_REASON_EXPERT)
+
+    def _deal(self, position, entry, price, msc, reason):
+        side = 1 if position.type == 0 else -1
+        profit = 0.0 if entry == DEAL_ENTRY_IN else (price - position.price_open) * side * position.volume
+        deal = SimpleNamespace(ticket=self._ticket(), order=position.ticket, position_id=position.ticket,
+                               symbol=position.symbol, type=position.type if entry == DEAL_ENTRY_IN else 1 - position.type,
+                               entry=entry, price=price, volume=position.volume, time_msc=msc,
+                               time=msc // 1000, profit=profit, reason=reason, magic=position.magic)
+        self.deals.append(deal)
+        return deal
+
+    def process(self):
+        """지연 체결 처리 + 보유 포지션 TP/SL 확인 (가짜 시계가 움직일 때/조회할 때 호출)"""
+        with self._lock:
+            if self._pending:
+                now = time.monotonic()
+                due = [p for p in self._pending if p[0] <= now]
+                if due:
+                    self._pending = [p for p in self._pending if p[0] > now]
+                    for _, ticket, request in due:
+                        self._open(ticket, request)
+            for ticket in list(self.positions):
+                self._check_exit(self.positions[ticket])
+
+    def _check_exit(self, position):
+        ticks = self.terminal._visible_ticks(position.symbol)
+        start = np.searchsorted(ticks['time_msc'], self._checked_msc[position.ticket], side='right')
+        ticks = ticks[start:]
+        if len(ticks) == 0:
+            return
+        self._checked_msc[position.ticket] = int(ticks['time_msc'][-1])
+        if position.type == 0:
+            price = ticks['bid']
+            hit_tp = price >= position.tp if position.tp else np.zeros(len(price), bool)
+            hit_sl = price <= position.sl if position.sl else np.zeros(len(price), bool)
+        else:
+            price = ticks['ask']
+            hit_tp = price <= position.tp if position.tp else np.zeros(len(price), bool)
+            hit_sl = price >= position.sl if position.sl else np.zeros(len(price), bool)
+        hit = np.flatnonzero(hit_tp | hit_sl)
+        if hit.size == 0:
+            return
+        k = hit[0]
+        # 같은 틱에서 둘 다면 SL 우선 (보수적으로)
+        if hit_sl[k]:
+            exit_price, reason = position.sl, DEAL_REASON_SL
+        else:
+            exit_price, reason = position.tp, DEAL_REASON_TP
+        del self.positions[position.ticket]
+        del self._checked_msc[position.ticket]
+        self._deal(position, DEAL_ENTRY_OUT, exit_price, int(ticks['time_msc'][k]), reason)
@@ -0,0 +1,72 @@
+# synthetic.py
+"""
+결정적(시드 고정) 가짜 시세 생성기. 같은 (심볼, 시드, 길이) 면 항상 같은 값.
+
+    rates = synthetic_rates(100000, seed=symbol_seed("GBPJPY"))   # MT5 copy_rates_* 와 같은 구조체
+    df = synthetic_frame(100000)                                   # get_mt5_ohlcv 와 같은 DataFrame
+    ticks = synthetic_ticks(50000, start_msc=..., price=df['close'].iat[-1])
+
+가격은 로그 랜덤워크 + 천천히 바뀌는 추세(사인파)라 이치모쿠 돌파 신호가 적당히 나옴.
+"""
+import zlib
+
+import numpy as np
+
+from dataMT5.ohlcv_store import RATE_DTYPE, rates_to_frame
+from dataMT5.tick_stream import TICK_DTYPE
+
+DEFAULT_START = 1_700_000_100 // 86400 * 86400  # 2023-11-14 00:00 UTC
+
+
+def symbol_seed(symbol, seed=0):
+    """심볼 이름 -> 시드 (심볼마다 다른 경로, 실행마다 같은 값)"""
+    return zlib.crc32(symbol.encode()) ^ seed
+
+
+def _log_path(n, rng, vol, trend_period):
+    steps = rng.standard_normal(n) * vol
+    # 추세 구간이 있어야 돌파 신호가 나옴
+    steps += 0.3 * vol * np.sin(2 * np.pi * np.arange(n) / trend_period)
+    return np.cumsum(steps)
+
+
+def synthetic_rates(n, seed=0, start=DEFAULT_START, seconds=300, price=150.0, vol=0.0004,
+                    trend_period=500):
+    """n개 봉 RATE_DTYPE 구조체 배열 (time 은 start 부터 seconds 간격, epoch 초)"""
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(_log_path(n, rng, vol, trend_period))
+    open_ = np.empty(n)
+    open_[0] = price
+    open_[1:] = close[:-1]
+    wick = np.abs(rng.standard_normal((2, n))) * vol * 0.5 * close
+    rates = np.zeros(n, dtype=RATE_DTYPE)
+    rates['time'] = start + seconds * np.arange(n, dtype=np.int64)
+    rates['open'] = open_
+    rates['close'] = close
+    rates['high'] = np.maximum(open_, close) + wick[0]
+    rates['low'] = np.minimum(open_, close) - wick[1]
+    rates['tick_volume'] = rng.integers(10, 500, n)
+    rates['spread'] = 2
+    return rates
+
+
+def synthetic_frame(n, seed=0, **kwargs):
+    """synthetic_rates -> get_mt5_ohlcv 와 같은 DataFrame"""
+    return rates_to_frame(synthetic_rates(n, seed, **kwargs))
+
+
+def synthetic_ticks(n, seed=0, start_msc=DEFAULT_START * 1000, price=150.0, vol=0.00005,
+                    spread=0.02, min_gap_ms=50, max_gap_ms=1000, trend_period=5000):
+    """n개 틱 TICK_DTYPE 구조체 배열 (간격은 min_gap_ms~max_gap_ms 무작위)"""
+    rng = np.random.default_rng(seed)
+    msc = start_msc + np.cumsum(rng.integers(min_gap_ms, max_gap_ms, n))
+    bid = price * np.exp(_log_path(n, rng, vol, trend_period))
+    ticks = np.zeros(n, dtype=TICK_DTYPE)
+    ticks['time_msc'] = msc
+    ticks['time'] = msc // 1000
+    ticks['bid'] = bid
+    ticks['ask'] = bid + spread
+    ticks['last'] = bid
+    ticks['volume'] = 1
+    ticks['flags'] = 6  # TICK_FLAG_BID | TICK_FLAG_ASK
+    return ticks
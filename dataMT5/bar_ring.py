@@ -0,0 +1,158 @@
+# bar_ring.py
+"""
+고정 용량 OHLCV 봉 링 버퍼 (numpy). 봉 추가 O(1), 최근 n개 봉은 복사 없는 연속 뷰.
+
+    ring = BarRing(capacity=364)
+    ring.load(rates)            # MT5 rates 구조체 / 컬럼 dict / get_mt5_ohlcv DataFrame (마지막 capacity 개)
+    ring.append(t, o, h, l, c, v)
+    ring.update_last(h, l, c, v)
+    bars = ring.window(300)     # BarWindow: bars['close'] 는 numpy 뷰 (복사 없음)
+    df = bars.to_frame()        # DataFrame 은 필요할 때만
+
+- 컬럼마다 2 * capacity 배열에 같은 봉을 두 곳(i, i + capacity)에 써 둠
+  -> 어느 위치에서 끝나든 최근 capacity 개가 항상 연속 구간 (뷰만 잘라서 줌)
+- 메모리는 만들 때 한 번만 할당. 이후 봉 추가/갱신은 값 쓰기만 (봉당 할당 없음)
+- window(n) 뷰는 그 뒤에 봉이 capacity - n 개 더 추가될 때까지 내용이 유지됨
+  (BarSeries 는 history + 여유분으로 만들어서 한 주기 동안 들고 있는 뷰는 안전)
+- 시각은 MT5 와 같은 epoch 초 (int64). DataFrame 으로 바꿀 때만 Timestamp
+"""
+import numpy as np
+import pandas as pd
+
+from dataMT5.ohlcv_store import COLUMNS, RATE_DTYPE, rates_to_frame
+
+
+class BarWindow:
+    """최근 n개 봉의 컬럼별 numpy 뷰 (get_mt5_ohlcv DataFrame 대신 전략에 넘김, 마지막 행 = 진행 중 봉)"""
+    __slots__ = ('_cols', '_n')
+
+    def __init__(self, cols, n):
+        self._cols = cols
+        self._n = n
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, name):
+        return self._cols[name]
+
+    @property
+    def columns(self):
+        return COLUMNS
+
+    def to_frame(self):
+        return rates_to_frame(self._cols)
+
+
+class BarRing:
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError(f"링 버퍼 용량은 1 이상이어야 함: {capacity}")
+        self.capacity = capacity
+        self._data = {c: np.zeros(2 * capacity, dtype=RATE_DTYPE[c]) for c in COLUMNS}
+        self.size = 0     # 들어 있는 봉 개수 (<= capacity)
+        self._end = capacity  # 최근 봉 구간 끝 (배열 인덱스, 구간 = [_end - size, _end))
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        self.size = 0
+        self._end = self.capacity
+
+    def load(self, rates):
+        """이력 채우기 (기존 내용 버림). rates 는 시간순, 마지막 capacity 개만 사용"""
+        if isinstance(rates, pd.DataFrame):
+            rates = frame_to_columns(rates)
+        n = min(len(rates['time']), self.capacity)
+        cap = self.capacity
+        for c in COLUMNS:
+            src = np.asarray(rates[c])[len(rates[c]) - n:]
+            arr = self._data[c]
+            arr[cap - n:cap] = src
+            arr[2 * cap - n:] = src
+        self.size = n
+        self._end = cap
+
+    def append(self, time, open_, high, low, close, tick_volume=0, spread=0, real_volume=0):
+        """새 봉 추가 (가득 차면 가장 오래된 봉을 덮어씀)"""
+        cap = self.capacity
+        end = self._end + 1
+        if end > 2 * cap:
+            end = cap + 1
+        i = end - 1  # 뒤쪽 절반 위치, 앞쪽 절반은 i - cap
+        values = (time, open_, high, low, close, tick_volume, spread, real_volume)
+        for c, v in zip(COLUMNS, values):
+            arr = self._data[c]
+            arr[i] = v
+            arr[i - cap] = v
+        self._end = end
+        if self.size < cap:
+            self.size += 1
+
+    def update_last(self, high, low, close, tick_volume=None):
+        """마지막 봉 고가/저가/종가(/틱 수) 덮어쓰기"""
+        if not self.size:
+            return
+        cap = self.capacity
+        i = self._end - 1
+        j = i - cap if i >= cap else i + cap  # 같은 봉의 다른 쪽 절반
+        data = self._data
+        for c, v in (('high', high), ('low', low), ('close', close), ('tick_volume', tick_volume)):
+            if v is not None:
+                data[c][i] = v
+                data[c][j] = v
+
+    def last(self, name):
+        """마지막 봉의 컬럼 값"""
+        return self._data[name][self._end - 1]
+
+    def window(self, n=None):
+        """최근 n개 봉 (n=None 이면 전체) BarWindow. 복사 없음"""
+        n = self.size if n is None else min(n, self.size)
+        start, end = self._end - n, self._end
+        return BarWindow({c: arr[start:end] for c, arr in self._data.items()}, n)
+
+    def to_frame(self, n=None):
+        return self.window(n).to_frame()
+
+
+def frame_to_columns(df):
+    """get_mt5_ohlcv 형식 DataFrame -> RATE_DTYPE 컬럼 dict (time 은 epoch 초)"""
+    cols = {'time': pd.DatetimeIndex(df['time']).as_unit('s').asi8}
+    for c in COLUMNS[1:]:
+        cols[c] = df[c].to_numpy(dtype=RATE_DTYPE[c]) if c in df else np.zeros(len(df), dtype=RATE_DTYPE[c])
+    return cols
+
+
+def as_frame(bars):
+    """BarWindow / DataFrame -> DataFrame (DataFrame 은 그대로)"""
+    return bars if isinstance(bars, pd.DataFrame) else bars.to_frame()
+
+
+def column(bars, name):
+    """BarWindow / DataFrame 공통: 컬럼 numpy 배열 (BarWindow 는 뷰)"""
+    if isinstance(bars, BarWindow):
+        return bars[name]
+    return bars[name].to_numpy()
+
+
+def last_value(bars, name, k=-1):
+    """BarWindow / DataFrame 공통: k 번째 행 컬럼 값"""
+    if isinstance(bars, BarWindow):
+        return bars[name][k]
+    return bars[name].iat[k]
+
+
+def bar_times(bars):
+    """BarWindow / DataFrame 공통: 봉 시각 배열 (epoch 초 int64, BarWindow 는 뷰)"""
+    if isinstance(bars, BarWindow):
+        return bars['time']
+    return pd.DatetimeIndex(bars['time']).as_unit('s').asi8
+
+
+def bar_time(bars, k=-1):
+    """BarWindow / DataFrame 공통: k 번째 봉 시각 (UTC Timestamp, get_mt5_ohlcv 의 time 컬럼과 같은 값)"""
+    if isinstance(bars, BarWindow):
+        return pd.Timestamp(int(bars['time'][k]), unit='s', tz='UTC')
+    return bars['time'].iloc[k]
@@ -1,20 +1,69 @@
 # collector.py
-import MetaTrader5 as mt5
-import pandas as pd
 from datetime import datetime
 
-def get_mt5_ohlcv(symbol="GBPJPY", timeframe=mt5.TIMEFRAME_M5, n=300):
-    if not mt5.initialize():
+from dataMT5.bar_ring import BarRing
+from dataMT5.session import get_session
+from dataMT5.ohlcv_store import get_store, rates_to_frame
+
+def _cached_store(symbol, timeframe, n, offline):
+    """
+    로컬 캐시 store. MT5 가 연결돼 있으면 새 봉만 받아 맞춤 (sync).
+    끊겨 있으면 offline=True 일 때만 캐시에 있는 봉을 그대로 씀. 쓸 봉이 없으면 None
+    """
+    store = get_store(symbol, timeframe)
+    if get_session().ensure_connected():
+        store.sync(n)
+    elif not offline or store.count == 0:
+        print("MT5 초기화 실패")
+        return None
+    if store.count == 0:
+        print("데이터 없음")
+        return None
+    return store
+
+
+def get_mt5_ohlcv(symbol="GBPJPY", timeframe=None, n=300, cache=True, offline=True):
+    """
+    최근 n개 봉 DataFrame.
+    cache=True 면 로컬 캐시(OHLCVStore)에 새 봉만 받아 붙이고 캐시에서 읽음.
+    offline=True 면 MT5 가 끊겨 있어도 캐시에 있는 봉을 돌려줌 (마지막 sync 시점까지)
+    """
+    # 공용 세션 사용: 호출마다 initialize/shutdown 하지 않음
+    session = get_session()
+    if timeframe is None:
+        timeframe = session.mt5.TIMEFRAME_M5
+    if cache:
+        store = _cached_store(symbol, timeframe, n, offline)
+        return None if store is None else store.to_frame(n)
+    if not session.ensure_connected():
         print("MT5 초기화 실패")
         return None
     utc_to = datetime.now()
-    rates = mt5.copy_rates_from(symbol, timeframe, utc_to, n)
-    mt5.shutdown()
+    rates = session.call('copy_rates_from', symbol, timeframe, utc_to, n)
     if rates is None or len(rates) == 0:
         print("데이터 없음")
         return None
-    df = pd.DataFrame(rates)
-    # ↓↓↓ UTC임을 명확하게!
-    df['time'] = pd.to_datetime(df['time'], unit='s', utc=True)
-    df['time_local'] = df['time'].dt.tz_convert('Asia/Seoul')
-    return df
+    return rates_to_frame(rates)
+
+
+def get_mt5_rates(symbol, timeframe, n=300, offline=True):
+    """
+    최근 n개 봉의 컬럼별 배열 dict (로컬 캐시 메모리맵 뷰, DataFrame 생성 없음). 실패 시 None.
+    offline=False 면 MT5 와 sync 한 경우에만 돌려줌 (실시간 매매 이력처럼 지금 봉까지 이어져야 할 때)
+    """
+    store = _cached_store(symbol, timeframe, n, offline)
+    return None if store is None else store.arrays(n)
+
+
+def get_mt5_bars(symbol, timeframe, n=300, ring=None, offline=True):
+    """
+    최근 n개 봉을 BarRing 으로 (로컬 캐시 메모리맵에서 바로 채움, DataFrame 생성 없음). 실패 시 None.
+    ring 을 넘기면 그 버퍼를 다시 채움 (용량이 n 보다 작으면 마지막 capacity 개만)
+    """
+    rates = get_mt5_rates(symbol, timeframe, n, offline)
+    if rates is None:
+        return None
+    if ring is None:
+        ring = BarRing(n)
+    ring.load(rates)
+    return ring
@@ -0,0 +1,167 @@
+# ohlcv_store.py
+"""
+(심볼, 타임프레임)별 로컬 OHLCV 캐시. 컬럼마다 raw 바이너리 파일 1개 + meta.json(행 개수).
+
+    store = get_store("GBPJPY", mt5.TIMEFRAME_M5)
+    store.sync(n=300)           # 마지막 저장 봉 이후 새 봉만 MT5 에서 받아 추가
+    arrays = store.arrays(300)  # 메모리맵 배열 (복사 없음), MT5 호출 없음
+    df = store.to_frame(300)    # DataFrame 은 필요할 때만 생성
+
+- 마지막 저장 봉은 진행 중인 봉일 수 있으므로 sync 때 같은 시각부터 덮어씀
+- 받은 봉이 마지막 저장 봉보다 뒤에서 시작하면 (사이 봉이 빠짐) 이어 붙이지 않고 캐시를 새로 씀
+- meta.json 의 count 를 마지막에 교체하므로 쓰다가 죽어도 이전 상태로 읽힘
+"""
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dataMT5.session import get_session
+
+# MT5 copy_rates_* 구조체와 같은 컬럼/자료형
+RATE_DTYPE = np.dtype([
+    ('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+    ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8')
+])
+COLUMNS = RATE_DTYPE.names
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'AUTOTRADE_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.autoTradeMT5', 'ohlcv')
+)
+
+
+def rates_to_frame(rates):
+    """MT5 rates 구조체/컬럼 dict -> get_mt5_ohlcv 와 같은 형식의 DataFrame"""
+    df = pd.DataFrame({c: np.asarray(rates[c]) for c in COLUMNS})
+    # ↓↓↓ UTC임을 명확하게!
+    df['time'] = pd.to_datetime(df['time'], unit='s', utc=True)
+    df['time_local'] = df['time'].dt.tz_convert('Asia/Seoul')
+    return df
+
+
+class OHLCVStore:
+    def __init__(self, symbol, timeframe, root=DEFAULT_CACHE_DIR, session=None):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.path = os.path.join(root, symbol, f"tf{timeframe}")
+        self.session = session
+        self.lock = threading.RLock()
+        os.makedirs(self.path, exist_ok=True)
+        self._maps = None  # 컬럼별 np.memmap (count 가 바뀌면 다시 생성)
+        self.count = self._read_meta()
+
+    # ---- 파일 ----
+    def _meta_path(self):
+        return os.path.join(self.path, 'meta.json')
+
+    def _col_path(self, col):
+        return os.path.join(self.path, f"{col}.bin")
+
+    def _read_meta(self):
+        try:
+            with open(self._meta_path(), encoding='utf-8') as f:
+                return int(json.load(f)['count'])
+        except (OSError, ValueError, KeyError):
+            return 0
+
+    def _write_meta(self, count):
+        tmp = self._meta_path() + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'symbol': self.symbol, 'timeframe': self.timeframe, 'count': count}, f)
+        os.replace(tmp, self._meta_path())
+
+    # ---- 읽기 (MT5 호출 없음) ----
+    def _mapped(self):
+        if self._maps is None and self.count:
+            self._maps = {
+                c: np.memmap(self._col_path(c), dtype=RATE_DTYPE[c], mode='r', shape=(self.count,))
+                for c in COLUMNS
+            }
+        return self._maps
+
+    def arrays(self, n=None):
+        """마지막 n개 봉의 컬럼별 메모리맵 뷰 (n=None 이면 전체). 복사 없음"""
+        with self.lock:
+            maps = self._mapped()
+            if not maps:
+                return {c: np.empty(0, dtype=RATE_DTYPE[c]) for c in COLUMNS}
+            start = 0 if n is None else max(0, self.count - n)
+            return {c: m[start:] for c, m in maps.items()}
+
+    def last_time(self):
+        with self.lock:
+            maps = self._mapped()
+            return int(maps['time'][-1]) if maps else None
+
+    def to_frame(self, n=None):
+        return rates_to_frame(self.arrays(n))
+
+    # ---- 쓰기 ----
+    def write(self, rates, replace=False):
+        """
+        rates: 시간순 MT5 rates 구조체 배열.
+        첫 봉 시각 이후로 저장된 행은 잘라내고 rates 로 교체 (진행 중 봉 갱신 + 새 봉 추가)
+        replace=True 면 저장된 행을 모두 버리고 rates 만 남김
+        """
+        if rates is None or len(rates) == 0:
+            return 0
+        with self.lock:
+            maps = self._mapped()
+            pos = int(np.searchsorted(maps['time'], rates['time'][0])) if maps and not replace else 0
+            self._maps = None  # 파일 크기가 바뀌므로 memmap 해제 후 다시 생성
+            maps = None
+            for c in COLUMNS:
+                data = np.ascontiguousarray(rates[c], dtype=RATE_DTYPE[c])
+                mode = 'r+b' if os.path.exists(self._col_path(c)) else 'w+b'
+                with open(self._col_path(c), mode) as f:
+                    # truncate 는 하지 않음 (윈도우에서 메모리맵 된 파일은 줄일 수 없음). count 뒤의 바이트는 무시됨
+                    f.seek(pos * data.itemsize)
+                    f.write(data.tobytes())
+            self.count = pos + len(rates)
+            self._write_meta(self.count)
+            return len(rates)
+
+    def sync(self, n=300, max_fetch=100000):
+        """
+        MT5 에서 마지막 저장 봉 이후 봉만 가져와 반영. 캐시가 n개보다 적으면 n개를 받아 채움.
+        반환값: 새로 받아온 행 수 (실패 시 None)
+        """
+        session = self.session or get_session()
+        with self.lock:
+            last = self.last_time()
+            if last is None or self.count < n:
+                rates = session.call('copy_rates_from_pos', self.symbol, self.timeframe, 0, n)
+                if rates is None:
+                    return None
+                # 캐시 이후로 봉이 n개보다 많이 쌓였으면 사이가 비므로 새로 씀
+                gap = last is not None and len(rates) > 0 and rates['time'][0] > last
+                return self.write(rates, replace=gap)
+            # 조금만 받아보고 마지막 저장 봉까지 안 닿으면 범위를 늘림 (오래 꺼져 있던 경우)
+            k = 8
+            while True:
+                rates = session.call('copy_rates_from_pos', self.symbol, self.timeframe, 0, k)
+                if rates is None or len(rates) == 0:
+                    return None
+                if rates['time'][0] <= last or len(rates) < k or k >= max_fetch:
+                    break
+                k = min(k * 8, max_fetch)
+            if rates['time'][0] > last:
+                # max_fetch 개로도 마지막 저장 봉까지 안 닿음 (또는 터미널 이력이 짧음) -> 사이가 비므로 새로 씀
+                return self.write(rates, replace=True)
+            rates = rates[rates['time'] >= last]
+            return self.write(rates)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(symbol, timeframe, root=DEFAULT_CACHE_DIR):
+    key = (symbol, timeframe, root)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = OHLCVStore(symbol, timeframe, root)
+        return store
@@ -0,0 +1,308 @@
+# resampler.py
+"""
+심볼 1개의 멀티 타임프레임 봉. 가장 짧은 봉(M1) / 틱 하나로 구독한 모든 타임프레임을 같이 갱신.
+
+    resampler = Resampler("GBPJPY")
+    m5 = resampler.subscribe(300, history=300)              # 같은 타임프레임 구독은 BarSeries 1개를 공유
+    h1 = resampler.subscribe(3600, history=200, on_bar=fn)  # fn(seconds, Bar): 봉 마감 시
+    resampler.load()           # 초기 이력: M1 을 한 번만 받아 모든 타임프레임으로 리샘플
+    resampler.update(t, bid)   # 틱마다 (TickStream 이 호출), 타임프레임당 O(1)
+    m5.sync()                  # 진행 중 봉을 반영한 BarWindow (dataMT5.bar_ring, 마지막 행 = 진행 중 봉)
+    m5.frame                   # get_mt5_ohlcv 형식 DataFrame (필요할 때만)
+
+- 상위 봉 = 시각을 봉 길이로 내린 구간의 M1 묶음 (MT5 가 상위 타임프레임을 만드는 방식과 같음)
+- M1 로 max_base_bars 개를 넘게 받아야 하는 타임프레임(H4 x 300 등)만 그 타임프레임을 직접 받음
+- 전략 여러 개가 같은 (심볼, 타임프레임)을 써도 조회/봉 이력은 1번
+- 봉 이력은 고정 용량 링 버퍼 (BarRing): 봉 추가/갱신은 값 쓰기만, 오래 켜 둬도 메모리 일정
+- 봉 가격은 bid 기준 (MT5 차트와 동일)
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from dataMT5.bar_ring import BarRing
+from dataMT5.collector import get_mt5_bars, get_mt5_rates
+from dataMT5.ohlcv_store import COLUMNS, RATE_DTYPE
+from dataMT5.session import get_session
+
+# MT5 TIMEFRAME 이름 -> 초
+TIMEFRAME_SECONDS = {
+    'M1': 60, 'M5': 300, 'M15': 900, 'M30': 1800,
+    'H1': 3600, 'H4': 14400, 'D1': 86400,
+}
+TIMEFRAME_NAMES = {seconds: name for name, seconds in TIMEFRAME_SECONDS.items()}
+
+# MT5 터미널 기본 "차트 최대 봉 수"
+MAX_BASE_BARS = 100_000
+
+# 봉 이력 링 버퍼 여유 용량 (history 보다 이만큼 크게 -> 들고 있는 BarWindow 가 새 봉에 바로 덮이지 않음)
+RING_SLACK = 64
+
+
+def timeframe_const(mt5, seconds):
+    """봉 길이(초) -> MetaTrader5 TIMEFRAME_* 상수"""
+    return getattr(mt5, 'TIMEFRAME_' + TIMEFRAME_NAMES[seconds])
+
+
+class Bar:
+    __slots__ = ('time', 'open', 'high', 'low', 'close', 'tick_volume')
+
+    def __init__(self, time, price):
+        self.time = time  # 봉 시작 시각 (epoch 초)
+        self.open = self.high = self.low = self.close = price
+        self.tick_volume = 1
+
+    def update(self, price):
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.tick_volume += 1
+
+    def as_row(self):
+        """get_mt5_ohlcv DataFrame 한 행과 같은 키의 dict"""
+        t = pd.Timestamp(self.time, unit='s', tz='UTC')
+        return {
+            'time': t, 'open': self.open, 'high': self.high, 'low': self.low, 'close': self.close,
+            'tick_volume': self.tick_volume, 'spread': 0, 'real_volume': 0,
+            'time_local': t.tz_convert('Asia/Seoul'),
+        }
+
+    def __repr__(self):
+        return f"Bar({self.time}, o={self.open}, h={self.high}, l={self.low}, c={self.close}, v={self.tick_volume})"
+
+
+class BarAggregator:
+    """한 타임프레임의 진행 중 봉을 틱마다 O(1) 로 갱신"""
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.current = None
+        self.last_closed = None
+
+    def update(self, time_sec, price):
+        """틱 반영. 이 틱으로 이전 봉이 마감되면 마감된 Bar 반환, 아니면 None"""
+        start = time_sec - time_sec % self.seconds
+        cur = self.current
+        if cur is not None and cur.time == start:
+            cur.update(price)
+            return None
+        if cur is not None and start < cur.time:
+            return None  # 시간이 거꾸로 온 틱은 무시
+        self.current = Bar(start, price)
+        if cur is not None:
+            self.last_closed = cur
+        return cur
+
+
+def resample_rates(rates, seconds):
+    """
+    시간순 rates (RATE_DTYPE 구조체 또는 컬럼 dict) -> seconds 길이 봉의 컬럼 dict.
+    앞부분이 잘린 첫 봉은 버림. spread 는 구간 마지막 봉 값
+    """
+    t = np.asarray(rates['time'], dtype=np.int64)
+    bucket = t - t % seconds
+    cut = 0
+    if len(t) and t[0] != bucket[0]:
+        cut = int(np.searchsorted(bucket, bucket[0], side='right'))
+    if cut >= len(t):
+        return {c: np.empty(0, dtype=RATE_DTYPE[c]) for c in COLUMNS}
+    bucket = bucket[cut:]
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(bucket)] - 1
+    col = {c: np.asarray(rates[c])[cut:] for c in COLUMNS if c != 'time'}
+    return {
+        'time': bucket[starts],
+        'open': col['open'][starts],
+        'high': np.maximum.reduceat(col['high'], starts),
+        'low': np.minimum.reduceat(col['low'], starts),
+        'close': col['close'][ends],
+        'tick_volume': np.add.reduceat(col['tick_volume'], starts),
+        'spread': col['spread'][ends],
+        'real_volume': np.add.reduceat(col['real_volume'], starts),
+    }
+
+
+_versions = itertools.count(1)
+
+
+class BarSeries:
+    """한 (심볼, 타임프레임)의 봉 이력. 구독한 전략들이 공유 (bars 는 읽기만)"""
+    def __init__(self, seconds, history=0):
+        self.seconds = seconds
+        self.history = history   # 구독자 중 가장 긴 이력 (0 이면 진행 중 봉만)
+        self.aggregator = BarAggregator(seconds)
+        self.bars = None         # BarRing (마지막 봉 = 진행 중 봉)
+        self.listeners = []      # on_bar(seconds, Bar)
+        self.graph = None        # 구독 전략들이 공유하는 지표 캐시 (SymbolFeed 가 연결, strategy.indicators)
+        self.refs = 0
+        self.closed_version = 0  # 확정봉 부분이 바뀔 때마다 새 번호 (새 봉 추가 / 이력 교체)
+        self.version = 0         # 봉 이력이 바뀔 때마다 새 번호 (진행 중 봉 갱신 포함)
+        self._loaded_for = 0     # bars 를 채울 때 요청한 이력 길이
+        self._synced = None      # 마지막으로 bars 에 반영한 진행 중 봉 (시각, 틱 수)
+        self._window = None      # 최근 history 개 봉 BarWindow (확정봉이 바뀔 때만 새로 자름)
+
+    @property
+    def current(self):
+        return self.aggregator.current
+
+    @property
+    def state(self):
+        """봉 이력 내용을 식별하는 값 (closed_version, version). 같으면 내용도 같음 (전략의 진입 판단 캐시 키)"""
+        return self.closed_version, self.version
+
+    def _changed(self, closed):
+        # 번호는 프로세스 전체에서 유일 (전략이 다른 BarSeries 로 옮겨가도 캐시 키가 겹치지 않음)
+        self.version = next(_versions)
+        if closed:
+            self.closed_version = self.version
+            self._window = None
+
+    @property
+    def loaded(self):
+        return self.bars is not None and self._loaded_for >= self.history
+
+    @property
+    def window(self):
+        """최근 history 개 봉 BarWindow (복사 없는 뷰, 마지막 행 = 진행 중 봉). 이력이 없으면 None"""
+        if self._window is None and self.bars is not None:
+            self._window = self.bars.window(self.history)
+        return self._window
+
+    @property
+    def frame(self):
+        """get_mt5_ohlcv 형식 DataFrame (필요할 때만 만듦, 매번 새로 생성)"""
+        window = self.window
+        return window.to_frame() if window is not None else None
+
+    def _ring(self):
+        # 용량은 이력 + 여유분 (한 주기 동안 들고 있는 뷰가 새 봉에 덮이지 않도록). 이력이 늘었을 때만 새로 할당
+        capacity = self.history + RING_SLACK
+        if self.bars is None or self.bars.capacity < capacity:
+            self.bars = BarRing(capacity)
+        return self.bars
+
+    def set_frame(self, df):
+        """초기 이력 DataFrame 지정 (마지막 history 개만 사용)"""
+        self._ring().load(df.iloc[-self.history:])
+        self._set_loaded()
+
+    def set_rates(self, rates):
+        """초기 이력 rates (구조체/컬럼 dict) 지정"""
+        self._ring().load({c: np.asarray(rates[c])[-self.history:] for c in COLUMNS})
+        self._set_loaded()
+
+    def load_mt5(self, symbol, timeframe):
+        """MT5 (로컬 캐시 메모리맵) 의 최근 history 개 봉을 링 버퍼에 바로 채움. 성공 여부"""
+        # 실시간 틱이 이어 붙으므로 캐시만으로는 채우지 않음 (끊겨 있던 사이 봉이 빠짐)
+        if get_mt5_bars(symbol, timeframe, self.history, ring=self._ring(), offline=False) is None:
+            return False
+        self._set_loaded()
+        return True
+
+    def _set_loaded(self):
+        self._loaded_for = self.history
+        self._synced = None
+        self._changed(True)
+        if self.graph is not None:
+            self.graph.reset()  # 확정봉이 바뀌었으므로 rolling 스트림도 처음부터
+
+    def apply(self, bar):
+        """집계된 봉을 bars 에 반영 (같은 시각이면 갱신, 새 봉이면 추가). 값 쓰기만 (할당 없음)"""
+        ring = self.bars
+        if ring is None or len(ring) == 0:
+            return
+        last = ring.last('time')
+        if last == bar.time:
+            # 시작 직후 봉은 틱을 일부만 봤으므로 MT5 에서 받은 고가/저가와 합침
+            ring.update_last(max(ring.last('high'), bar.high), min(ring.last('low'), bar.low), bar.close)
+            self._changed(False)
+        elif bar.time > last:
+            ring.append(bar.time, bar.open, bar.high, bar.low, bar.close, bar.tick_volume)
+            self._changed(True)
+
+    def sync(self):
+        """진행 중 봉을 bars 마지막 봉에 반영 (이전 sync 이후 틱이 없었으면 건너뜀). window 반환"""
+        cur = self.aggregator.current
+        if cur is not None and self.bars is not None:
+            key = (cur.time, cur.tick_volume)
+            if key != self._synced:
+                self.apply(cur)
+                self._synced = key
+        return self.window
+
+
+class Resampler:
+    def __init__(self, symbol=None, base_seconds=TIMEFRAME_SECONDS['M1'], on_bar=None,
+                 max_base_bars=MAX_BASE_BARS):
+        """
+        base_seconds: 초기 이력을 받을 가장 짧은 봉 (구독 타임프레임은 이 값의 배수)
+        on_bar(seconds, Bar): 모든 타임프레임의 봉 마감 시 (구독별 on_bar 이후)
+        """
+        self.symbol = symbol
+        self.base_seconds = base_seconds
+        self.on_bar = on_bar
+        self.max_base_bars = max_base_bars
+        self.series = {}   # seconds -> BarSeries
+        self._active = []  # 틱마다 순회 (워커 스레드가 순회 중일 수 있으므로 항상 새 목록으로 교체)
+
+    def subscribe(self, seconds, history=0, on_bar=None):
+        """타임프레임 구독. 같은 타임프레임은 같은 BarSeries 를 돌려줌 (history 는 가장 긴 값으로)"""
+        if seconds % self.base_seconds:
+            raise ValueError(f"봉 길이 {seconds}초는 {self.base_seconds}초의 배수여야 함")
+        series = self.series.get(seconds)
+        if series is None:
+            series = self.series[seconds] = BarSeries(seconds, history)
+            self._active = sorted(self.series.values(), key=lambda s: s.seconds)
+        series.history = max(series.history, history)
+        series.refs += 1
+        if on_bar is not None:
+            series.listeners = series.listeners + [on_bar]
+        return series
+
+    def unsubscribe(self, series, on_bar=None):
+        if on_bar is not None:
+            series.listeners = [fn for fn in series.listeners if fn is not on_bar]
+        series.refs -= 1
+        if series.refs <= 0 and self.series.get(series.seconds) is series:
+            del self.series[series.seconds]
+            self._active = sorted(self.series.values(), key=lambda s: s.seconds)
+
+    def current(self, seconds):
+        series = self.series.get(seconds)
+        return series.current if series is not None else None
+
+    def update(self, time_sec, price):
+        """틱 1개 반영 (TickStream.poll 에서 틱마다)"""
+        for series in self._active:
+            closed = series.aggregator.update(time_sec, price)
+            if closed is not None:
+                series.apply(closed)
+                for fn in series.listeners:
+                    fn(series.seconds, closed)
+                if self.on_bar is not None:
+                    self.on_bar(series.seconds, closed)
+
+    def load(self):
+        """
+        이력이 필요한데 아직 안 채운 타임프레임을 채움. 전부 채워졌으면 True.
+        M1 은 가장 긴 구간 기준으로 한 번만 받음 (로컬 캐시 OHLCVStore 경유)
+        """
+        pending = [s for s in self._active if s.history and not s.loaded]
+        if not pending:
+            return True
+        mt5 = get_session().mt5
+        base = self.base_seconds
+        from_base = [s for s in pending if s.history * (s.seconds // base) <= self.max_base_bars]
+        if from_base:
+            # 첫 상위 봉이 잘리는 경우를 위해 한 봉 더
+            n = max((s.history + 1) * (s.seconds // base) for s in from_base)
+            rates = get_mt5_rates(self.symbol, timeframe_const(mt5, base), min(n, self.max_base_bars), offline=False)
+            if rates is not None:
+                for s in from_base:
+                    s.set_rates(rates if s.seconds == base else resample_rates(rates, s.seconds))
+        for s in pending:
+            if s not in from_base:
+                s.load_mt5(self.symbol, timeframe_const(mt5, s.seconds))
+        return all(s.loaded for s in pending)
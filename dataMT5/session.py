@@ -0,0 +1,230 @@
+# session.py
+"""
+MT5 터미널 연결을 프로세스 전체에서 하나만 유지하는 세션 관리자.
+
+    from dataMT5.session import get_session
+    session = get_session()
+    rates = session.call('copy_rates_from', 'GBPJPY', session.mt5.TIMEFRAME_M5, utc_to, 300)
+
+- 처음 call() 할 때 연결 (lazy), 이후 initialize/shutdown 반복 없음
+- MetaTrader5 API 는 스레드 안전하지 않으므로 모든 호출을 RLock 으로 직렬화
+- 호출 실패 시 health check 후 재연결. 재연결은 호출마다 최대 1번, 실패하면 지수 backoff 시각까지는
+  시도 없이 바로 실패 (락을 잡은 채 sleep 하지 않음 -> 다른 스레드/매매 주기가 막히지 않고 다음 주기에 재시도)
+- 연결/호출 지연시간 통계: session.metrics()
+- backend 교체 가능: set_backend(fake_mt5) 로 리눅스 테스트용 가짜 모듈 사용
+"""
+import threading
+import time
+
+
+class LatencyStat:
+    """호출 지연시간 누적 통계 (ms)"""
+    __slots__ = ('count', 'total', 'max', 'last', 'errors')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.errors = 0
+
+    def add(self, ms, ok=True):
+        self.count += 1
+        self.total += ms
+        self.last = ms
+        if ms > self.max:
+            self.max = ms
+        if not ok:
+            self.errors += 1
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'avg_ms': self.total / self.count if self.count else 0.0,
+            'max_ms': self.max,
+            'last_ms': self.last,
+            'errors': self.errors,
+        }
+
+
+class MT5Session:
+    def __init__(self, backend=None, init_kwargs=None, max_retries=5,
+                 backoff_base=0.5, backoff_max=10.0, health_interval=5.0, log_fn=print):
+        """
+        backend: MetaTrader5 와 같은 함수를 가진 모듈/객체 (None 이면 처음 연결할 때 MetaTrader5 import)
+        init_kwargs: mt5.initialize(**init_kwargs) 로 넘길 값 (path, login, password, server 등)
+        health_interval: 이 시간(초) 이상 호출이 없었으면 다음 호출 전에 terminal_info 로 상태 확인
+        max_retries: ensure_connected(wait=True) 의 최대 시도 횟수
+        backoff_base/backoff_max: 연결 실패 후 다음 시도까지 간격 (초, 실패할 때마다 2배)
+        """
+        self._backend = backend
+        self.init_kwargs = dict(init_kwargs or {})
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.health_interval = health_interval
+        self.log_fn = log_fn
+        self.lock = threading.RLock()
+        self.connected = False
+        self.last_error = None
+        self._last_ok = 0.0
+        self._connect_stat = LatencyStat()
+        self._call_stats = {}
+        self.reconnects = 0
+        self._failures = 0         # 연속 연결 실패 횟수
+        self._next_attempt = 0.0   # 이 시각(monotonic) 전에는 연결 시도 안 함
+
+    @property
+    def mt5(self):
+        """현재 backend 모듈 (TIMEFRAME_* 등 상수 접근용)"""
+        if self._backend is None:
+            import MetaTrader5
+            self._backend = MetaTrader5
+        return self._backend
+
+    def set_backend(self, backend):
+        with self.lock:
+            self.shutdown()
+            self._backend = backend
+            # 새 backend 는 바로 연결 시도 (이전 backend 의 실패 backoff 를 이어받지 않음)
+            self._failures = 0
+            self._next_attempt = 0.0
+
+    # ---- 연결 관리 ----
+    def connect(self):
+        """연결 1회 시도. 성공 여부 반환"""
+        with self.lock:
+            mt5 = self.mt5
+            t0 = time.perf_counter()
+            ok = bool(mt5.initialize(**self.init_kwargs))
+            self._connect_stat.add((time.perf_counter() - t0) * 1000, ok)
+            self.connected = ok
+            if ok:
+                self._last_ok = time.monotonic()
+                self.last_error = None
+            else:
+                self.last_error = mt5.last_error()
+            return ok
+
+    def ensure_connected(self, wait=False):
+        """
+        연결 확인. 끊겨 있으면 연결 1번 시도 (backoff 시각 전이면 시도 없이 False, 호출한 쪽은 다음 주기에 다시)
+        wait=True: 최대 max_retries 번까지 backoff 만큼 기다리며 재시도 (락 밖에서 sleep, 시작 시 백그라운드 스레드용)
+        """
+        attempts = self.max_retries if wait else 1
+        for attempt in range(attempts):
+            with self.lock:
+                if self._try_connect():
+                    return True
+                delay = self._next_attempt - time.monotonic()
+            if attempt + 1 < attempts:
+                time.sleep(max(0.0, delay))
+        return False
+
+    def _try_connect(self):
+        # self.lock 안에서 호출
+        if self.connected:
+            if time.monotonic() - self._last_ok < self.health_interval or self.is_healthy():
+                return True
+            self.log_fn("MT5 연결 끊김 감지, 재연결 시도")
+            self._drop()
+        now = time.monotonic()
+        if now < self._next_attempt:
+            return False
+        if self.connect():
+            if self._failures or self.reconnects:
+                self.log_fn(f"MT5 재연결 성공 (시도 {self._failures + 1}회)")
+            self._failures = 0
+            self._next_attempt = 0.0
+            return True
+        delay = min(self.backoff_base * 2 ** self._failures, self.backoff_max)
+        self._failures += 1
+        self._next_attempt = now + delay
+        self.log_fn(f"MT5 연결 실패 {self.last_error} - {delay:.1f}초 후 재시도")
+        return False
+
+    def is_healthy(self):
+        with self.lock:
+            if not self.connected:
+                return False
+            try:
+                info = self.mt5.terminal_info()
+            except Exception:
+                info = None
+            ok = info is not None and getattr(info, 'connected', True)
+            if ok:
+                self._last_ok = time.monotonic()
+            return ok
+
+    def _drop(self):
+        try:
+            self.mt5.shutdown()
+        except Exception:
+            pass
+        self.connected = False
+        self.reconnects += 1
+
+    def shutdown(self):
+        with self.lock:
+            if self.connected:
+                self.mt5.shutdown()
+            self.connected = False
+
+    # ---- API 호출 ----
+    def call(self, name, *args, **kwargs):
+        """
+        mt5.<name>(*args, **kwargs) 를 락 안에서 호출.
+        None 이 돌아오고 터미널 상태가 비정상이면 재연결 후 1회 재시도
+        """
+        with self.lock:
+            if not self.ensure_connected():
+                return None
+            fn = getattr(self.mt5, name)
+            stat = self._call_stats.get(name)
+            if stat is None:
+                stat = self._call_stats[name] = LatencyStat()
+            for retry in (False, True):
+                t0 = time.perf_counter()
+                result = fn(*args, **kwargs)
+                ok = result is not None
+                stat.add((time.perf_counter() - t0) * 1000, ok)
+                if ok:
+                    self._last_ok = time.monotonic()
+                    return result
+                self.last_error = self.mt5.last_error()
+                if retry or self.is_healthy():
+                    # 연결은 정상이고 단순히 데이터가 없는 경우
+                    return None
+                self._drop()
+                if not self.ensure_connected():
+                    return None
+            return None
+
+    def metrics(self):
+        """연결/호출별 지연시간 통계 dict"""
+        with self.lock:
+            return {
+                'connected': self.connected,
+                'reconnects': self.reconnects,
+                'connect': self._connect_stat.as_dict(),
+                'calls': {name: s.as_dict() for name, s in self._call_stats.items()},
+            }
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """프로세스 공용 MT5Session"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = MT5Session()
+    return _session
+
+
+def set_backend(backend):
+    """공용 세션의 backend 교체 (테스트/벤치마크용 가짜 MetaTrader5 모듈 등)"""
+    get_session().set_backend(backend)
@@ -0,0 +1,230 @@
+# tick_stream.py
+"""
+틱 수집 + 프로세스 내 틱->봉 집계.
+
+    stream = TickStream(MT5TickSource("GBPJPY"), timeframes=(60, 300),
+                        on_quote=strategy.on_quote, on_bar=handle_bar)
+    stream.poll()   # 타이머/워커 루프에서 주기적으로 호출
+
+- MT5TickSource: copy_ticks_from 으로 마지막으로 본 틱 이후만 가져옴
+- ReplayTickSource: 저장된 틱 배열을 조금씩 내보내는 가짜 소스 (터미널 없이 테스트/리플레이)
+- ClockTickSource: 저장된 틱 중 리플레이 시계(engine.replay.ReplayClock) 이전 것만 내보내는 소스
+- TickRecorder: 받은 틱을 심볼/날짜(UTC)별 raw 파일에 그대로 저장 (장애 재현용, load_ticks 로 다시 읽음)
+- 모든 bid/ask 갱신은 on_quote(bid, ask, time) 로 바로 전달 -> 청산 체크 지연 = 틱 주기
+- 봉 집계는 dataMT5.resampler.Resampler (bid 기준, MT5 차트와 동일), 봉 마감 시 on_bar(timeframe_seconds, Bar) 호출
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from dataMT5.resampler import TIMEFRAME_SECONDS, Bar, BarAggregator, Resampler  # Bar 등은 기존 import 경로 유지
+from dataMT5.session import get_session
+
+# MT5 copy_ticks_* 구조체와 같은 컬럼/자료형
+TICK_DTYPE = np.dtype([
+    ('time', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('last', '<f8'), ('volume', '<u8'),
+    ('time_msc', '<i8'), ('flags', '<u4'), ('volume_real', '<f8')
+])
+
+DEFAULT_TICK_DIR = os.environ.get(
+    'AUTOTRADE_TICK_DIR', os.path.join(os.path.expanduser('~'), '.autoTradeMT5', 'ticks')
+)
+
+class MT5TickSource:
+    """MT5 터미널에서 새 틱만 가져오는 소스"""
+    def __init__(self, symbol, session=None, max_count=10000):
+        self.symbol = symbol
+        self.session = session
+        self.max_count = max_count
+        self.last_msc = None
+        self._seen_at_last = 0  # last_msc 와 같은 시각으로 이미 넘긴 틱 개수 (중복 방지)
+
+    def fetch(self):
+        session = self.session or get_session()
+        mt5 = session.mt5
+        if self.last_msc is None:
+            tick = session.call('symbol_info_tick', self.symbol)
+            if tick is None:
+                return np.empty(0, dtype=TICK_DTYPE)
+            # 시작점: 현재 최신 틱 (과거 틱은 봉 데이터로 대체)
+            self.last_msc = int(tick.time_msc)
+            self._seen_at_last = 0
+        ticks = session.call('copy_ticks_from', self.symbol, self.last_msc // 1000,
+                             self.max_count, mt5.COPY_TICKS_ALL)
+        if ticks is None or len(ticks) == 0:
+            return np.empty(0, dtype=TICK_DTYPE)
+        msc = ticks['time_msc']
+        keep = msc > self.last_msc
+        same = np.flatnonzero(msc == self.last_msc)
+        if same.size > self._seen_at_last:
+            keep[same[self._seen_at_last:]] = True
+        ticks = ticks[keep]
+        if len(ticks):
+            newest = int(ticks['time_msc'][-1])
+            n_same = int(np.count_nonzero(ticks['time_msc'] == newest))
+            self._seen_at_last = n_same + (self._seen_at_last if newest == self.last_msc else 0)
+            self.last_msc = newest
+        return ticks
+
+
+class ReplayTickSource:
+    """
+    저장된 틱 배열(TICK_DTYPE 구조체 또는 같은 컬럼의 DataFrame)을 fetch 마다 chunk 개씩 내보내는 소스.
+    터미널 없이 TickStream 을 테스트하거나 과거 구간을 다시 돌릴 때 사용
+    """
+    def __init__(self, ticks, chunk=100):
+        self.ticks = to_tick_array(ticks)
+        self.chunk = chunk
+        self.pos = 0
+
+    @property
+    def exhausted(self):
+        return self.pos >= len(self.ticks)
+
+    def fetch(self):
+        out = self.ticks[self.pos:self.pos + self.chunk]
+        self.pos += len(out)
+        return out
+
+
+class ClockTickSource:
+    """저장된 틱 중 clock.now (epoch 초) 까지의 새 틱만 내보내는 소스 (리플레이 시계와 함께 사용)"""
+    def __init__(self, ticks, clock):
+        self.ticks = to_tick_array(ticks)
+        # 구조체 필드는 strided 뷰라 searchsorted 가 호출마다 전체를 복사함 -> 연속 배열로 한 번만
+        self.times = np.ascontiguousarray(self.ticks['time_msc'])
+        self.clock = clock
+        self.pos = 0
+
+    @property
+    def exhausted(self):
+        return self.pos >= len(self.ticks)
+
+    @property
+    def next_msc(self):
+        """다음에 나갈 틱 시각 (없으면 None)"""
+        return int(self.times[self.pos]) if self.pos < len(self.times) else None
+
+    def fetch(self):
+        # 이미 내보낸 틱 뒤쪽에서만 찾음
+        end = self.pos + int(np.searchsorted(self.times[self.pos:], int(self.clock.now * 1000), side='right'))
+        out = self.ticks[self.pos:end]
+        self.pos = end
+        return out
+
+
+def to_tick_array(ticks):
+    """TICK_DTYPE 구조체 배열 또는 같은 컬럼의 DataFrame -> TICK_DTYPE 구조체 배열"""
+    if isinstance(ticks, pd.DataFrame):
+        arr = np.zeros(len(ticks), dtype=TICK_DTYPE)
+        for name in TICK_DTYPE.names:
+            if name in ticks:
+                arr[name] = ticks[name].to_numpy()
+        if 'time_msc' not in ticks:
+            arr['time_msc'] = arr['time'] * 1000
+        return arr
+    return ticks
+
+
+class TickRecorder:
+    """
+    recorder(ticks) 로 받은 틱을 <root>/<symbol>/<YYYYMMDD>.bin 에 TICK_DTYPE 그대로 이어 붙임.
+    파일은 np.fromfile(path, dtype=TICK_DTYPE) (= load_ticks) 로 바로 읽힘
+    """
+    def __init__(self, symbol, root=DEFAULT_TICK_DIR):
+        self.symbol = symbol
+        self.dir = os.path.join(root, symbol)
+        self._day = None
+        self._file = None
+
+    def __call__(self, ticks):
+        if len(ticks) == 0:
+            return
+        days = ticks['time_msc'] // 86_400_000
+        # 한 번에 받은 틱이 날짜를 넘는 경우만 나눠서 씀
+        cuts = np.flatnonzero(np.diff(days)) + 1
+        for part in np.split(ticks, cuts) if cuts.size else (ticks,):
+            self._open(int(part['time_msc'][0] // 86_400_000))
+            self._file.write(np.ascontiguousarray(part, dtype=TICK_DTYPE).tobytes())
+        self._file.flush()
+
+    def _open(self, day):
+        if day == self._day:
+            return
+        self.close()
+        os.makedirs(self.dir, exist_ok=True)
+        name = pd.Timestamp(day * 86400, unit='s').strftime('%Y%m%d')
+        self._file = open(os.path.join(self.dir, name + '.bin'), 'ab')
+        self._day = day
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._day = None
+
+
+def load_ticks(path):
+    """TickRecorder 파일(.bin) / np.save 파일(.npy) / CSV -> TICK_DTYPE 구조체 배열"""
+    if path.endswith('.bin'):
+        return np.fromfile(path, dtype=TICK_DTYPE)
+    if path.endswith('.npy'):
+        return to_tick_array(np.load(path))
+    return to_tick_array(pd.read_csv(path))
+
+
+class TickStream:
+    def __init__(self, source, timeframes=(60, 300), on_quote=None, on_bar=None, recorder=None, resampler=None):
+        """
+        source: fetch() 로 새 틱 구조체 배열을 돌려주는 객체 (MT5TickSource / ReplayTickSource / ClockTickSource)
+        timeframes: 집계할 봉 길이 (초)
+        on_quote(bid, ask, time): 틱마다 호출 (time 은 pandas Timestamp UTC)
+        on_bar(seconds, Bar): timeframes 의 봉 마감 시 호출 (resampler 구독 listener 로 추가)
+        recorder(ticks): 받은 틱 배열을 그대로 넘김 (TickRecorder 등, None 이면 저장 안 함)
+        resampler: 심볼 공용 Resampler (None 이면 새로 만듦). timeframes 는 여기에 구독으로 추가
+        """
+        self.source = source
+        self.recorder = recorder
+        self.resampler = resampler if resampler is not None else Resampler()
+        for tf in timeframes:
+            # on_bar 는 이 스트림이 구독한 타임프레임에만 붙임 (공용 resampler.on_bar 는 덮어쓰지 않음)
+            self.resampler.subscribe(tf, on_bar=on_bar)
+        self.on_quote = on_quote
+        self.bid = None
+        self.ask = None
+        self.last_msc = None
+        self.tick_count = 0
+
+    def current_bar(self, seconds):
+        return self.resampler.current(seconds)
+
+    def poll(self):
+        """새 틱을 받아 처리. 처리한 틱 개수 반환"""
+        ticks = self.source.fetch()
+        n = len(ticks)
+        if n == 0:
+            return 0
+        if self.recorder is not None:
+            self.recorder(ticks)
+        bids = ticks['bid']
+        asks = ticks['ask']
+        msc = ticks['time_msc']
+        update = self.resampler.update
+        on_quote = self.on_quote
+        bid, ask = self.bid, self.ask
+        for k in range(n):
+            # bid/ask 중 바뀐 쪽만 오는 틱은 0 으로 들어오므로 직전 값 유지
+            b = float(bids[k]) or bid
+            a = float(asks[k]) or ask or b
+            if b is None:
+                continue
+            bid, ask = b, a
+            t_msc = int(msc[k])
+            if on_quote is not None:
+                on_quote(bid, ask, pd.Timestamp(t_msc, unit='ms', tz='UTC'))
+            update(t_msc // 1000, bid)
+        self.bid, self.ask = bid, ask
+        self.last_msc = int(msc[-1])
+        self.tick_count += n
+        return n
@@ -0,0 +1,303 @@
+# execution.py
+"""
+주문 실행 (Qt 의존성 없음). 전략 루프는 submit() 만 하고 order_send 는 실행 스레드에서.
+
+    executor = OrderExecutor()
+    executor.start()
+    executor.prepare("GBPJPY", 0.01)   # 주문 요청 템플릿 미리 생성 (symbol_info 조회 포함, 시작 시 1번)
+    order = executor.submit("GBPJPY", 1, price=ask, lot=0.01, tp_pips=0.18, sl_pips=0.15, pip=0.01)
+    # order.status: pending -> acked -> filled (또는 rejected / error)
+
+- 요청 dict 는 (심볼, 랏, 방향)별 템플릿을 복사해서 price/sl/tp 만 채움
+- TP/SL 은 브로커 쪽에 같이 걸어둠 (진입가 기준 tp_pips/sl_pips, 전략 check_exit 과 같은 가격)
+- 주문 가격 = 전략 진입가 (롱은 ask, 숏은 bid - SymbolTrader 가 on_tick 에 ask 를 넘김). 슬리피지 기준도 같은 가격
+- 지연시간: signal_to_ack (전략 신호 ~ order_send 응답), ack_to_fill (응답 ~ 체결 확인)
+  -> engine.latency 기록기에 심볼별로, 슬리피지(pip, +면 불리)는 slippage_stats()
+- 체결이 응답에 없으면 (deal=0) history_deals_get(position=...) 으로 체결될 때까지 확인
+"""
+import collections
+import queue
+import threading
+import time
+import traceback
+
+from dataMT5.session import get_session
+from engine.latency import get_latency
+
+# MetaTrader5 패키지와 같은 값 (backend 에 없을 때만 사용)
+MT5_DEFAULTS = {
+    'TRADE_ACTION_DEAL': 1,
+    'ORDER_TYPE_BUY': 0,
+    'ORDER_TYPE_SELL': 1,
+    'ORDER_TIME_GTC': 0,
+    'ORDER_FILLING_IOC': 1,
+    'TRADE_RETCODE_PLACED': 10008,
+    'TRADE_RETCODE_DONE': 10009,
+    'TRADE_RETCODE_DONE_PARTIAL': 10010,
+    'DEAL_ENTRY_IN': 0,
+}
+
+
+def mt5_const(mt5, name):
+    return getattr(mt5, name, MT5_DEFAULTS[name])
+
+
+class Order:
+    __slots__ = ('id', 'symbol', 'side', 'volume', 'price', 'tp', 'sl', 'pip', 'request', 'tag',
+                 'signal_ns', 'submit_ns', 'ack_ns', 'fill_ns', 'status', 'retcode', 'comment',
+                 'ticket', 'deal', 'fill_price', 'slippage')
+
+    def __init__(self, order_id, symbol, side, volume, price, tp, sl, pip, request, tag, signal_ns):
+        self.id = order_id
+        self.symbol = symbol
+        self.side = side          # 1 매수 / -1 매도
+        self.volume = volume
+        self.price = price        # 신호 시점 가격 (슬리피지 기준)
+        self.tp = tp
+        self.sl = sl
+        self.pip = pip
+        self.request = request
+        self.tag = tag            # 전략 결과 dict 등
+        self.signal_ns = signal_ns
+        self.submit_ns = time.perf_counter_ns()
+        self.ack_ns = None
+        self.fill_ns = None
+        self.status = 'pending'
+        self.retcode = None
+        self.comment = None
+        self.ticket = None        # 주문/포지션 티켓
+        self.deal = None
+        self.fill_price = None
+        self.slippage = None
+
+    @property
+    def done(self):
+        return self.status in ('filled', 'rejected', 'error')
+
+    def __repr__(self):
+        return (f"Order({self.id}, {self.symbol}, {'BUY' if self.side == 1 else 'SELL'} {self.volume}, "
+                f"{self.status}, price={self.price}, fill={self.fill_price})")
+
+
+class SlippageStat:
+    """심볼별 슬리피지 누적 (pip)"""
+    __slots__ = ('count', 'total', 'max', 'min')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = None
+        self.min = None
+
+    def add(self, pips):
+        self.count += 1
+        self.total += pips
+        self.max = pips if self.max is None else max(self.max, pips)
+        self.min = pips if self.min is None else min(self.min, pips)
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'mean_pips': self.total / self.count if self.count else 0.0,
+            'max_pips': self.max or 0.0,
+            'min_pips': self.min or 0.0,
+        }
+
+
+class OrderExecutor:
+    def __init__(self, session=None, latency=None, on_update=None, log_fn=print, deviation=20,
+                 magic=240601, comment="autoTradeMT5", poll_interval=0.05, fill_timeout=10.0, max_orders=1000):
+        """
+        on_update(order): 주문 상태가 바뀔 때마다 (실행 스레드에서 호출)
+        deviation: 허용 슬리피지 (포인트), poll_interval: 체결 확인 주기 (초)
+        fill_timeout: 응답 후 이 시간(초) 안에 체결 확인이 안 되면 error
+        max_orders: orders 에 남겨 두는 최근 주문 수 (오래된 주문부터 버림, 하루 종일 돌려도 메모리 일정)
+        """
+        self.session = session
+        self.latency = latency or get_latency()
+        self.on_update = on_update
+        self.log_fn = log_fn
+        self.deviation = deviation
+        self.magic = magic
+        self.comment = comment
+        self.poll_interval = poll_interval
+        self.fill_timeout = fill_timeout
+        self.orders = collections.deque(maxlen=max_orders)
+        self._templates = {}   # (symbol, volume) -> {1: 매수 요청, -1: 매도 요청}
+        self._digits = {}      # symbol -> 가격 소수점 자릿수
+        self._queue = queue.Queue()
+        self._awaiting = []    # 응답은 왔지만 체결 확인 전인 주문
+        self._slippage = {}
+        self._next_id = 1
+        self._id_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _session(self):
+        return self.session or get_session()
+
+    # ---- 준비 (핫패스 밖) ----
+    def prepare(self, symbol, volume):
+        """(심볼, 랏) 매수/매도 요청 템플릿 생성. symbol_info 조회는 여기서만"""
+        key = (symbol, volume)
+        templates = self._templates.get(key)
+        if templates is not None:
+            return templates
+        session = self._session()
+        mt5 = session.mt5
+        if symbol not in self._digits:
+            info = session.call('symbol_info', symbol)
+            self._digits[symbol] = int(info.digits) if info is not None else 5
+        base = {
+            'action': mt5_const(mt5, 'TRADE_ACTION_DEAL'),
+            'symbol': symbol,
+            'volume': float(volume),
+            'deviation': self.deviation,
+            'magic': self.magic,
+            'comment': self.comment,
+            'type_time': mt5_const(mt5, 'ORDER_TIME_GTC'),
+            'type_filling': mt5_const(mt5, 'ORDER_FILLING_IOC'),
+        }
+        templates = {
+            1: dict(base, type=mt5_const(mt5, 'ORDER_TYPE_BUY')),
+            -1: dict(base, type=mt5_const(mt5, 'ORDER_TYPE_SELL')),
+        }
+        self._templates[key] = templates
+        return templates
+
+    # ---- 전략 루프에서 호출 (블록 없음) ----
+    def submit(self, symbol, side, price, lot, tp_pips, sl_pips, pip=0.01, tag=None, signal_ns=None):
+        """
+        시장가 주문 예약 후 바로 반환. TP/SL 은 price 기준 (롱: +tp/-sl, 숏: -tp/+sl)
+        signal_ns: 전략이 신호를 낸 perf_counter_ns (None 이면 지금)
+        """
+        templates = self._templates.get((symbol, lot)) or self.prepare(symbol, lot)
+        digits = self._digits.get(symbol, 5)
+        tp = round(price + side * tp_pips, digits)
+        sl = round(price - side * sl_pips, digits)
+        request = dict(templates[side])
+        request['price'] = price
+        request['tp'] = tp
+        request['sl'] = sl
+        with self._id_lock:
+            order_id = self._next_id
+            self._next_id += 1
+        order = Order(order_id, symbol, side, lot, price, tp, sl, pip, request, tag,
+                      signal_ns if signal_ns is not None else time.perf_counter_ns())
+        self.orders.append(order)
+        self._queue.put(order)
+        return order
+
+    def submit_entry(self, strategy, result, signal_ns=None):
+        """전략 진입 결과 dict (long_entry / short_entry) -> submit (가격 = 전략 진입가, TP/SL 도 전략과 같은 값)"""
+        side = 1 if result['signal'] == 'long_entry' else -1
+        return self.submit(result.get('symbol') or strategy.symbol, side, result['price'], strategy.lot,
+                           strategy.tp_pips, strategy.sl_pips, strategy.pip, tag=result, signal_ns=signal_ns)
+
+    # ---- 실행 스레드 ----
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="OrderExecutor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self._queue.put(None)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def run_once(self, timeout=0.0):
+        """대기 중인 주문 전송 + 체결 확인 1회 (실행 스레드 본체, 리플레이/테스트에서 직접 호출 가능)"""
+        try:
+            order = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+        except queue.Empty:
+            order = None
+        while order is not None:
+            self._send(order)
+            try:
+                order = self._queue.get_nowait()
+            except queue.Empty:
+                order = None
+        if self._awaiting:
+            self._check_fills()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once(self.poll_interval)
+            except Exception:
+                self.log_fn(f"[주문] 실행 오류\n{traceback.format_exc()}")
+
+    def _update(self, order, status):
+        order.status = status
+        if self.on_update is not None:
+            self.on_update(order)
+
+    def _send(self, order):
+        session = self._session()
+        mt5 = session.mt5
+        result = session.call('order_send', order.request)
+        order.ack_ns = time.perf_counter_ns()
+        self.latency.record(order.symbol, 'signal_to_ack', order.ack_ns - order.signal_ns)
+        if result is None:
+            order.comment = str(session.last_error)
+            self._update(order, 'error')
+            self.log_fn(f"[주문] {order.symbol} 전송 실패 {session.last_error}")
+            return
+        order.retcode = result.retcode
+        order.comment = getattr(result, 'comment', None)
+        ok_codes = (mt5_const(mt5, 'TRADE_RETCODE_DONE'), mt5_const(mt5, 'TRADE_RETCODE_PLACED'),
+                    mt5_const(mt5, 'TRADE_RETCODE_DONE_PARTIAL'))
+        if result.retcode not in ok_codes:
+            self._update(order, 'rejected')
+            self.log_fn(f"[주문] {order.symbol} 거부 retcode={result.retcode} {order.comment}")
+            return
+        order.ticket = getattr(result, 'order', None)
+        if getattr(result, 'deal', 0):
+            self._fill(order, result.deal, result.price, order.ack_ns)
+        else:
+            self._update(order, 'acked')
+            self._awaiting.append(order)
+
+    def _fill(self, order, deal, price, now_ns):
+        order.deal = deal
+        order.fill_price = price
+        order.fill_ns = now_ns
+        order.slippage = (price - order.price) * order.side / order.pip
+        self.latency.record(order.symbol, 'ack_to_fill', now_ns - order.ack_ns)
+        stat = self._slippage.get(order.symbol)
+        if stat is None:
+            stat = self._slippage[order.symbol] = SlippageStat()
+        stat.add(order.slippage)
+        self._update(order, 'filled')
+
+    def _check_fills(self):
+        session = self._session()
+        entry_in = mt5_const(session.mt5, 'DEAL_ENTRY_IN')
+        waiting, self._awaiting = self._awaiting, []
+        for order in waiting:
+            deals = session.call('history_deals_get', position=order.ticket)
+            now = time.perf_counter_ns()
+            deal = next((d for d in deals or () if d.entry == entry_in), None)
+            if deal is not None:
+                self._fill(order, deal.ticket, deal.price, now)
+            elif (now - order.ack_ns) / 1e9 > self.fill_timeout:
+                order.comment = "체결 확인 시간 초과"
+                self._update(order, 'error')
+                self.log_fn(f"[주문] {order.symbol} 체결 확인 시간 초과 (ticket {order.ticket})")
+            else:
+                self._awaiting.append(order)
+
+    # ---- 통계 ----
+    def slippage_stats(self):
+        return {symbol: stat.as_dict() for symbol, stat in self._slippage.items()}
+
+    def pending(self):
+        return [order for order in self.orders if not order.done]
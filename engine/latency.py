@@ -0,0 +1,159 @@
+# latency.py
+"""
+틱 처리 경로 단계별 지연시간 계측 (Qt 의존성 없음, 운영 중 상시 사용 가능한 수준의 오버헤드).
+
+    lat = get_latency()
+    t0 = time.perf_counter_ns()
+    ...
+    lat.record('GBPJPY', 'fetch', time.perf_counter_ns() - t0)
+    lat.snapshot()                 # [{'symbol', 'stage', 'count', 'p50_us', 'p99_us', 'max_us', ...}]
+    lat.export('latency.csv')      # .csv 또는 .json
+
+단계 (TradingEngine / SymbolTrader / 전략 / GUI 가 기록):
+    fetch           SymbolFeed.poll (MT5 틱 수집 + 봉 집계 + 틱 단위 청산 판단)
+    bar             진행 중인 봉을 봉 이력에 반영
+    ichimoku        전략 지표 계산 (마지막 두 봉 이치모쿠 값 등, strategy.indicators 그래프)
+    signal          진입 조건 비트마스크 판단
+    evaluate        SymbolTrader.evaluate 전체
+    dispatch        전략 결과 콜백 (GUI 브리지 전달)
+    tick_to_signal  해당 심볼 틱 수집 시작 ~ 결과 전달 완료
+    ui              GUI 스레드의 결과 처리 (블로터/로그)
+    cycle           엔진 1주기 전체 (symbol '*')
+"""
+import csv
+import json
+import threading
+
+SUB_BITS = 6                 # 2의 거듭제곱 구간마다 64칸 -> 상대 오차 약 1.6%
+SUB_COUNT = 1 << SUB_BITS
+MAX_BITS = 40                # 2^40 ns (약 18분) 이상은 마지막 칸에 모음
+N_BUCKETS = (MAX_BITS - SUB_BITS + 1) << SUB_BITS
+
+
+def bucket_index(ns):
+    if ns < SUB_COUNT:
+        return ns if ns > 0 else 0
+    e = ns.bit_length() - SUB_BITS - 1
+    idx = ((e + 1) << SUB_BITS) + (ns >> e) - SUB_COUNT
+    return idx if idx < N_BUCKETS else N_BUCKETS - 1
+
+
+def bucket_value(idx):
+    """bucket idx 에 들어가는 가장 큰 값 (HDR 의 highest equivalent value)"""
+    e = (idx >> SUB_BITS) - 1
+    if e <= 0:
+        return idx
+    return (((idx & (SUB_COUNT - 1)) + SUB_COUNT + 1) << e) - 1
+
+
+class LatencyHistogram:
+    """
+    HDR 방식 로그-선형 히스토그램 (ns 단위 정수). 기록은 list 원소 +1 한 번.
+    기록은 한 스레드에서만 한다고 가정 (읽기는 다른 스레드에서 해도 통계가 약간 어긋날 뿐)
+    """
+    __slots__ = ('counts', 'count', 'total', 'max', 'min')
+
+    def __init__(self):
+        self.counts = [0] * N_BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.min = None
+
+    def record(self, ns):
+        self.counts[bucket_index(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+
+    def percentile(self, p):
+        """p (0~100) 분위수 (ns)"""
+        if self.count == 0:
+            return 0
+        target = max(1, int(self.count * p / 100.0 + 0.5))
+        seen = 0
+        for idx, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return min(bucket_value(idx), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_us': self.total / self.count / 1000 if self.count else 0.0,
+            'p50_us': self.percentile(50) / 1000,
+            'p90_us': self.percentile(90) / 1000,
+            'p99_us': self.percentile(99) / 1000,
+            'max_us': self.max / 1000,
+            'min_us': (self.min or 0) / 1000,
+        }
+
+
+class LatencyRecorder:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._hists = {}  # symbol -> {stage -> LatencyHistogram}
+        self._lock = threading.Lock()  # 새 히스토그램 생성/초기화 때만 사용
+
+    def histogram(self, symbol, stage):
+        stages = self._hists.get(symbol)
+        if stages is None or stage not in stages:
+            with self._lock:
+                stages = self._hists.setdefault(symbol, {})
+                stages.setdefault(stage, LatencyHistogram())
+        return stages[stage]
+
+    def record(self, symbol, stage, ns):
+        if not self.enabled:
+            return
+        stages = self._hists.get(symbol)
+        hist = stages.get(stage) if stages is not None else None
+        if hist is None:
+            hist = self.histogram(symbol, stage)
+        hist.record(ns)
+
+    def reset(self):
+        with self._lock:
+            self._hists = {}
+
+    def snapshot(self):
+        """심볼/단계별 요약 dict 목록"""
+        rows = []
+        for symbol, stages in list(self._hists.items()):
+            for stage, hist in list(stages.items()):
+                row = {'symbol': symbol, 'stage': stage}
+                row.update(hist.summary())
+                rows.append(row)
+        return rows
+
+    def export(self, path):
+        """snapshot 을 파일로 (.json 이면 JSON, 그 외 CSV)"""
+        rows = self.snapshot()
+        if path.lower().endswith('.json'):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(rows, f, ensure_ascii=False, indent=1)
+            return path
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=['symbol', 'stage', 'count', 'mean_us', 'p50_us',
+                                                   'p90_us', 'p99_us', 'max_us', 'min_us'])
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+
+_latency = None
+_latency_lock = threading.Lock()
+
+
+def get_latency():
+    """프로세스 공용 LatencyRecorder"""
+    global _latency
+    if _latency is None:
+        with _latency_lock:
+            if _latency is None:
+                _latency = LatencyRecorder()
+    return _latency
@@ -0,0 +1,169 @@
+# log_pipeline.py
+"""
+스레드 공용 로그 파이프라인 (Qt 의존성 없음).
+
+    log = get_log()
+    log.info("MT5 연결 성공", source='session')      # 어느 스레드에서든 호출 가능, 락 1번 + append
+    seq, records, missed = log.since(seq)            # 콘솔이 UI 프레임마다 새 기록만 한 번에 가져감
+
+- 기록은 고정 크기 링버퍼(deque maxlen)에 쌓이고 오래된 것부터 밀려남 (메모리 상한)
+- 파일 기록은 별도 스레드가 큐를 묶어서 쓰고 max_bytes 마다 회전 (호출 스레드는 디스크 I/O 안 함)
+- 화면 표시는 gui.log_console.LogConsole 이 담당 (한 프레임에 appendPlainText 1번)
+"""
+import collections
+import os
+import queue
+import sys
+import threading
+import time
+
+LogRecord = collections.namedtuple('LogRecord', ['seq', 'time', 'level', 'source', 'text'])
+
+DEFAULT_LOG_DIR = os.environ.get(
+    'AUTOTRADE_LOG_DIR', os.path.join(os.path.expanduser('~'), '.autoTradeMT5', 'logs')
+)
+
+
+class RotatingWriter(threading.Thread):
+    """큐에 쌓인 줄을 묶어서 파일에 쓰는 스레드. 파일이 max_bytes 를 넘으면 .1 .2 ... 로 회전"""
+    def __init__(self, path, max_bytes=5 * 1024 * 1024, backup_count=5, max_queue=100000, batch=1000):
+        super().__init__(name='log-writer', daemon=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch = batch
+        self.queue = queue.Queue(max_queue)
+        self.dropped = 0
+        self._file = None
+
+    def put(self, line):
+        try:
+            self.queue.put_nowait(line)
+        except queue.Full:
+            # 디스크가 밀려도 매매 스레드는 기다리지 않음
+            self.dropped += 1
+
+    def close(self, timeout=2.0):
+        self.queue.put(None)
+        self.join(timeout)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _rotate(self):
+        self._file.close()
+        for k in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{k}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{k + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def run(self):
+        try:
+            self._open()
+        except OSError as e:
+            print(f"로그 파일 열기 실패: {e}", file=sys.stderr)
+            return
+        closing = False
+        while not closing:
+            lines = [self.queue.get()]
+            while len(lines) < self.batch:
+                try:
+                    lines.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in lines:
+                closing = True
+                lines = [line for line in lines if line is not None]
+            if not lines:
+                continue
+            try:
+                self._file.write("\n".join(lines) + "\n")
+                self._file.flush()
+                if self._file.tell() >= self.max_bytes:
+                    self._rotate()
+            except OSError as e:
+                print(f"로그 파일 기록 실패: {e}", file=sys.stderr)
+        self._file.close()
+
+
+class LogPipeline:
+    def __init__(self, capacity=10000, log_dir=DEFAULT_LOG_DIR, filename='autotrade.log',
+                 max_bytes=5 * 1024 * 1024, backup_count=5):
+        """
+        capacity: 링버퍼 줄 수 (콘솔이 이보다 많이 밀리면 오래된 줄은 생략되고 missed 로 알려줌)
+        log_dir: None 이면 파일 기록 안 함
+        """
+        self._buffer = collections.deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.seq = 0
+        self.writer = None
+        if log_dir:
+            self.writer = RotatingWriter(os.path.join(log_dir, filename), max_bytes, backup_count)
+            self.writer.start()
+
+    def log(self, text, level='INFO', source=''):
+        now = time.time()
+        with self._lock:
+            self.seq += 1
+            record = LogRecord(self.seq, now, level, source, str(text))
+            self._buffer.append(record)
+        if self.writer is not None:
+            stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+            self.writer.put(f"{stamp}.{int(now % 1 * 1000):03d} {level:<5} [{source}] {record.text}")
+        return record
+
+    def info(self, text, source=''):
+        return self.log(text, 'INFO', source)
+
+    def warning(self, text, source=''):
+        return self.log(text, 'WARN', source)
+
+    def error(self, text, source=''):
+        return self.log(text, 'ERROR', source)
+
+    def logger(self, source, level='INFO'):
+        """log_fn(text) 형태 콜백 (TradingEngine.log_fn, MT5Session.log_fn 등에 연결)"""
+        def log_fn(text):
+            self.log(text, level, source)
+        return log_fn
+
+    def since(self, seq):
+        """
+        seq 이후 기록 -> (마지막 seq, 기록 목록, 링버퍼에서 밀려나 놓친 개수).
+        뒤에서부터 새 기록만 훑으므로 O(새 기록 수)
+        """
+        with self._lock:
+            last = self.seq
+            n_new = last - seq
+            if n_new <= 0:
+                return last, [], 0
+            missed = max(0, n_new - len(self._buffer))
+            take = n_new - missed
+            records = [self._buffer[-k] for k in range(take, 0, -1)] if take < 64 else \
+                list(self._buffer)[-take:]
+        return last, records, missed
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_log():
+    """프로세스 공용 LogPipeline"""
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                _log = LogPipeline()
+    return _log
@@ -0,0 +1,217 @@
+# replay.py
+"""
+저장된 봉/틱을 실시간 매매와 같은 경로로 다시 돌리는 리플레이 (GUI/QTimer 없이, 결정적 시계).
+
+    replay = Replay(interval=0.2, speed=None)     # speed=None: 최대 속도, 60: 60배속
+    replay.add(IchimokuBreakoutStrategyRT(symbol="GBPJPY"), "GBPJPY", ticks, bars)
+    summary = replay.run()
+    replay.trades    # TradeStore (실시간 창 블로터와 같은 행)
+    replay.lines     # 실시간 창 콘솔과 같은 로그 문구
+
+    python -m engine.replay --symbol GBPJPY --ticks ~/.autoTradeMT5/ticks/GBPJPY/20240102.bin --bars bars.csv
+    python -m engine.replay --symbol GBPJPY --bars bars.csv          # 틱이 없으면 봉에서 4틱씩 만들어 사용
+
+- 실시간과 같은 코드: TradingEngine.run_once -> SymbolFeed/TickStream -> SymbolTrader -> 전략 -> describe_result/exit_row
+- 벽시계 대신 ReplayClock: 주기마다 interval 초씩 진행, ClockTickSource 가 그 시각까지의 틱만 내보냄
+- 틱이 없는 구간은 건너뜀 (그 사이 주기는 같은 봉으로 같은 판단을 반복할 뿐이라 결과가 같음)
+- 틱 파일은 TradingEngine(record_ticks=True) (또는 AUTOTRADE_RECORD_TICKS=1) 로 실시간 중 저장한 것
+"""
+import argparse
+import math
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dataMT5.tick_stream import TICK_DTYPE, TIMEFRAME_SECONDS, ClockTickSource, load_ticks, to_tick_array
+from engine.latency import LatencyRecorder
+from engine.trade_store import TRADE_FIELDS, TradeStore, describe_result, exit_row
+from engine.trading_engine import SymbolTrader, TradingEngine
+
+
+class ReplayClock:
+    """리플레이 시각 (epoch 초). Replay 가 주기마다 직접 옮김"""
+    def __init__(self, now=0.0):
+        self.now = float(now)
+
+
+def bars_to_ticks(bars, seconds=TIMEFRAME_SECONDS['M5'], spread=0.0):
+    """
+    봉 DataFrame -> 봉마다 4틱 (시가 -> 저가/고가 -> 고가/저가 -> 종가, 양봉은 저가 먼저).
+    틱 저장이 없을 때 봉만으로 리플레이하기 위한 근사
+    """
+    start_ms = pd.DatetimeIndex(bars['time']).as_unit('ms').asi8  # CSV 로 읽으면 us 단위라 단위 고정
+    o, h, l, c = (bars[k].to_numpy(dtype=float) for k in ('open', 'high', 'low', 'close'))
+    up = c >= o
+    path = np.stack([o, np.where(up, l, h), np.where(up, h, l), c], axis=1)
+    offsets = np.array([0, seconds * 250, seconds * 500, seconds * 1000 - 1000], dtype=np.int64)
+    ticks = np.zeros(len(bars) * 4, dtype=TICK_DTYPE)
+    ticks['time_msc'] = (start_ms[:, None] + offsets[None, :]).ravel()
+    ticks['time'] = ticks['time_msc'] // 1000
+    ticks['bid'] = path.ravel()
+    ticks['ask'] = path.ravel() + spread
+    ticks['last'] = path.ravel()
+    ticks['volume'] = 1
+    return ticks
+
+
+class Replay:
+    def __init__(self, interval=0.2, speed=None, bar_seconds=TIMEFRAME_SECONDS['M5'], history=300, log_fn=None):
+        """
+        interval: 엔진 주기 (리플레이 시계 기준 초, 실시간 TradingEngine 과 같은 값)
+        speed: None 이면 최대 속도, 숫자면 그 배속으로 벽시계에 맞춤
+        log_fn(text): 결과 로그를 바로 출력할 곳 (None 이면 lines 에만 모음)
+        """
+        self.interval = interval
+        self.speed = speed
+        self.bar_seconds = bar_seconds
+        self.history = history
+        self.log_fn = log_fn
+        self.clock = ReplayClock()
+        self.trades = TradeStore()
+        self.results = []  # (symbol, 전략 결과 dict)
+        self.lines = []
+        self.errors = []
+        # 실시간 지연시간 통계(get_latency)에 섞이지 않도록 따로
+        self.engine = TradingEngine(interval, on_result=self._on_result, log_fn=self.errors.append,
+                                    latency=LatencyRecorder(enabled=False))
+        self._sources = []
+
+    def add(self, strategy, symbol, ticks, bars=None):
+        """
+        (전략, 심볼) 등록. ticks: TICK_DTYPE 배열/DataFrame, bars: 첫 틱 이전 봉 DataFrame (초기 이력)
+        bars 에 첫 틱 이후 봉이 섞여 있으면 잘라냄
+        """
+        ticks = to_tick_array(ticks)
+        if bars is not None and len(ticks):
+            first_bar = ticks['time_msc'][0] // 1000 // self.bar_seconds * self.bar_seconds
+            bars = bars[bars['time'] < pd.Timestamp(int(first_bar), unit='s', tz='UTC')]
+        source = ClockTickSource(ticks, self.clock)
+        trader = SymbolTrader(strategy, symbol, self.bar_seconds, self.history,
+                              latency=self.engine.latency, bars=bars)
+        self.engine.add(trader, source)
+        self._sources.append(source)
+        return trader
+
+    def _on_result(self, trader, result):
+        # 실시간 창 process_strategy_result 와 같은 처리
+        self.results.append((trader.symbol, result))
+        line = describe_result(result)
+        if line is not None:
+            self.lines.append(line)
+            if self.log_fn is not None:
+                self.log_fn(line)
+        if 'exit' in result:
+            self.trades.append([exit_row(result, trader.strategy.lot)])
+
+    def run(self, until=None):
+        """
+        모든 틱을 다 내보낼 때까지 (또는 리플레이 시각 until(epoch 초) 까지) 실행. 요약 dict 반환
+        """
+        pending = [s.next_msc for s in self._sources if not s.exhausted]
+        if not pending:
+            return self.summary(0, 0.0, 0.0)
+        interval = self.interval
+        # 시계는 start + k * interval (부동소수 누적 오차 없음)
+        start = math.floor(min(pending) / 1000 / interval) * interval
+        k = 0
+        self.clock.now = start
+        wall_start = time.perf_counter()
+        cycles = 0
+        while True:
+            self.engine.run_once()
+            cycles += 1
+            pending = [s.next_msc for s in self._sources if not s.exhausted]
+            if not pending or (until is not None and self.clock.now >= until):
+                break
+            # 다음 틱이 들어가는 주기로 바로 이동
+            k = max(k + 1, math.ceil((min(pending) / 1000 - start) / interval))
+            if self.speed:
+                delay = wall_start + k * interval / self.speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            self.clock.now = start + k * interval
+        return self.summary(cycles, self.clock.now - start, time.perf_counter() - wall_start)
+
+    def summary(self, cycles, sim_seconds, wall_seconds):
+        profit = self.trades.column('profit')
+        return {
+            'cycles': cycles,
+            'ticks': sum(s.pos for s in self._sources),
+            'sim_seconds': sim_seconds,
+            'wall_seconds': wall_seconds,
+            'speedup': sim_seconds / wall_seconds if wall_seconds > 0 else None,
+            'entries': sum(1 for _, r in self.results if r['signal'].endswith('entry')),
+            'trades': self.trades.count,
+            'profit': float(profit.sum()),
+            'errors': len(self.errors),
+        }
+
+    def trades_frame(self):
+        """trades 를 DataFrame 으로 (시각은 UTC Timestamp)"""
+        df = pd.DataFrame(self.trades.columns())
+        for name in ('entry_time', 'exit_time'):
+            df[name] = pd.to_datetime(df[name].where(df[name] != np.iinfo(np.int64).min), utc=True)
+        df['reason'] = self.trades.reasons
+        return df[[name for name, _ in TRADE_FIELDS] + ['reason']]
+
+
+def load_bars(path):
+    """get_mt5_ohlcv 형식 CSV (time 컬럼 UTC) -> DataFrame"""
+    df = pd.read_csv(path)
+    df['time'] = pd.to_datetime(df['time'], utc=True)
+    if 'time_local' not in df:
+        df['time_local'] = df['time'].dt.tz_convert('Asia/Seoul')
+    return df
+
+
+def main(argv=None):
+    from strategy.real_Ichimoku_Strategy import IchimokuBreakoutStrategyRT
+
+    parser = argparse.ArgumentParser(description="저장된 봉/틱으로 실시간 매매 경로 리플레이")
+    parser.add_argument('--symbol', default='GBPJPY')
+    parser.add_argument('--ticks', default=None, help="틱 파일 (.bin TickRecorder / .npy / .csv)")
+    parser.add_argument('--bars', default=None, help="봉 CSV (get_mt5_ohlcv 형식). 없으면 로컬 캐시(M5) 사용")
+    parser.add_argument('--history', type=int, default=300, help="초기 봉 개수")
+    parser.add_argument('--interval', type=float, default=0.2, help="엔진 주기 (초)")
+    parser.add_argument('--speed', type=float, default=None, help="배속 (기본: 최대 속도)")
+    parser.add_argument('--pip', type=float, default=0.01)
+    parser.add_argument('--tp', type=float, default=0.18)
+    parser.add_argument('--sl', type=float, default=0.15)
+    parser.add_argument('--on-close', action='store_true', help="진입 판단을 봉 마감 때 확정봉 기준으로 1번만")
+    parser.add_argument('--out', default=None, help="거래 목록 CSV 저장 경로")
+    parser.add_argument('--quiet', action='store_true', help="진입/청산 로그 출력 안 함")
+    args = parser.parse_args(argv)
+
+    if args.bars:
+        bars = load_bars(args.bars)
+    else:
+        from dataMT5.ohlcv_store import get_store
+        bars = get_store(args.symbol, 5).to_frame()  # 5 == mt5.TIMEFRAME_M5
+    if args.ticks:
+        ticks = load_ticks(args.ticks)
+    else:
+        # 틱이 없으면 초기 이력 이후 봉을 틱으로 바꿔서 사용
+        ticks = bars_to_ticks(bars.iloc[args.history:])
+        bars = bars.iloc[:args.history]
+
+    replay = Replay(interval=args.interval, speed=args.speed, history=args.history,
+                    log_fn=None if args.quiet else print)
+    strategy = IchimokuBreakoutStrategyRT(pip=args.pip, tp_pips=args.tp, sl_pips=args.sl, symbol=args.symbol,
+                                          entry_on_close=args.on_close)
+    replay.add(strategy, args.symbol, ticks, bars)
+    summary = replay.run()
+    for text in replay.errors:
+        print(text, file=sys.stderr)
+    print(f"주기 {summary['cycles']}회, 틱 {summary['ticks']}개, 리플레이 {summary['sim_seconds']:.0f}초 "
+          f"/ 실제 {summary['wall_seconds']:.2f}초 (x{summary['speedup'] or 0:.0f})")
+    print(f"진입 {summary['entries']}회, 청산 {summary['trades']}회, 수익 합계 {summary['profit']:.3f}")
+    if args.out:
+        replay.trades_frame().to_csv(args.out, index=False)
+        print(f"거래 목록 저장: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+# startup.py
+"""
+앱 시작 시간 측정 (Qt 의존성 없음).
+
+    profile = StartupProfile(t0)          # main.py 맨 앞에서 잰 perf_counter() 기준
+    profile.mark("PyQt5 import")          # 메인 스레드 단계: 직전 mark 이후 걸린 시간
+    with profile.stage("MT5 연결"):        # 백그라운드 단계: 시작 ~ 끝 (메인 스레드 단계와 겹칠 수 있음)
+        ...
+    for line in profile.lines():          # 시작 순서대로 "이름  걸린 시간  (시작 ~ 끝 ms)"
+        log(line)
+
+- mark 는 메인 스레드에서만 (단계가 이어진다고 보고 직전 mark 와의 차이를 잼)
+- 백그라운드 스레드 단계는 스레드 이름을 같이 표시
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    def __init__(self, t0=None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.stages = []  # (이름, 시작 ms, 끝 ms, 스레드 이름)
+        self._last = self.t0
+        self._lock = threading.Lock()
+
+    def _ms(self, t):
+        return (t - self.t0) * 1000
+
+    def elapsed_ms(self):
+        return self._ms(time.perf_counter())
+
+    def mark(self, name):
+        """직전 mark (없으면 t0) 부터 지금까지를 name 단계로 기록. t0 기준 지금 시각(ms) 반환"""
+        now = time.perf_counter()
+        with self._lock:
+            self.stages.append((name, self._ms(self._last), self._ms(now), threading.current_thread().name))
+            self._last = now
+        return self._ms(now)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.stages.append((name, self._ms(start), self._ms(end), threading.current_thread().name))
+
+    def lines(self):
+        with self._lock:
+            stages = sorted(self.stages, key=lambda s: s[1])
+        main = threading.main_thread().name
+        return [
+            f"{name}: {end - start:.0f} ms ({start:.0f} ~ {end:.0f} ms{'' if thread == main else ', ' + thread})"
+            for name, start, end, thread in stages
+        ]
@@ -0,0 +1,361 @@
+# trade_journal.py
+"""
+전략 결과(진입/청산) 추가 전용 바이너리 저널 + 재시작 시 복구 (Qt 의존성 없음).
+
+    journal = get_journal()
+    journal.record(symbol, strategy, result)   # 엔진 워커 스레드에서 (큐에 넣기만, 디스크 I/O 없음)
+    journal.flush()                            # 지금까지 넣은 레코드가 디스크에 내려갈 때까지 대기
+    state = journal.recover()                  # 재시작 시: 파일을 메모리맵으로 읽음
+    state.restore(strategy, symbol)            # 열린 포지션 -> 전략 상태 (position / entry_price / entry_time)
+    store = state.trades(strategy, symbol)     # 청산된 거래 -> TradeStore (블로터 행)
+
+- 레코드는 JOURNAL_DTYPE 고정 길이 68 바이트. 파일 = 헤더 16 바이트 + 레코드 이어 붙이기
+- 쓰기 스레드가 쌓인 레코드를 묶어서 write + fsync 1번 (group commit). 매매 스레드는 큐가 가득 찼을 때만 기다림
+  (레코드를 버리면 재시작 때 포지션/거래가 틀어지므로 버리지 않음)
+- 파일 열기/쓰기가 실패하면 레코드를 보류해 두고 retry_seconds 마다 순서대로 다시 씀 (실패/복구는 로그 파이프라인으로)
+- 복구는 np.memmap + 벡터 연산 (레코드 수백만 개도 수 ms). 쓰다가 죽어서 잘린 마지막 레코드는 무시
+- trader 식별: (심볼, strategy.journal_key()) 해시. 이름 + 설정값이라 같은 전략도 설정이 다르면 따로 복구
+  (같은 심볼/전략/설정을 창 두 개에서 돌리면 한 포지션으로 보임)
+"""
+import functools
+import hashlib
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from engine.log_pipeline import get_log
+from engine.trade_store import NAT, TradeStore, to_ns, trade_profit
+
+DEFAULT_JOURNAL_DIR = os.environ.get(
+    'AUTOTRADE_JOURNAL_DIR', os.path.join(os.path.expanduser('~'), '.autoTradeMT5', 'journal')
+)
+
+MAGIC = b'ATJRNL01'
+
+JOURNAL_DTYPE = np.dtype([
+    ('time_ns', '<i8'),      # 기록 시각 (UTC epoch ns)
+    ('key', '<u8'),          # trader_key(심볼, strategy.journal_key())
+    ('bar_ns', '<i8'),       # 결과 time (진입 시각 / 청산 시각)
+    ('entry_ns', '<i8'),     # 청산: 진입 시각
+    ('price', '<f8'),        # 진입가 / 청산가
+    ('entry_price', '<f8'),  # 청산: 진입가
+    ('profit', '<f8'),       # 청산: 블로터 손익 (trade_profit)
+    ('lot', '<f8'),
+    ('mask', '<u2'),         # 진입 조건 비트마스크
+    ('signal', 'u1'),        # SIGNALS 인덱스
+    ('side', 'i1'),          # 1 롱 / -1 숏
+])
+HEADER_SIZE = 16  # MAGIC + 레코드 크기(u4) + 예약
+
+SIGNALS = ('long_entry', 'short_entry', 'long_exit_tp', 'long_exit_sl', 'short_exit_tp', 'short_exit_sl')
+SIGNAL_CODES = {name: code for code, name in enumerate(SIGNALS)}
+FIRST_EXIT = SIGNAL_CODES['long_exit_tp']  # 이 값 이상이면 청산
+
+
+@functools.lru_cache(maxsize=1024)
+def trader_key(symbol, strategy_key):
+    """(심볼, strategy.journal_key()) -> 레코드 key (실행마다 같은 값)"""
+    digest = hashlib.blake2b(f"{symbol}|{strategy_key}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def _header():
+    return MAGIC + np.uint32(JOURNAL_DTYPE.itemsize).tobytes() + bytes(HEADER_SIZE - len(MAGIC) - 4)
+
+
+def read_records(path):
+    """저널 파일 -> 레코드 메모리맵 (읽기 전용, 잘린 마지막 레코드 제외). 파일이 없으면 빈 배열"""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        size = 0
+    if size < HEADER_SIZE:
+        return np.empty(0, dtype=JOURNAL_DTYPE)
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    if header[:len(MAGIC)] != MAGIC or int(np.frombuffer(header, '<u4', 1, len(MAGIC))[0]) != JOURNAL_DTYPE.itemsize:
+        raise ValueError(f"저널 형식이 다름: {path}")
+    n = (size - HEADER_SIZE) // JOURNAL_DTYPE.itemsize
+    if n == 0:
+        return np.empty(0, dtype=JOURNAL_DTYPE)
+    return np.memmap(path, dtype=JOURNAL_DTYPE, mode='r', offset=HEADER_SIZE, shape=(n,))
+
+
+class JournalState:
+    """저널 레코드에서 복구한 상태 (포지션 / 거래 목록은 요청한 trader 것만 그때 계산)"""
+    def __init__(self, records):
+        self.records = records
+        self._index = {}  # key -> 레코드 번호 배열
+
+    def __len__(self):
+        return len(self.records)
+
+    def _indices(self, symbol, strategy_key):
+        key = trader_key(symbol, strategy_key)
+        idx = self._index.get(key)
+        if idx is None:
+            idx = self._index[key] = np.flatnonzero(self.records['key'] == key)
+        return idx
+
+    def open_position(self, symbol, strategy_key):
+        """마지막 레코드가 진입이면 그 레코드 (열린 포지션), 아니면 None"""
+        idx = self._indices(symbol, strategy_key)
+        if len(idx) == 0:
+            return None
+        rec = self.records[idx[-1]]
+        return rec if rec['signal'] < FIRST_EXIT else None
+
+    def restore(self, strategy, symbol=None):
+        """열린 포지션이 있으면 전략에 복원하고 True (TP/SL 가격도 전략 설정으로 다시 계산)"""
+        symbol = symbol or strategy.symbol
+        rec = self.open_position(symbol, strategy.journal_key())
+        if rec is None:
+            return False
+        entry_time = None if rec['bar_ns'] == NAT else pd.Timestamp(int(rec['bar_ns']), tz='UTC')
+        strategy.open_position(int(rec['side']), float(rec['price']), entry_time)
+        return True
+
+    def trades(self, strategy, symbol=None, store=None):
+        """청산 레코드 -> TradeStore (exit_row 와 같은 행, 판단근거는 표시할 때 생성)"""
+        from strategy.base import exit_reason
+
+        records = self.records
+        idx = self._indices(symbol or strategy.symbol, strategy.journal_key())
+        idx = idx[records['signal'][idx] >= FIRST_EXIT]
+        store = store if store is not None else TradeStore(max(1024, len(idx)))
+        if len(idx) == 0:
+            return store
+        # 필요한 컬럼만 골라 읽음 (레코드 전체를 복사하지 않음)
+        signal, entry, price = records['signal'][idx], records['entry_price'][idx], records['price'][idx]
+        store.extend({
+            'entry_time': records['entry_ns'][idx],
+            'exit_time': records['bar_ns'][idx],
+            'position': records['side'][idx],
+            'entry_price': entry,
+            'exit_price': price,
+            'profit': records['profit'][idx],
+            'lot': records['lot'][idx],
+        }, reason_fn=lambda k: exit_reason(SIGNALS[signal[k]], float(entry[k]), float(price[k])))
+        return store
+
+
+class TradeJournal:
+    def __init__(self, path=None, fsync=True, batch=4096, max_queue=100000, retry_seconds=1.0,
+                 max_pending=1000000):
+        """
+        path: 저널 파일 (None 이면 DEFAULT_JOURNAL_DIR/trades.bin)
+        fsync: False 면 write 후 flush 까지만 (OS 캐시, 테스트/리플레이용)
+        batch: 한 번에 묶어 쓰는 최대 레코드 수
+        max_queue: 큐 크기. 가득 차면 record 가 자리가 날 때까지 기다림
+        retry_seconds: 파일 열기/쓰기 실패 시 재시도 간격 (실패한 레코드는 보류해 두고 순서대로 다시 씀)
+        max_pending: 실패로 보류할 최대 레코드 수 (넘치면 dropped 로 세고 버림)
+        """
+        self.path = path or os.path.join(DEFAULT_JOURNAL_DIR, 'trades.bin')
+        self.fsync = fsync
+        self.batch = batch
+        self.queue = queue.Queue(max_queue)
+        self.retry_seconds = retry_seconds
+        self.max_pending = max_pending
+        self.written = 0   # 디스크에 쓴 레코드 수
+        self.commits = 0   # write + fsync 횟수
+        self.dropped = 0   # 기록 못 하고 버린 레코드 수 (쓰기 스레드 없음 / 보류 한도 초과 / 종료 때 남은 보류분)
+        self._stalled = False  # 큐가 가득 찬 상태 (로그는 밀리기 시작할 때 한 번만)
+        self._failing = False  # 쓰기 실패 중 (로그는 실패/복구 때 한 번씩만)
+        self._file = None
+        self._end = None   # 마지막으로 성공한 commit 끝 위치 (실패한 write 가 남긴 부분을 다시 열 때 잘라냄)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    # ---- 쓰기 ----
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='trade-journal', daemon=True)
+            self._thread.start()
+
+    def record(self, symbol, strategy, result):
+        """전략 결과 dict 1건 예약 (진입/청산만, 나머지는 무시). 어느 스레드에서든"""
+        code = SIGNAL_CODES.get(result.get('signal'))
+        if code is None:
+            return
+        key = trader_key(symbol, strategy.journal_key())
+        if code >= FIRST_EXIT:
+            side = 1 if code < SIGNAL_CODES['short_exit_tp'] else -1
+            entry, price = result['entry'], result['exit']
+            rec = (time.time_ns(), key, to_ns(result.get('time')),
+                   to_ns(result.get('entry_time')), price, entry, trade_profit(side, entry, price),
+                   strategy.lot, 0, code, side)
+        else:
+            rec = (time.time_ns(), key, to_ns(result.get('time')), NAT,
+                   result['price'], np.nan, np.nan, strategy.lot, result.get('mask', 0), code,
+                   1 if code == SIGNAL_CODES['long_entry'] else -1)
+        if self._thread is None:
+            self.start()
+        try:
+            self.queue.put_nowait(rec)
+            self._stalled = False
+            return
+        except queue.Full:
+            pass
+        # 디스크가 밀림: 쓰기 스레드가 살아 있는 동안은 자리가 날 때까지 기다림 (진입/청산 순서 유지)
+        if not self._stalled:
+            self._stalled = True
+            get_log().warning(f"저널 큐가 가득 참 ({self.queue.maxsize}건), 기록될 때까지 대기", source='journal')
+        while self._thread is not None and self._thread.is_alive():
+            try:
+                self.queue.put(rec, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+        self.dropped += 1
+        get_log().error(f"저널 기록 못 함 (쓰기 스레드 없음, 누적 {self.dropped}건): {symbol} {result.get('signal')}",
+                        source='journal')
+
+    def flush(self, timeout=2.0):
+        """지금까지 예약된 레코드가 기록(fsync)될 때까지 대기. 시간 안에 끝나면 True"""
+        if self._thread is None or not self._thread.is_alive():
+            return self.queue.empty()
+        deadline = time.monotonic() + timeout
+        done = threading.Event()
+        try:
+            self.queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(max(0.0, deadline - time.monotonic()))
+
+    def close(self, timeout=2.0):
+        if self._thread is not None and self._thread.is_alive():
+            try:
+                self.queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        f = open(self.path, 'ab')
+        try:
+            if f.tell() == 0:
+                f.write(_header())
+            else:
+                # 헤더 확인 + 잘린 마지막 레코드(또는 실패한 write 가 남긴 부분)는 잘라내고 이어 씀
+                read_records(self.path)
+                size = f.tell()
+                end = size - (size - HEADER_SIZE) % JOURNAL_DTYPE.itemsize
+                if self._end is not None:
+                    end = min(end, self._end)
+                if end < size:
+                    f.truncate(end)
+                    f.seek(end)
+        except BaseException:
+            f.close()
+            raise
+        self._file = f
+        self._end = f.tell()
+
+    def _commit(self, records):
+        data = np.array(records, dtype=JOURNAL_DTYPE).tobytes()
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._end += len(data)
+        self.written += len(records)
+        self.commits += 1
+
+    def _write(self, records):
+        """records 기록 시도 -> 성공하면 True. 실패하면 파일을 닫아 두고 다음 시도에 다시 열어서 이어 씀"""
+        try:
+            if self._file is None:
+                self._open()
+            self._commit(records)
+        except (OSError, ValueError) as e:
+            if self._file is not None:
+                try:
+                    self._file.close()
+                except OSError:
+                    pass
+                self._file = None
+            if not self._failing:
+                self._failing = True
+                get_log().error(f"저널 기록 실패, {len(records)}건 보류하고 {self.retry_seconds:g}초마다 재시도: {e}",
+                                source='journal')
+            return False
+        if self._failing:
+            self._failing = False
+            get_log().info(f"저널 기록 복구 ({len(records)}건 기록)", source='journal')
+        return True
+
+    def _run(self):
+        pending = []   # 아직 디스크에 못 쓴 레코드 (실패하면 버리지 않고 재시도)
+        waiters = []   # pending 이 다 기록되면 풀어 줄 flush 대기
+        retry_at = 0.0
+        closing = False
+        while not closing:
+            # fsync 하는 동안 쌓인 레코드를 다음 번에 한꺼번에 (group commit)
+            timeout = max(0.0, retry_at - time.monotonic()) if pending else None
+            try:
+                items = [self.queue.get(timeout=timeout)]
+            except queue.Empty:
+                items = []
+            while items and len(items) < self.batch:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            overflow = 0
+            for item in items:
+                if type(item) is tuple:
+                    if len(pending) < self.max_pending:
+                        pending.append(item)
+                    else:
+                        overflow += 1
+                elif item is None:
+                    closing = True
+                else:
+                    waiters.append(item)
+            if overflow:
+                self.dropped += overflow
+                get_log().error(f"저널 보류 레코드가 {self.max_pending}건을 넘어 {overflow}건 버림 "
+                                f"(누적 {self.dropped}건)", source='journal')
+            if pending and (closing or time.monotonic() >= retry_at):
+                if self._write(pending):
+                    pending = []
+                else:
+                    retry_at = time.monotonic() + self.retry_seconds
+            if not pending:
+                for done in waiters:
+                    done.set()  # flush 대기
+                waiters = []
+        if pending:
+            self.dropped += len(pending)
+            get_log().error(f"저널 종료: 기록 못 한 레코드 {len(pending)}건 버림 (누적 {self.dropped}건)",
+                            source='journal')
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # ---- 복구 ----
+    def recover(self):
+        """파일에 기록된 레코드로 JournalState (아직 큐에 있는 레코드는 제외, 필요하면 flush 먼저)"""
+        return JournalState(read_records(self.path))
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_journal():
+    """프로세스 공용 TradeJournal (실시간 엔진이 기록, 실시간 매매 창이 복구)"""
+    global _journal
+    if _journal is None:
+        with _journal_lock:
+            if _journal is None:
+                _journal = TradeJournal()
+    return _journal
@@ -0,0 +1,225 @@
+# trade_store.py
+"""
+청산된 거래 목록을 컬럼별 numpy 배열로 보관 (미리 잡아둔 용량을 2배씩 늘림 -> 추가 1건 amortized O(1)).
+GUI 블로터(gui.trade_blotter.TradeTableModel)와 리플레이(engine.replay)가 같은 저장소/결과 처리를 사용.
+"""
+import numpy as np
+
+# 컬럼 이름 -> 자료형. 시각은 UTC epoch ns (없으면 NAT)
+TRADE_FIELDS = [
+    ('entry_time', np.int64),
+    ('exit_time', np.int64),
+    ('position', np.int8),       # 1 롱 / -1 숏
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('profit', np.float64),
+    ('lot', np.float64),
+]
+NAT = np.iinfo(np.int64).min
+
+
+def to_ns(t):
+    """pandas Timestamp / datetime64 / None -> epoch ns"""
+    if t is None:
+        return NAT
+    value = getattr(t, 'value', None)  # pandas Timestamp
+    if value is not None:
+        return int(value)
+    return int(np.datetime64(t, 'ns').astype(np.int64))
+
+
+def trade_profit(position, entry, exit_price):
+    """블로터 손익 (가격 차이, 소수 3자리)"""
+    profit = exit_price - entry if position == 1 else entry - exit_price
+    return round(profit, 3)
+
+
+def exit_row(result, lot):
+    """전략 청산 결과 dict -> TradeStore 한 행 (process_strategy_result 와 같은 손익 계산)"""
+    position = 1 if result['signal'].startswith('long') else -1
+    entry, exit_price = result['entry'], result['exit']
+    return {
+        'entry_time': to_ns(result.get('entry_time')),
+        'exit_time': to_ns(result.get('time')),
+        'position': position,
+        'entry_price': entry,
+        'exit_price': exit_price,
+        'profit': trade_profit(position, entry, exit_price),
+        'lot': lot,
+        'reason': str(result.get('reason', "-")),
+    }
+
+
+def describe_result(result):
+    """전략 결과 dict -> 콘솔 로그 한 줄 (실시간 매매 창/리플레이 공용). 진입/청산이 아니면 None"""
+    sig = result['signal']
+    now = result.get('time')
+    if sig == 'long_entry':
+        return f"[진입] 롱 진입 {now} 진입가: {result['price']}"
+    if sig == 'short_entry':
+        return f"[진입] 숏 진입 {now} 진입가: {result['price']}"
+    if sig in ('long_exit_tp', 'long_exit_sl', 'short_exit_tp', 'short_exit_sl'):
+        entry, exit_price = result['entry'], result['exit']
+        if sig.startswith('long'):
+            side, profit = '롱', round(exit_price - entry, 3)
+        else:
+            side, profit = '숏', round(entry - exit_price, 3)
+        return f"[청산] {side} {'익절' if sig.endswith('tp') else '손절'} {now} 청산가: {exit_price}, 수익: {profit}"
+    return None
+
+
+class TradeStore:
+    def __init__(self, capacity=1024):
+        self.count = 0
+        self._cols = {name: np.empty(capacity, dtype=dtype) for name, dtype in TRADE_FIELDS}
+        self.reasons = []  # 판단근거 문자열 (행 번호 = 리스트 인덱스, None 이면 reason() 에서 그때 생성)
+        self._reason_fns = []  # (첫 행, fn(구간 안 번호) -> 문자열) - extend 로 한 번에 넣은 구간
+
+    @property
+    def capacity(self):
+        return len(self._cols['profit'])
+
+    def _reserve(self, n):
+        if n <= self.capacity:
+            return
+        new_cap = self.capacity
+        while new_cap < n:
+            new_cap *= 2
+        for name, arr in self._cols.items():
+            grown = np.empty(new_cap, dtype=arr.dtype)
+            grown[:self.count] = arr[:self.count]
+            self._cols[name] = grown
+
+    def append(self, rows):
+        """rows: exit_row 형식 dict 목록. 추가된 첫 행 번호 반환"""
+        first = self.count
+        n = len(rows)
+        self._reserve(first + n)
+        for name, _ in TRADE_FIELDS:
+            col = self._cols[name]
+            for k, row in enumerate(rows):
+                col[first + k] = row[name]
+        self.reasons.extend(row.get('reason', "-") for row in rows)
+        self.count = first + n
+        return first
+
+    def extend(self, columns, reason_fn=None):
+        """
+        컬럼별 배열 dict 를 한 번에 추가 (저널 복구 등 대량). 추가된 첫 행 번호 반환.
+        reason_fn(k): k 번째 추가 행의 판단근거 (표시/정렬할 때만 호출)
+        """
+        first = self.count
+        n = len(columns['profit'])
+        self._reserve(first + n)
+        for name, _ in TRADE_FIELDS:
+            self._cols[name][first:first + n] = columns[name]
+        self.reasons.extend([None] * n if reason_fn is not None else ["-"] * n)
+        if reason_fn is not None:
+            self._reason_fns.append((first, reason_fn))
+        self.count = first + n
+        return first
+
+    def reason(self, row):
+        text = self.reasons[row]
+        if text is None:
+            for first, fn in reversed(self._reason_fns):
+                if row >= first:
+                    text = self.reasons[row] = fn(row - first)
+                    break
+        return text
+
+    def column(self, name):
+        """name 컬럼의 유효 구간 뷰 (복사 없음)"""
+        return self._cols[name][:self.count]
+
+    def columns(self):
+        return {name: self.column(name) for name, _ in TRADE_FIELDS}
+
+    def value(self, row, name):
+        if name == 'reason':
+            return self.reason(row)
+        return self._cols[name][row]
+
+    def clear(self):
+        self.count = 0
+        self.reasons = []
+        self._reason_fns = []
+
+
+class RowOrder:
+    """
+    블로터에 보여줄 행 번호 순서 (정렬/필터 결과). 행 번호와 정렬 키를 용량 2배씩 늘리는 버퍼에 보관.
+    - 새 행은 그 행 키만 읽어서 searchsorted 로 위치를 찾음 (이미 있는 행 키를 다시 읽지 않음)
+    - 새 키가 마지막 키 이상이면 (시각 순 정렬, 필터만 등) 끝에 쓰기만 -> 추가 1건 amortized O(1).
+      중간에 끼울 때만 배열 복사 (O(n) numpy 복사, 파이썬 루프 없음)
+    - 내림차순은 오름차순으로 보관하고 뒤에서부터 읽음
+    """
+    def __init__(self, keys_of=None, descending=False, capacity=1024):
+        """keys_of(rows) -> rows 의 정렬 키 배열 (None 이면 추가 순서 그대로)"""
+        self.keys_of = keys_of
+        self.descending = descending
+        self.count = 0
+        self._rows = np.empty(capacity, dtype=np.int64)
+        self._keys = None
+
+    def __len__(self):
+        return self.count
+
+    def _reserve(self, n, key_dtype=None):
+        cap = len(self._rows)
+        if self._keys is None and key_dtype is not None:
+            self._keys = np.empty(cap, dtype=key_dtype)
+        if n <= cap:
+            return
+        while cap < n:
+            cap *= 2
+        rows = np.empty(cap, dtype=np.int64)
+        rows[:self.count] = self._rows[:self.count]
+        self._rows = rows
+        if self._keys is not None:
+            keys = np.empty(cap, dtype=self._keys.dtype)
+            keys[:self.count] = self._keys[:self.count]
+            self._keys = keys
+
+    def rows(self):
+        """표시 순서 행 번호 배열"""
+        rows = self._rows[:self.count]
+        return rows[::-1] if self.descending else rows
+
+    def at(self, i):
+        """표시 i 번째 행 번호"""
+        return int(self._rows[self.count - 1 - i] if self.descending else self._rows[i])
+
+    def reset(self, rows):
+        """전체 다시 정렬 (정렬 기준/필터를 바꿀 때)"""
+        self.count = 0
+        self._keys = None
+        self.add(rows)
+
+    def add(self, rows):
+        """새 행 번호들 추가 (정렬 위치에 끼워 넣음)"""
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) == 0:
+            return
+        n = self.count
+        if self.keys_of is None:
+            self._reserve(n + len(rows))
+            self._rows[n:n + len(rows)] = rows
+            self.count = n + len(rows)
+            return
+        keys = np.asarray(self.keys_of(rows))
+        idx = np.argsort(keys, kind='stable')
+        rows, keys = rows[idx], keys[idx]
+        self._reserve(n + len(rows), keys.dtype)
+        old_keys = self._keys[:n]
+        # 같은 키는 먼저 들어온 행이 앞 (stable)
+        pos = np.searchsorted(old_keys, keys, side='right')
+        if pos[0] == n:
+            self._rows[n:n + len(rows)] = rows
+            self._keys[n:n + len(rows)] = keys
+        else:
+            merged_rows = np.insert(self._rows[:n], pos, rows)
+            merged_keys = np.insert(old_keys, pos, keys)
+            self._rows[:len(merged_rows)] = merged_rows
+            self._keys[:len(merged_keys)] = merged_keys
+        self.count = n + len(rows)
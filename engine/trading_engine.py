@@ -0,0 +1,342 @@
+# trading_engine.py
+"""
+GUI 스레드와 분리된 자동매매 엔진 (Qt 의존성 없음).
+
+- SymbolFeed: 심볼 1개의 틱 수집 + Resampler (모든 타임프레임 봉 집계). 같은 심볼을 쓰는 trader 들이 공유
+  (심볼당 MT5 호출 1번, 같은 타임프레임 봉 이력도 1개)
+- SymbolTrader: (심볼, 전략) 1쌍. 필요한 타임프레임을 구독(BarSeries)해서 진입/청산 판단
+- TradingEngine: 모든 (심볼, 전략) 을 워커 스레드 하나에서 처리.
+  주기마다 모든 심볼의 틱을 한 번에 수집한 뒤 전체 전략을 평가하고
+  결과(진입/청산)와 시세를 콜백으로 넘김. UI 쪽 전달은 gui.engine_bridge 가 담당
+"""
+import os
+import threading
+import time
+import traceback
+
+from dataMT5.resampler import Resampler, TIMEFRAME_SECONDS
+from dataMT5.session import get_session
+from dataMT5.tick_stream import TickStream, MT5TickSource, TickRecorder
+from engine.latency import get_latency
+from engine.trade_journal import get_journal
+from strategy.indicators import IndicatorGraph
+
+LOAD_RETRY_SECONDS = 2.0  # 초기 봉 로드 실패 시 재시도 간격
+
+
+class SymbolFeed:
+    def __init__(self, symbol, tick_source=None, recorder=None):
+        self.symbol = symbol
+        self.traders = []
+        self.resampler = Resampler(symbol)
+        self.stream = TickStream(
+            tick_source or MT5TickSource(symbol), timeframes=(TIMEFRAME_SECONDS['M1'],),
+            on_quote=self._on_quote, recorder=recorder, resampler=self.resampler
+        )
+
+    @property
+    def bid(self):
+        return self.stream.bid
+
+    @property
+    def ask(self):
+        return self.stream.ask
+
+    def add(self, trader):
+        series = trader.series = self.resampler.subscribe(trader.bar_seconds, trader.history)
+        # 같은 (심볼, 타임프레임) 전략들은 지표 그래프도 공유 (같은 지표는 봉/틱마다 1번 계산)
+        if series.graph is None:
+            series.graph = IndicatorGraph()
+        if hasattr(trader.strategy, 'graph'):
+            trader.strategy.graph = series.graph
+        # 워커 스레드가 순회 중일 수 있으므로 목록은 새로 만들어 교체
+        self.traders = self.traders + [trader]
+        trader.feed = self
+
+    def remove(self, trader):
+        self.traders = [t for t in self.traders if t is not trader]
+        if trader.series is not None:
+            self.resampler.unsubscribe(trader.series)
+        trader.feed = None
+
+    def poll(self):
+        return self.stream.poll()
+
+    def current_bar(self, seconds):
+        return self.stream.current_bar(seconds)
+
+    def _on_quote(self, bid, ask, time):
+        for trader in self.traders:
+            trader.on_quote(bid, ask, time)
+
+
+class SymbolTrader:
+    def __init__(self, strategy, symbol, bar_seconds=None, history=300, latency=None, bars=None):
+        """
+        strategy: strategy.base.RealtimeStrategy 등 on_tick / on_quote 를 가진 전략
+        bar_seconds: 전략 판단 봉 길이 (초, None 이면 strategy.bar_seconds, 그것도 없으면 M5)
+        latency: 단계별 지연시간 기록 (None 이면 공용 get_latency())
+        bars: 초기 봉 DataFrame (리플레이/테스트용, None 이면 start 때 Resampler 가 MT5 에서)
+        """
+        self.strategy = strategy
+        self.symbol = symbol
+        self.latency = latency or get_latency()
+        strategy.latency = self.latency
+        self.bar_seconds = bar_seconds or getattr(strategy, 'bar_seconds', TIMEFRAME_SECONDS['M5'])
+        self.history = history
+        self.feed = None    # TradingEngine.add 에서 연결
+        self.series = None  # 구독한 BarSeries (같은 심볼/타임프레임 trader 들과 공유)
+        self._bars = bars
+        self._events = []
+        self.load_failures = 0     # 초기 봉 로드 연속 실패 횟수
+        self.load_retry_at = 0.0   # 다음 로드 시도 시각 (monotonic)
+
+    def start(self):
+        """
+        초기 봉 이력 채우기. 채워졌으면 True (MT5 연결/캐시 실패면 False -> 엔진이 나중에 다시 호출)
+        초기 봉은 MT5 (로컬 캐시 M1 을 리샘플) 에서, 이후는 틱으로 만든 봉으로 갱신.
+        같은 타임프레임을 다른 trader 가 이미 채웠으면 그대로 사용
+        """
+        series, feed = self.series, self.feed
+        if series is None:
+            return True  # 이미 제거됨
+        if series.loaded:
+            return True
+        if self._bars is not None:
+            series.set_frame(self._bars)
+        elif feed is not None:
+            feed.resampler.load()
+        return series.loaded
+
+    @property
+    def df_history(self):
+        """봉 이력 DataFrame (필요할 때만 링 버퍼에서 생성)"""
+        series = self.series
+        return series.frame if series is not None else None
+
+    @property
+    def bid(self):
+        return self.feed.bid if self.feed else None
+
+    @property
+    def ask(self):
+        return self.feed.ask if self.feed else None
+
+    def evaluate(self):
+        """
+        이번 주기의 틱이 반영된 뒤 진입 판단 1회. 이번 주기에 나온 전략 결과 dict 목록 반환
+        (청산은 틱마다 on_quote 에서, 진입은 주기마다 판단)
+        """
+        feed, series = self.feed, self.series  # 다른 스레드에서 remove 될 수 있으므로 지역 변수로
+        if feed is not None and series is not None and series.bars is not None and feed.bid is not None:
+            # 진행 중인 봉을 봉 이력 마지막 행에 반영 후 진입 판단 (현재가 = 최신 호가, 봉은 링 버퍼 뷰)
+            # (같은 BarSeries 를 쓰는 trader 가 이번 주기에 이미 반영했으면 건너뜀)
+            t0 = time.perf_counter_ns()
+            df = series.sync()
+            self.latency.record(self.symbol, 'bar', time.perf_counter_ns() - t0)
+            if self.strategy.position == 0:
+                # 봉 상태가 지난 판단 때와 같으면 전략이 캐시된 판단을 그대로 씀 (DataFrame 접근 없음)
+                # 롱 진입가는 ask (실제 매수 가격, 주문/TP/SL 과 같은 기준)
+                result = self.strategy.on_tick(df, feed.bid, bar_state=series.state, ask=feed.ask)
+                if result is not None:
+                    self._events.append(result)
+
+        events, self._events = self._events, []
+        return events
+
+    def on_quote(self, bid, ask, time):
+        result = self.strategy.on_quote(bid, ask, time)
+        if result is not None:
+            self._events.append(result)
+
+
+class TradingEngine:
+    def __init__(self, interval=0.2, on_result=None, on_quote=None, log_fn=print, latency=None, executor=None,
+                 record_ticks=False, journal=None):
+        """
+        interval: 틱 수집/판단 주기 (초)
+        latency: 단계별 지연시간 기록 (None 이면 공용 get_latency())
+        executor: engine.execution.OrderExecutor. 있으면 진입 신호마다 주문 전송 (브로커 TP/SL 포함),
+                  None 이면 기존처럼 전략 포지션만 바뀜
+        record_ticks: True 면 받은 틱을 TickRecorder 로 저장 (engine.replay 로 다시 돌려볼 수 있음)
+        journal: engine.trade_journal.TradeJournal. 있으면 진입/청산 결과를 저널에 기록 (재시작 시 복구용)
+        on_result(trader, result): 전략 결과(진입/청산) - 워커 스레드에서 호출, 절대 버리면 안 됨
+        on_quote(feed): 심볼별 시세 갱신 알림 (SymbolFeed) - 워커 스레드에서 호출, UI 쪽에서 최신 값만 써도 됨
+        """
+        self.interval = interval
+        self.on_result = on_result
+        self.on_quote = on_quote
+        self.log_fn = log_fn
+        self.latency = latency or get_latency()
+        self.executor = executor
+        self.record_ticks = record_ticks
+        self.journal = journal
+        self.traders = []
+        self.feeds = {}  # symbol -> SymbolFeed
+        self._pending_start = []  # 초기 봉을 아직 안 받은 trader
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add(self, trader, tick_source=None):
+        """(심볼, 전략) 등록. 같은 심볼의 SymbolFeed 가 없으면 생성 (tick_source 는 그때만 사용)"""
+        with self._lock:
+            feed = self.feeds.get(trader.symbol)
+            if feed is None:
+                recorder = TickRecorder(trader.symbol) if self.record_ticks else None
+                feed = self.feeds[trader.symbol] = SymbolFeed(trader.symbol, tick_source, recorder)
+            feed.add(trader)
+            self.traders.append(trader)
+            self._pending_start.append(trader)
+
+    def remove(self, trader):
+        with self._lock:
+            if trader in self.traders:
+                self.traders.remove(trader)
+            if trader in self._pending_start:
+                self._pending_start.remove(trader)
+            feed = self.feeds.get(trader.symbol)
+            if feed is not None:
+                feed.remove(trader)
+                if not feed.traders:
+                    del self.feeds[trader.symbol]
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        if self.executor is not None:
+            self.executor.start()
+        self._thread = threading.Thread(target=self._run, name="TradingEngine", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+        if self.executor is not None:
+            self.executor.stop(timeout)
+
+    def run_once(self):
+        """
+        1주기 처리 (워커 루프 본체, 리플레이/테스트에서 직접 호출 가능)
+        1) 새로 등록된 trader 초기 봉 로드 (실패하면 LOAD_RETRY_SECONDS 뒤 다시) 2) 모든 심볼 틱 일괄 수집
+        3) 전체 전략 평가
+        """
+        with self._lock:
+            starting, self._pending_start = self._pending_start, []
+            feeds = list(self.feeds.values())
+            traders = list(self.traders)
+        if starting:
+            self._start_traders(starting)
+
+        # MT5 호출은 한 번에 몰아서 (세션 락을 주기당 한 번만 잡음)
+        latency = self.latency
+        cycle_start = time.perf_counter_ns()
+        poll_start = {}
+        with get_session().lock:
+            for feed in feeds:
+                t0 = poll_start[feed.symbol] = time.perf_counter_ns()
+                try:
+                    feed.poll()
+                except Exception:
+                    self.log_fn(f"[엔진] {feed.symbol} 시세 수집 오류\n{traceback.format_exc()}")
+                latency.record(feed.symbol, 'fetch', time.perf_counter_ns() - t0)
+
+        for trader in traders:
+            t0 = time.perf_counter_ns()
+            try:
+                events = trader.evaluate()
+            except Exception:
+                self.log_fn(f"[엔진] {trader.symbol} 처리 오류\n{traceback.format_exc()}")
+                continue
+            t1 = time.perf_counter_ns()
+            latency.record(trader.symbol, 'evaluate', t1 - t0)
+            if self.journal is not None:
+                # 큐에 넣기만 (write/fsync 는 저널 스레드에서 묶어서)
+                for result in events:
+                    self.journal.record(trader.symbol, trader.strategy, result)
+            if self.executor is not None:
+                for result in events:
+                    if result['signal'] in ('long_entry', 'short_entry'):
+                        # 큐에 넣기만 함 (order_send 는 실행 스레드)
+                        result['order'] = self.executor.submit_entry(trader.strategy, result, signal_ns=t1)
+            if self.on_result is not None and events:
+                for result in events:
+                    self.on_result(trader, result)
+                t2 = time.perf_counter_ns()
+                latency.record(trader.symbol, 'dispatch', t2 - t1)
+                latency.record(trader.symbol, 'tick_to_signal', t2 - poll_start.get(trader.symbol, cycle_start))
+        if self.on_quote is not None:
+            for feed in feeds:
+                if feed.bid is not None:
+                    self.on_quote(feed)
+        latency.record('*', 'cycle', time.perf_counter_ns() - cycle_start)
+
+    def _start_traders(self, starting):
+        # 초기 봉을 못 채운 trader 는 다시 대기 목록으로 (MT5 가 다시 연결되면 다음 시도에서 채워짐)
+        retry = []
+        now = time.monotonic()
+        for trader in starting:
+            if now < trader.load_retry_at:
+                retry.append(trader)
+                continue
+            try:
+                loaded = trader.start()
+            except Exception:
+                self.log_fn(f"[엔진] {trader.symbol} 초기 데이터 로드 오류\n{traceback.format_exc()}")
+                loaded = False
+            if not loaded:
+                if trader.load_failures == 0:
+                    self.log_fn(f"[엔진] {trader.symbol} 초기 봉 로드 실패 - {LOAD_RETRY_SECONDS:.0f}초마다 재시도")
+                trader.load_failures += 1
+                trader.load_retry_at = now + LOAD_RETRY_SECONDS
+                retry.append(trader)
+                continue
+            if trader.load_failures:
+                self.log_fn(f"[엔진] {trader.symbol} 초기 봉 로드 성공 (재시도 {trader.load_failures}회)")
+                trader.load_failures = 0
+            if self.executor is not None:
+                try:
+                    self.executor.prepare(trader.symbol, trader.strategy.lot)
+                except Exception:
+                    self.log_fn(f"[엔진] {trader.symbol} 주문 준비 오류\n{traceback.format_exc()}")
+        if retry:
+            with self._lock:
+                # 그 사이 remove 된 trader 는 버림
+                self._pending_start = [t for t in retry if t in self.traders] + self._pending_start
+
+    def _run(self):
+        next_time = time.monotonic()
+        while not self._stop.is_set():
+            self.run_once()
+            # 처리 시간만큼 빼고 대기 (주기 유지)
+            next_time += self.interval
+            delay = next_time - time.monotonic()
+            if delay < 0:
+                next_time = time.monotonic()
+                delay = 0
+            self._stop.wait(delay)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """프로세스 공용 TradingEngine (모든 실시간 매매 창이 공유)"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                # AUTOTRADE_RECORD_TICKS=1 이면 실시간 틱을 저장 (장애 재현용)
+                # AUTOTRADE_JOURNAL=0 이면 거래 저널을 쓰지 않음
+                journal = get_journal() if os.environ.get('AUTOTRADE_JOURNAL', '1') != '0' else None
+                _engine = TradingEngine(record_ticks=os.environ.get('AUTOTRADE_RECORD_TICKS') == '1',
+                                        journal=journal)
+    return _engine
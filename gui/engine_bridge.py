@@ -0,0 +1,63 @@
+import threading
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from engine.trading_engine import get_engine
+from engine.log_pipeline import get_log
+
+
+class EngineBridge(QObject):
+    """
+    워커 스레드(TradingEngine) -> GUI 스레드 전달용.
+    - 전략 결과(result)는 하나도 버리지 않고 Qt 큐 시그널로 전달
+    - 시세(quote)는 심볼별 최신 값만 유지: 아직 UI 가 처리 안 한 알림이 있으면 새로 보내지 않고 값만 덮어씀
+      (UI 가 느려도 시그널이 쌓이지 않음, 시장 데이터 처리는 엔진 쪽에서 그대로 계속)
+    """
+    result = pyqtSignal(object, object)  # (SymbolTrader, 전략 결과 dict)
+    quotes = pyqtSignal(object)          # {symbol: (bid, ask)} 최신 시세 (GUI 스레드에서 발생)
+    _quote_ready = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._quotes = {}
+        self._quote_pending = False
+        self.dropped_quotes = 0
+        self._quote_ready.connect(self._flush_quotes)
+
+    # ---- 워커 스레드에서 호출 ----
+    def publish_result(self, trader, result):
+        self.result.emit(trader, result)
+
+    def publish_quote(self, feed):
+        with self._lock:
+            if self._quote_pending:
+                self.dropped_quotes += 1
+            self._quotes[feed.symbol] = (feed.bid, feed.ask)
+            if self._quote_pending:
+                return
+            self._quote_pending = True
+        self._quote_ready.emit()
+
+    # ---- GUI 스레드 ----
+    def _flush_quotes(self):
+        with self._lock:
+            quotes = dict(self._quotes)
+            self._quote_pending = False
+        self.quotes.emit(quotes)
+
+
+_bridge = None
+
+
+def get_bridge():
+    """공용 엔진(get_engine)에 연결된 공용 브리지. GUI 스레드에서 처음 호출해야 함"""
+    global _bridge
+    if _bridge is None:
+        _bridge = EngineBridge()
+        engine = get_engine()
+        engine.on_result = _bridge.publish_result
+        engine.on_quote = _bridge.publish_quote
+        # 로그는 시그널 대신 LogPipeline 링버퍼로 (콘솔이 프레임마다 묶어서 표시)
+        engine.log_fn = get_log().logger('engine')
+    return _bridge
@@ -0,0 +1,76 @@
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
+    QHeaderView, QFileDialog, QMessageBox
+)
+from PyQt5.QtCore import Qt, QTimer
+
+from engine.latency import get_latency
+
+# (헤더, snapshot 키)
+LATENCY_COLUMNS = [
+    ("심볼", 'symbol'),
+    ("단계", 'stage'),
+    ("횟수", 'count'),
+    ("p50(us)", 'p50_us'),
+    ("p99(us)", 'p99_us'),
+    ("max(us)", 'max_us'),
+]
+
+
+class LatencyPanel(QWidget):
+    """심볼/단계별 지연시간 분위수 표 (refresh_ms 마다 갱신)"""
+    def __init__(self, parent=None, recorder=None, refresh_ms=1000):
+        super().__init__(parent)
+        self.setWindowTitle("지연시간")
+        self.setGeometry(300, 120, 560, 420)
+        self.recorder = recorder or get_latency()
+        self.init_ui()
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(refresh_ms)
+        self.refresh()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        self.table = QTableWidget(0, len(LATENCY_COLUMNS))
+        self.table.setHorizontalHeaderLabels([h for h, _ in LATENCY_COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        btn_layout = QHBoxLayout()
+        self.reset_btn = QPushButton("초기화")
+        self.reset_btn.clicked.connect(self.reset)
+        self.export_btn = QPushButton("내보내기")
+        self.export_btn.clicked.connect(self.export)
+        btn_layout.addStretch()
+        btn_layout.addWidget(self.reset_btn)
+        btn_layout.addWidget(self.export_btn)
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+
+    def refresh(self):
+        rows = sorted(self.recorder.snapshot(), key=lambda r: (r['symbol'], r['stage']))
+        self.table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            for j, (_, key) in enumerate(LATENCY_COLUMNS):
+                value = row[key]
+                text = f"{value:.1f}" if isinstance(value, float) else str(value)
+                item = QTableWidgetItem(text)
+                if j >= 2:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(i, j, item)
+
+    def reset(self):
+        self.recorder.reset()
+        self.refresh()
+
+    def export(self):
+        path, _ = QFileDialog.getSaveFileName(self, "지연시간 내보내기", "latency.csv", "CSV (*.csv);;JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.recorder.export(path)
+        except OSError as e:
+            QMessageBox.warning(self, "내보내기 오류", str(e))
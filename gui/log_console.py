@@ -0,0 +1,44 @@
+from PyQt5.QtWidgets import QPlainTextEdit
+from PyQt5.QtCore import QTimer
+
+from engine.log_pipeline import get_log
+
+
+class LogConsole(QPlainTextEdit):
+    """
+    LogPipeline 을 보여주는 콘솔.
+    - 줄마다 append 하지 않고 fps 주기로 새 기록을 모아 appendPlainText 1번 (레이아웃도 1번)
+    - max_lines 를 넘는 앞쪽 줄은 Qt 가 자동으로 지움 (setMaximumBlockCount)
+    - sources 를 주면 해당 source 기록만 표시 (None 이면 전체)
+    """
+    def __init__(self, parent=None, pipeline=None, sources=None, max_lines=2000, fps=20):
+        super().__init__(parent)
+        self.pipeline = pipeline or get_log()
+        self.sources = set(sources) if sources is not None else None
+        self.max_lines = max_lines
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(max_lines)
+        # 창을 연 이후 기록부터 표시
+        self._seq = self.pipeline.seq
+        self._timer = QTimer(self)
+        self._timer.setInterval(int(1000 / fps))
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    def flush(self):
+        self._seq, records, missed = self.pipeline.since(self._seq)
+        if self.sources is not None:
+            records = [r for r in records if r.source in self.sources]
+        if not records and not missed:
+            return
+        lines = [r.text for r in records[-self.max_lines:]]
+        skipped = len(records) - len(lines)
+        if self.sources is None:
+            skipped += missed
+        if skipped:
+            lines.insert(0, f"... 로그 {skipped}줄 생략")
+        if missed and self.sources is not None:
+            # missed 는 모든 source 기준 개수라 이 창에서 빠진 줄 수가 아님
+            lines.insert(0, "... 로그 버퍼가 넘쳐 일부 기록 생략")
+        self.appendPlainText("\n".join(lines))
+
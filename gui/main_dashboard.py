@@ -1,10 +1,13 @@
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QHBoxLayout, QVBoxLayout, QTableWidget, QHeaderView,
-    QTableWidgetItem, QTextEdit, QPushButton, QMenu, QSizePolicy, QComboBox
+    QTableWidgetItem, QPushButton, QMenu, QSizePolicy, QComboBox
 )
 from PyQt5.QtGui import QColor, QIcon, QPainter, QPixmap, QBrush, QFont
 from PyQt5.QtCore import Qt, pyqtSignal
 
+from engine.log_pipeline import get_log
+from gui.log_console import LogConsole
+
 # 동그라미 연결상태 아이콘
 class CircleLabel(QLabel):
     def __init__(self, color=QColor("yellow"), parent=None):
@@ -30,6 +33,7 @@ class MainDashboard(QWidget):
         self.setGeometry(200, 50, 500, 300)
         self.init_ui()
         self.realtime_windows = []  # 여러 실시간 매매 창 관리용
+        self.latency_panel = None
 
     def init_ui(self):
         main_layout = QVBoxLayout()
@@ -98,13 +102,12 @@ class MainDashboard(QWidget):
         self.account_table.setSpan(0, 1, 1, 3)
         self.account_table.setEditTriggers(QTableWidget.NoEditTriggers)
 
-        # 콘솔 로그 영역
-        self.console = QTextEdit()
+        # 콘솔 로그 영역 (모든 스레드의 로그를 프레임 단위로 묶어서 표시)
+        self.console = LogConsole()
         self.console.setPlaceholderText("로그가 여기에 표시됩니다.")
-        self.console.setReadOnly(True)
         self.console.setFixedHeight(330)
         self.console.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 font-family: Consolas,monospace;
                 margin: 0px;
                 padding: 0px;
@@ -126,6 +129,10 @@ class MainDashboard(QWidget):
             self.status_circle.setColor(QColor("yellow"))
             self.status_label.setText("MT5 연결대기")
 
+    def set_connecting(self):
+        self.status_circle.setColor(QColor("yellow"))
+        self.status_label.setText("MT5 연결중...")
+
     def set_account_info(self, account_info):
         if not account_info:
             accNo, balan, curren = "-", "-", "-"
@@ -143,6 +150,7 @@ class MainDashboard(QWidget):
     def show_menu(self):
         menu = QMenu()
         realtime_action = menu.addAction("실시간 매매")
+        latency_action = menu.addAction("지연시간")
         action = menu.exec_(self.menu_btn.mapToGlobal(self.menu_btn.rect().bottomLeft()))
         if action == realtime_action:
             # 실시간 매매 창 여러 개 생성
@@ -150,6 +158,12 @@ class MainDashboard(QWidget):
             win = RealtimeTradeWindow(account_info=None)
             win.show()
             self.realtime_windows.append(win)
+        elif action == latency_action:
+            from gui.latency_panel import LatencyPanel
+            if self.latency_panel is None:
+                self.latency_panel = LatencyPanel()
+            self.latency_panel.show()
+            self.latency_panel.raise_()
 
     def append_log(self, text):
-        self.console.append(text)
+        get_log().info(text, source='main')
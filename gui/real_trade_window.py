@@ -1,15 +1,24 @@
 from PyQt5.QtWidgets import (
-    QWidget, QLabel, QHBoxLayout, QVBoxLayout, QPushButton, QComboBox, QTextEdit,
-    QTableWidget, QTableWidgetItem, QLineEdit, QMessageBox
+    QWidget, QLabel, QHBoxLayout, QVBoxLayout, QPushButton, QComboBox,
+    QTableView, QHeaderView, QLineEdit, QMessageBox
 )
 from PyQt5.QtGui import QFont
-from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import Qt
 
-import pandas as pd
+import time
 
-from strategy.real_Ichimoku_Strategy import IchimokuBreakoutStrategyRT
+from strategy.base import create_strategy, strategy_names
+from engine.trading_engine import SymbolTrader, get_engine
+from gui.engine_bridge import get_bridge
+from gui.trade_blotter import TradeTableModel
+from engine.trade_store import exit_row, describe_result
+from engine.log_pipeline import get_log
+from engine.latency import get_latency
+from gui.log_console import LogConsole
 
 class RealtimeTradeWindow(QWidget):
+    _count = 0
+
     def __init__(self, parent=None, account_info=None):
         super().__init__(parent)
         self.setWindowTitle("실시간 자동매매")
@@ -17,7 +26,16 @@ class RealtimeTradeWindow(QWidget):
         self.account_info = account_info
         self.running = False
         self.strategy = None
-        self.df_history = None  # 반드시 실거래 시세 데이터만!
+        # 시세/봉/전략 판단은 공용 엔진 워커 스레드에서, 이 창은 등록한 trader 의 결과만 표시
+        self.trader = None
+        self.engine = get_engine()
+        self.bridge = get_bridge()
+        self.bridge.result.connect(self.on_engine_result)
+        self.bridge.quotes.connect(self.on_quotes)
+        # 창마다 source 를 따로 두고, 콘솔에는 이 창 로그 + 엔진 로그만 표시
+        RealtimeTradeWindow._count += 1
+        self.log_source = f"trade{RealtimeTradeWindow._count}"
+        self.log = get_log().logger(self.log_source)
         self.init_ui()
 
     def init_ui(self):
@@ -38,7 +56,7 @@ class RealtimeTradeWindow(QWidget):
         strat_layout = QHBoxLayout()
         strat_layout.addWidget(QLabel("전략:"))
         self.strategy_cb = QComboBox()
-        self.strategy_cb.addItems(["Ichimoku Breakout"])
+        self.strategy_cb.addItems(strategy_names())
         strat_layout.addWidget(self.strategy_cb)
 
         strat_layout.addWidget(QLabel("랏:"))
@@ -73,29 +91,34 @@ class RealtimeTradeWindow(QWidget):
         self.start_btn.clicked.connect(self.start_trading)
         self.stop_btn.clicked.connect(self.stop_trading)
 
-        # 7→8로 변경, "판단근거" 열 추가
-        self.trade_table = QTableWidget(0, 8)
-        self.trade_table.setHorizontalHeaderLabels([
-            "진입시각", "청산시각", "포지션", "진입가", "청산가", "수익", "랏", "판단근거"
-        ])
+        # 거래 테이블: 컬럼 저장소 + 모델 (보이는 행만 그림)
+        # 진입시각, 청산시각, 포지션, 진입가, 청산가, 수익, 랏, 판단근거
+        self.trade_model = TradeTableModel(parent=self)
+        self.trade_table = QTableView()
+        self.trade_table.setModel(self.trade_model)
+        # 정렬은 헤더를 눌렀을 때만 (setSortingEnabled 는 바로 0번 컬럼으로 정렬해서 이후 추가마다 정렬 삽입)
+        header = self.trade_table.horizontalHeader()
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        header.sortIndicatorChanged.connect(self.trade_model.sort)
+        self.trade_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.trade_table.verticalHeader().setDefaultSectionSize(22)
         self.trade_table.setFixedHeight(180)
         layout.addWidget(self.trade_table)
 
-        self.console = QTextEdit()
+        self.console = LogConsole(sources=(self.log_source, 'engine'))
         self.console.setPlaceholderText("실시간 로그")
-        self.console.setReadOnly(True)
         self.console.setFixedHeight(200)
         layout.addWidget(self.console)
 
         self.setLayout(layout)
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.on_tick)
 
     def start_trading(self):
         try:
             lot = float(self.lot_input.text())
             symbol = self.symbol_cb.currentText()
-            self.strategy = IchimokuBreakoutStrategyRT(lot=lot, symbol=symbol)
+            self.strategy = create_strategy(self.strategy_cb.currentText(), lot=lot, symbol=symbol)
             self.symbol = symbol
         except Exception:
             QMessageBox.warning(self, "입력오류", "랏은 0.01 단위로 입력하세요!")
@@ -105,79 +128,69 @@ class RealtimeTradeWindow(QWidget):
         self.status_label.setText("연결상태: 실시간 거래 중")
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
-        self.console.append(f"[실시간] 자동매매 시작! (심볼: {self.symbol}, 랏: {lot})")
-        # self.df_history = ...  # <--- 여기서 반드시 실거래소 캔들/틱 데이터 준비 (초기 100개 등)
-        # 실전에서는 실시간 시세 데이터 수신 루프 등에서 갱신
-
-        self.timer.start(2000)
+        self.log(f"[실시간] 자동매매 시작! (전략: {self.strategy.name}, 심볼: {self.symbol}, 랏: {lot})")
+        self.restore_from_journal()
+        # 데이터 수집/전략 판단은 공용 엔진에서, 결과만 시그널로 받음
+        self.trader = SymbolTrader(self.strategy, self.symbol)
+        self.engine.add(self.trader)
+        self.engine.start()
+
+    def restore_from_journal(self):
+        # 이전 실행(비정상 종료 포함)의 거래 목록과 열린 포지션을 저널에서 복원
+        journal = self.engine.journal
+        if journal is None:
+            return
+        try:
+            journal.flush()
+            t0 = time.perf_counter()
+            state = journal.recover()
+            self.trade_model.set_store(state.trades(self.strategy, self.symbol))
+            restored = state.restore(self.strategy, self.symbol)
+            elapsed = (time.perf_counter() - t0) * 1000
+        except Exception as e:
+            self.log(f"[복구] 저널 읽기 실패: {e}")
+            return
+        self.log(f"[복구] 저널 {len(state)}건 -> 거래 {self.trade_model.store.count}건 ({elapsed:.1f} ms)")
+        if restored:
+            side = '롱' if self.strategy.position == 1 else '숏'
+            self.log(f"[복구] 열린 포지션: {side} 진입가 {self.strategy.entry_price} ({self.strategy.entry_time})")
 
     def stop_trading(self):
         self.running = False
         self.status_label.setText("연결상태: 대기")
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
-        self.console.append("[실시간] 자동매매 중지!")
-        self.timer.stop()
-
-    def on_tick(self):
-        if not self.running or self.strategy is None:
-            return
-
-        # 반드시 self.df_history와 current_price는 실거래소 최신 데이터여야 함!
-        # 예시: self.df_history = 최신 100개 1분봉 DataFrame
-        #       current_price = 현재 호가
-
-        if self.df_history is None:
-            return  # 아직 데이터 없음
+        self.log("[실시간] 자동매매 중지!")
+        if self.trader is not None:
+            self.engine.remove(self.trader)
+            self.trader = None
+
+    def on_engine_result(self, trader, result):
+        if trader is self.trader:
+            t0 = time.perf_counter_ns()
+            self.process_strategy_result(result)
+            get_latency().record(trader.symbol, 'ui', time.perf_counter_ns() - t0)
 
-        # 실전에서는 이 부분에서 실시간 데이터로 self.df_history, current_price를 갱신
-        current_price = float(self.df_history['close'].iloc[-1])  # 또는 실시간 호가
+    def on_quotes(self, quotes):
+        # 심볼별 최신 시세만 표시 (느린 UI 에서는 중간 값이 생략됨)
+        quote = quotes.get(self.symbol) if self.running else None
+        if quote is not None:
+            bid, ask = quote
+            self.status_label.setText(f"연결상태: 실시간 거래 중 (bid {bid}, ask {ask})")
 
-        result = self.strategy.on_tick(self.df_history, current_price)
-        if result is not None:
-            self.process_strategy_result(result)
+    def closeEvent(self, event):
+        if self.trader is not None:
+            self.engine.remove(self.trader)
+            self.trader = None
+        super().closeEvent(event)
 
     def process_strategy_result(self, result):
-        sig = result['signal']
-        now = result.get('time', pd.Timestamp.now())
-        lot_val = self.lot_input.text()
-        pos = None
-        entry_price, exit_price, profit = None, None, None
-
-        if sig == 'long_entry':
-            pos = 'Long'
-            entry_price = result['price']
-            self.console.append(f"[진입] 롱 진입 {now} 진입가: {entry_price}")
-        elif sig == 'short_entry':
-            pos = 'Short'
-            entry_price = result['price']
-            self.console.append(f"[진입] 숏 진입 {now} 진입가: {entry_price}")
-        elif sig in ['long_exit_tp', 'long_exit_sl']:
-            pos = 'Long'
-            entry_price = result['entry']
-            exit_price = result['exit']
-            profit = round(exit_price - entry_price, 3)
-            self.console.append(f"[청산] 롱 {'익절' if sig.endswith('tp') else '손절'} {now} 청산가: {exit_price}, 수익: {profit}")
-        elif sig in ['short_exit_tp', 'short_exit_sl']:
-            pos = 'Short'
-            entry_price = result['entry']
-            exit_price = result['exit']
-            profit = round(entry_price - exit_price, 3)
-            self.console.append(f"[청산] 숏 {'익절' if sig.endswith('tp') else '손절'} {now} 청산가: {exit_price}, 수익: {profit}")
-
+        # 로그 문구/블로터 행은 리플레이(engine.replay)와 같은 함수로 만듦
+        line = describe_result(result)
+        if line is not None:
+            self.log(line)
         if 'exit' in result:
-            row = self.trade_table.rowCount()
-            self.trade_table.insertRow(row)
-            self.trade_table.setItem(row, 0, QTableWidgetItem(str(self.strategy.entry_time) if self.strategy.entry_time else "-"))
-            self.trade_table.setItem(row, 1, QTableWidgetItem(str(now)))
-            self.trade_table.setItem(row, 2, QTableWidgetItem(pos))
-            self.trade_table.setItem(row, 3, QTableWidgetItem(str(round(entry_price, 3))))
-            self.trade_table.setItem(row, 4, QTableWidgetItem(str(round(exit_price, 3))))
-            self.trade_table.setItem(row, 5, QTableWidgetItem(str(round(profit, 3))))
-            self.trade_table.setItem(row, 6, QTableWidgetItem(lot_val))
-            # 판단근거 열 (result dict에 'reason'이 있으면 표시, 없으면 '-')
-            reason = result.get('reason', "-")
-            self.trade_table.setItem(row, 7, QTableWidgetItem(str(reason)))
+            self.trade_model.queue(exit_row(result, self.strategy.lot))
 
     def append_log(self, text):
-        self.console.append(text)
+        self.log(text)
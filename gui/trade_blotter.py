@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer, QVariant
+
+from engine.trade_store import NAT, RowOrder, TradeStore
+
+# (헤더, TradeStore 컬럼)
+BLOTTER_COLUMNS = [
+    ("진입시각", 'entry_time'),
+    ("청산시각", 'exit_time'),
+    ("포지션", 'position'),
+    ("진입가", 'entry_price'),
+    ("청산가", 'exit_price'),
+    ("수익", 'profit'),
+    ("랏", 'lot'),
+    ("판단근거", 'reason'),
+]
+
+
+def _format(name, value):
+    if name in ('entry_time', 'exit_time'):
+        return "-" if value == NAT else str(pd.Timestamp(int(value), tz='UTC'))
+    if name == 'position':
+        return 'Long' if value == 1 else 'Short'
+    if name in ('entry_price', 'exit_price', 'profit'):
+        return str(round(float(value), 3))
+    if name == 'lot':
+        return str(float(value))
+    return str(value)
+
+
+class TradeTableModel(QAbstractTableModel):
+    """
+    TradeStore 위의 거래 테이블 모델.
+    - 셀 문자열은 data() 에서 화면에 보이는 행만 그때그때 생성 (QTableWidgetItem 할당 없음)
+    - queue() 로 쌓인 거래는 flush_ms 마다 한 번에 beginInsertRows 로 추가
+    - 정렬/필터는 행 번호 순서(RowOrder)만 바꿈 (데이터 복사 없음). 정렬 중 추가는 새 행 키만 읽어 끼워 넣음
+    - 정렬은 sort() 를 부를 때만 (헤더 클릭). 판단근거 컬럼은 정렬하지 않음 (문자열은 보이는 행만 생성)
+    """
+    def __init__(self, store=None, parent=None, flush_ms=100):
+        super().__init__(parent)
+        self.store = store or TradeStore()
+        self._order = None   # None 이면 저장 순서 그대로, 아니면 RowOrder
+        self._sort = None    # (컬럼 이름, Qt.SortOrder)
+        self._filter = None  # predicate(columns dict) -> bool 배열
+        self._pending = []
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(flush_ms)
+        self._timer.timeout.connect(self.flush)
+
+    # ---- Qt 모델 인터페이스 ----
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.store.count if self._order is None else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(BLOTTER_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return BLOTTER_COLUMNS[section][0]
+        return QVariant()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return QVariant()
+        row = index.row() if self._order is None else self._order.at(index.row())
+        name = BLOTTER_COLUMNS[index.column()][1]
+        return _format(name, self.store.value(row, name))
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """column < 0 이면 정렬 해제 (저장 순서). 판단근거 컬럼은 무시"""
+        if column >= 0 and BLOTTER_COLUMNS[column][1] == 'reason':
+            return
+        self.layoutAboutToBeChanged.emit()
+        self._sort = (BLOTTER_COLUMNS[column][1], order) if column >= 0 else None
+        self._rebuild_order()
+        self.layoutChanged.emit()
+
+    # ---- 추가 ----
+    def queue(self, row):
+        """exit_row 형식 dict 1건 예약. 실제 추가는 타이머에서 묶어서"""
+        self._pending.append(row)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        rows, self._pending = self._pending, []
+        if rows:
+            self.append(rows)
+
+    def append(self, rows):
+        if self._order is None:
+            first = self.store.count
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self.store.append(rows)
+            self.endInsertRows()
+            return
+        # 정렬/필터 중이면 새 행만 판정해서 행 번호 순서에 끼워 넣음
+        self.layoutAboutToBeChanged.emit()
+        first = self.store.append(rows)
+        new_rows = np.arange(first, self.store.count)
+        if self._filter is not None:
+            cols = {name: arr[first:] for name, arr in self.store.columns().items()}
+            new_rows = new_rows[np.asarray(self._filter(cols), dtype=bool)]
+        self._order.add(new_rows)
+        self.layoutChanged.emit()
+
+    def set_store(self, store):
+        """저장소 교체 (저널에서 복구한 거래 목록 등). 예약된 행은 버림"""
+        self.beginResetModel()
+        self._pending = []
+        self.store = store
+        self._rebuild_order()
+        self.endResetModel()
+
+    # ---- 정렬/필터 ----
+    def set_filter(self, predicate=None):
+        """predicate(columns) -> bool 배열. columns 는 TradeStore 컬럼 뷰 dict. None 이면 해제"""
+        self.beginResetModel()
+        self._filter = predicate
+        self._rebuild_order()
+        self.endResetModel()
+
+    def _sort_key(self, rows):
+        # store 를 교체해도 현재 store 를 읽도록 매번 self.store 에서
+        return self.store.column(self._sort[0])[rows]
+
+    def _rebuild_order(self):
+        if self._filter is None and self._sort is None:
+            self._order = None
+            return
+        rows = np.arange(self.store.count)
+        if self._filter is not None:
+            rows = rows[np.asarray(self._filter(self.store.columns()), dtype=bool)]
+        if self._sort is None:
+            order = RowOrder(capacity=max(1024, len(rows)))
+        else:
+            order = RowOrder(self._sort_key, self._sort[1] == Qt.DescendingOrder, capacity=max(1024, len(rows)))
+        order.reset(rows)
+        self._order = order
@@ -1,39 +1,130 @@
+import time
+_T0 = time.perf_counter()  # 시작 시간 측정 기준 (import 보다 먼저)
+
 import sys
+import threading
+
+from engine.startup import StartupProfile
+profile = StartupProfile(_T0)
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
 from PyQt5.QtWidgets import QApplication, QStackedWidget
+profile.mark("PyQt5 import")
+
+# pandas / MetaTrader5 / 엔진 / 전략은 여기서 import 하지 않음 (첫 화면 이후 백그라운드에서)
 from gui.main_dashboard import MainDashboard
+from dataMT5.session import get_session
+from engine.log_pipeline import get_log
+profile.mark("앱 모듈 import")
+
+# 첫 화면 이후 미리 import 해 둘 모듈 (실시간 매매 창을 열 때 기다리지 않도록)
+PREWARM_MODULES = (
+    'engine.trading_engine',
+    'strategy.base',
+    'strategy.real_Ichimoku_Strategy',
+    'engine.trade_store',
+    'engine.latency',
+)
 
-import MetaTrader5 as mt5
 
 def get_mt5_account_info(log_fn):
     log_fn("MT5 연결 시도...")
-    if not mt5.initialize():
-        log_fn(f"MT5 연결 실패! {mt5.last_error()}")
+    session = get_session()
+    if not session.ensure_connected(wait=True):
+        log_fn(f"MT5 연결 실패! {session.last_error}")
         return None, False
-    info = mt5.account_info()
+    info = session.call('account_info')
     if info is None:
-        log_fn("계좌 정보 없음! MT5 종료")
-        mt5.shutdown()
+        log_fn("계좌 정보 없음!")
         return None, False
     log_fn("MT5 연결 및 로그인 성공")
     log_fn(f"계좌번호: {info.login}, 잔고: {info.balance} {info.currency}")
-    mt5.shutdown()
+    # 연결은 유지 (앱 종료 시 session.shutdown)
     return info, True
 
+
+class StartupLoader(QObject):
+    """MT5 연결/계좌 조회 + 무거운 모듈 import 를 백그라운드 스레드에서. 결과는 시그널로 GUI 스레드에"""
+    account_loaded = pyqtSignal(object, bool)  # (계좌 정보, 연결 여부)
+    finished = pyqtSignal()
+
+    def __init__(self, log_fn):
+        super().__init__()
+        self.log_fn = log_fn
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="StartupLoader", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            with profile.stage("MT5 연결/계좌 조회"):
+                account_info, connected = get_mt5_account_info(self.log_fn)
+        except Exception as e:
+            self.log_fn(f"MT5 연결 오류! {e}")
+            account_info, connected = None, False
+        self.account_loaded.emit(account_info, connected)
+        try:
+            with profile.stage("모듈 미리 import"):
+                for name in PREWARM_MODULES:
+                    __import__(name)
+        except Exception as e:
+            # 여기서 실패해도 창을 열 때 다시 import 하면서 오류가 드러남
+            self.log_fn(f"[시작] 모듈 미리 import 실패: {e}")
+        self.finished.emit()
+
+
+def stop_engine():
+    # 엔진은 실시간 매매 창을 열 때 만들어짐. 모듈이 아직 import 안 됐으면 멈출 것도 없음
+    trading_engine = sys.modules.get('engine.trading_engine')
+    if trading_engine is not None:
+        trading_engine.get_engine().stop()
+    # 엔진이 멈춘 뒤 남은 저널 레코드를 디스크에 (fsync) 내리고 닫음
+    trade_journal = sys.modules.get('engine.trade_journal')
+    if trade_journal is not None:
+        trade_journal.get_journal().close()
+
+
+def log_startup(log):
+    for line in profile.lines():
+        log(f"[시작] {line}")
+    log(f"[시작] 준비 완료 {profile.elapsed_ms():.0f} ms")
+
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(stop_engine)
+    app.aboutToQuit.connect(get_session().shutdown)
+    app.aboutToQuit.connect(get_log().close)
+    get_session().log_fn = get_log().logger('session')
+    startup_log = get_log().logger('main')
     stack = QStackedWidget()
+    profile.mark("QApplication 생성")
 
     # === 1. 메인 대시보드 위젯 생성 ===
     main_dashboard = MainDashboard()
     stack.addWidget(main_dashboard)   # index 0: 메인
+    profile.mark("대시보드 생성")
 
-    # === 2. MT5 계좌 연결 및 정보 표시 ===
-    account_info, connected = get_mt5_account_info(main_dashboard.append_log)
-    main_dashboard.set_connection_status(connected)
-    main_dashboard.set_account_info(account_info)
-
-    # === 3. QStackedWidget 기본 세팅 및 실행 ===
+    # === 2. 화면 먼저 표시 ===
     stack.setCurrentIndex(0)      # 첫 화면: 메인 대시보드
     stack.resize(650, 700)
     stack.show()
+    profile.mark("창 표시")
+
+    # === 3. MT5 계좌 연결 및 정보 표시 (백그라운드, 이벤트 루프가 돈 뒤 시작) ===
+    main_dashboard.set_connecting()
+    loader = StartupLoader(main_dashboard.append_log)
+
+    def on_account_loaded(account_info, connected):
+        main_dashboard.set_connection_status(connected)
+        main_dashboard.set_account_info(account_info)
+    loader.account_loaded.connect(on_account_loaded)
+    loader.finished.connect(lambda: log_startup(startup_log))
+
+    def first_frame():
+        profile.mark("첫 이벤트 루프")
+        loader.start()
+    QTimer.singleShot(0, first_frame)
     sys.exit(app.exec_())
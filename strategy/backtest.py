@@ -0,0 +1,215 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from strategy.real_Ichimoku_Strategy import IchimokuBreakoutStrategyRT
+from strategy.entry_conditions import NO_DATA, condition_masks, signals_from_masks
+
+# trades: 청산까지 끝난 거래 목록, equity: 봉별 누적 실현손익, open_trade: 백테스트 종료 시점 미청산 거래(없으면 None)
+BacktestResult = namedtuple('BacktestResult', ['trades', 'equity', 'open_trade'])
+
+TRADE_COLUMNS = [
+    'entry_idx', 'exit_idx', 'entry_time', 'exit_time', 'position',
+    'entry_price', 'exit_price', 'exit_type', 'profit'
+]
+
+
+def entry_masks(df, pip, warmup=52 + 26):
+    """
+    calculate_ichimoku 결과 전체 구간의 진입 조건 비트마스크 (uint16, entry_conditions 참고).
+    df 는 DataFrame 또는 같은 컬럼명을 가진 numpy 배열 dict
+    pip 은 스칼라, 2차원 배열이면 심볼별 (심볼 수, 1) 배열도 가능
+    """
+    conv = np.asarray(df['conversion'], dtype=float)
+    base = np.asarray(df['base'], dtype=float)
+    close = np.asarray(df['close'], dtype=float)
+
+    # 마지막 축이 시간축 (1차원 단일 심볼, 2차원 심볼 x 봉 모두 가능)
+    conv_prev = np.empty_like(conv)
+    base_prev = np.empty_like(base)
+    conv_prev[..., 0] = base_prev[..., 0] = np.nan
+    conv_prev[..., 1:] = conv[..., :-1]
+    base_prev[..., 1:] = base[..., :-1]
+
+    mask = condition_masks(
+        conv, base, conv_prev, base_prev,
+        np.asarray(df['kumo_high'], dtype=float), np.asarray(df['kumo_low'], dtype=float),
+        np.asarray(df['high26'], dtype=float), np.asarray(df['low26'], dtype=float),
+        close, pip
+    )
+    # check_entry_signal 처럼 데이터 부족 구간은 NO_DATA 만
+    mask[..., :warmup] = NO_DATA
+    return mask
+
+
+def entry_signals(df, pip, warmup=52 + 26):
+    """
+    calculate_ichimoku 결과 전체 구간에 대해 check_entry_signal 과 같은 진입 신호를 한 번에 계산.
+    반환값: 봉별 1(롱) / -1(숏) / 0 int8 배열
+    """
+    return signals_from_masks(entry_masks(df, pip, warmup))
+
+
+def first_exit(close, entries, upper, lower, block=256, max_cells=1 << 22):
+    """
+    각 진입봉 entries[m] 이후 처음으로 close >= upper[m] 또는 close <= lower[m] 가 되는 봉 인덱스.
+    (n_entries x block) 창을 한 번에 비교하고, 못 찾은 진입만 창을 2배로 늘려 다시 탐색. 없으면 -1
+    """
+    n = len(close)
+    result = np.full(len(entries), -1, dtype=np.int64)
+    pending = np.arange(len(entries))
+    offset = 1
+    while pending.size and offset < n:
+        width = min(block, n - offset)
+        steps = np.arange(width)
+        # 행렬 크기를 max_cells 이하로 유지
+        rows = max(1, max_cells // width)
+        still = []
+        for s in range(0, pending.size, rows):
+            part = pending[s:s + rows]
+            k = entries[part]
+            idx = k[:, None] + offset + steps[None, :]
+            inside = idx < n
+            w = close[np.minimum(idx, n - 1)]
+            hit = ((w >= upper[part, None]) | (w <= lower[part, None])) & inside
+            found = hit.any(axis=1)
+            first = hit.argmax(axis=1)
+            result[part[found]] = idx[found, first[found]]
+            # 아직 못 찾았고 데이터가 남아 있는 것만 다음 라운드로
+            still.append(part[~found & (k + offset + width < n)])
+        pending = np.concatenate(still)
+        offset += width
+        block *= 2
+    return result
+
+
+def simulate_trades(close, signal, tp_pips, sl_pips):
+    """
+    진입 신호 배열과 종가로 거래를 확정. 봉 단위 on_tick 과 같은 규칙:
+    보유 중에는 신호 무시, 진입봉 다음 봉부터 종가로 TP -> SL 순 확인, 청산봉에서는 재진입 없음.
+    반환값: (거래별 배열 dict, 미청산 진입 정보 dict 또는 None)
+    """
+    cand = np.flatnonzero(signal)
+    side = signal[cand].astype(np.int64)
+    entry_price = close[cand]
+    # on_tick 과 같은 순서/연산으로 TP, SL 가격 계산
+    tp = np.where(side == 1, entry_price + tp_pips, entry_price - tp_pips)
+    sl = np.where(side == 1, entry_price - sl_pips, entry_price + sl_pips)
+    upper = np.where(side == 1, tp, sl)
+    lower = np.where(side == 1, sl, tp)
+    exit_idx = first_exit(close, cand, upper, lower)
+
+    # 포지션 보유 중에는 신호 무시: 청산봉 다음 신호부터 다시 진입
+    nxt = np.searchsorted(cand, exit_idx, side='right')
+    taken = []
+    m = 0
+    while m < cand.size:
+        taken.append(m)
+        if exit_idx[m] < 0:
+            break
+        m = nxt[m]
+    taken = np.asarray(taken, dtype=np.int64)
+
+    open_trade = None
+    if taken.size and exit_idx[taken[-1]] < 0:
+        last = taken[-1]
+        open_trade = {
+            'entry_idx': int(cand[last]),
+            'position': int(side[last]),
+            'entry_price': float(entry_price[last]),
+        }
+        taken = taken[:-1]
+
+    t_side = side[taken]
+    t_entry = entry_price[taken]
+    x_idx = exit_idx[taken]
+    x_close = close[x_idx]
+    is_tp = np.where(t_side == 1, x_close >= tp[taken], x_close <= tp[taken])
+    x_price = np.where(is_tp, tp[taken], sl[taken])
+    trades = {
+        'entry_idx': cand[taken],
+        'exit_idx': x_idx,
+        'position': t_side,
+        'entry_price': t_entry,
+        'exit_price': x_price,
+        'is_tp': is_tp,
+        'profit': np.where(t_side == 1, x_price - t_entry, t_entry - x_price),
+    }
+    return trades, open_trade
+
+
+def run_backtest(df, strategy=None, **params):
+    """
+    df: get_mt5_ohlcv 형식의 전체 기간 OHLCV
+    strategy: IchimokuBreakoutStrategyRT (없으면 params 로 생성)
+    on_tick(df[:k+1], close[k]) 을 봉마다 돌린 결과와 같은 거래를 벡터 연산으로 계산
+    """
+    if strategy is None:
+        strategy = IchimokuBreakoutStrategyRT(**params)
+    ich = strategy.calculate_ichimoku(df)
+    close = ich['close'].to_numpy(dtype=float)
+    signal = entry_signals(ich, strategy.pip, strategy.warmup)
+    t, open_trade = simulate_trades(close, signal, strategy.tp_pips, strategy.sl_pips)
+    if open_trade is not None:
+        open_trade['entry_time'] = df['time'].iat[open_trade['entry_idx']]
+
+    trades = pd.DataFrame({
+        'entry_idx': t['entry_idx'],
+        'exit_idx': t['exit_idx'],
+        'entry_time': df['time'].iloc[t['entry_idx']].reset_index(drop=True),
+        'exit_time': df['time'].iloc[t['exit_idx']].reset_index(drop=True),
+        'position': t['position'],
+        'entry_price': t['entry_price'],
+        'exit_price': t['exit_price'],
+        'exit_type': np.where(t['is_tp'], 'tp', 'sl'),
+        'profit': t['profit'],
+    }, columns=TRADE_COLUMNS)
+
+    pnl = np.zeros(len(df))
+    np.add.at(pnl, t['exit_idx'], t['profit'])
+    equity = pd.Series(np.cumsum(pnl), index=pd.DatetimeIndex(df['time']), name='equity')
+    return BacktestResult(trades, equity, open_trade)
+
+
+def replay_on_tick(df, strategy=None, **params):
+    """검증용: on_tick 을 봉마다 직접 호출 (현재가 = 해당 봉 종가). 결과는 run_backtest 와 같은 형식"""
+    if strategy is None:
+        strategy = IchimokuBreakoutStrategyRT(**params)
+    close = df['close'].to_numpy(dtype=float)
+    rows = []
+    entry_idx = None
+    for k in range(len(df)):
+        result = strategy.on_tick(df.iloc[:k + 1], close[k])
+        if result is None:
+            continue
+        sig = result['signal']
+        if sig.endswith('_entry'):
+            entry_idx = k
+        else:
+            position = 1 if sig.startswith('long') else -1
+            entry, exit_price = result['entry'], result['exit']
+            rows.append({
+                'entry_idx': entry_idx,
+                'exit_idx': k,
+                'entry_time': df['time'].iat[entry_idx],
+                'exit_time': df['time'].iat[k],
+                'position': position,
+                'entry_price': entry,
+                'exit_price': exit_price,
+                'exit_type': sig[-2:],
+                'profit': exit_price - entry if position == 1 else entry - exit_price,
+            })
+    trades = pd.DataFrame(rows, columns=TRADE_COLUMNS)
+    pnl = np.zeros(len(df))
+    np.add.at(pnl, trades['exit_idx'].to_numpy(dtype=np.int64), trades['profit'].to_numpy(dtype=float))
+    equity = pd.Series(np.cumsum(pnl), index=pd.DatetimeIndex(df['time']), name='equity')
+    open_trade = None
+    if strategy.position != 0:
+        open_trade = {
+            'entry_idx': entry_idx,
+            'position': strategy.position,
+            'entry_price': strategy.entry_price,
+            'entry_time': strategy.entry_time,
+        }
+    return BacktestResult(trades, equity, open_trade)
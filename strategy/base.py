@@ -0,0 +1,224 @@
+# base.py
+"""
+실시간 전략 공통 인터페이스 + 등록표.
+
+    class MyStrategy(RealtimeStrategy):
+        name = "My Strategy"
+        def indicators(self):                 # 필요한 지표 노드 선언 (strategy.indicators)
+            return {'upper': rolling_max(HIGH, 20)}
+        def evaluate_entry(self, df, k=-1):   # df 의 k 번째 봉 기준 (1 / -1 / 0, mask)
+            self.graph.bind(df)
+            ...
+    register_strategy(MyStrategy)              # 실시간 매매 창 전략 목록에 추가
+
+- 지표는 self.graph (IndicatorGraph) 에서 읽음. SymbolFeed 에 붙으면 같은 (심볼, 타임프레임)
+  전략들과 공유하는 그래프로 바뀜 -> 같은 지표는 한 번만 계산
+- 진입 후 TP/SL 청산(on_quote / check_exit) 과 결과 dict 형식은 공통.
+  TP/SL 가격은 진입할 때 한 번 계산해 두고 틱마다 비교 2번만 (DataFrame 접근 없음)
+- 진입 판단은 봉 상태별로 캐시: SymbolTrader 가 넘기는 봉 상태(BarSeries.state)가 같으면
+  evaluate_entry 를 다시 부르지 않음. entry_on_close=True 면 직전 확정봉 기준으로 봉마다 1번만 판단
+  (봉 중간 틱에는 캐시된 판단 + 청산 판단만)
+- 등록표는 (모듈, 클래스 이름) 으로 두고 실제 import 는 전략을 만들 때 (시작 시간)
+"""
+import importlib
+
+from strategy.indicators import IndicatorGraph
+from dataMT5.bar_ring import bar_time
+from dataMT5.resampler import TIMEFRAME_SECONDS
+
+
+class RealtimeStrategy:
+    name = None
+    bar_seconds = TIMEFRAME_SECONDS['M5']  # 판단 봉 길이 (SymbolTrader 가 이 타임프레임을 구독)
+
+    def __init__(self, pip=0.01, tp_pips=0.18, sl_pips=0.15, lot=0.01, symbol=None, entry_on_close=False):
+        """entry_on_close: True 면 진입 판단을 직전 확정봉 기준으로 봉마다 1번 (False 면 진행 중 봉 기준, 봉 상태가 바뀔 때마다)"""
+        self.pip = pip
+        self.tp_pips = tp_pips
+        self.sl_pips = sl_pips
+        self.lot = lot
+        self.symbol = symbol
+        self.position = 0
+        self.entry_price = None
+        self.entry_time = None
+        self.tp_price = None   # 진입할 때 계산해 둔 TP/SL 가격
+        self.sl_price = None
+        self.entry_on_close = entry_on_close
+        self._entry_key = None     # 마지막으로 진입 판단한 봉 상태
+        self._entry_cached = (0, 0)
+        self.last_mask = 0  # 마지막 진입 판단의 조건 비트마스크
+        self.latency = None  # engine.latency.LatencyRecorder (SymbolTrader 가 연결, None 이면 계측 안 함)
+        self.graph = IndicatorGraph()  # SymbolFeed 가 공용 그래프로 교체
+
+    # ---- 하위 클래스에서 구현 ----
+    @property
+    def warmup(self):
+        """신호 판단에 필요한 최소 봉 인덱스"""
+        return 0
+
+    def indicators(self):
+        """사용하는 지표 노드 dict (이름 -> 노드)"""
+        return {}
+
+    def evaluate_entry(self, df, k=-1):
+        """
+        df 의 k 번째 봉(음수 인덱스, -1 진행 중 봉 / -2 직전 확정봉)을 현재봉으로 본 진입 신호와
+        조건 비트마스크: (1 / -1 / 0, mask)
+        """
+        raise NotImplementedError
+
+    def render_reason(self, signal, mask):
+        """판단근거 문자열 (거래를 기록/표시할 때만 호출)"""
+        return ''
+
+    def params(self):
+        """매매 결과에 영향을 주는 설정값 dict (하위 클래스는 자기 기간 등을 더함)"""
+        return {'pip': self.pip, 'tp_pips': self.tp_pips, 'sl_pips': self.sl_pips, 'lot': self.lot,
+                'entry_on_close': self.entry_on_close}
+
+    def journal_key(self):
+        """거래 저널에서 이 전략을 구분하는 문자열 (이름 + 설정값, 재시작해도 같은 값)"""
+        return self.name + '|' + ','.join(f"{k}={v}" for k, v in sorted(self.params().items()))
+
+    # ---- 공통 ----
+    def check_entry_signal(self, df):
+        signal, mask = self.evaluate_entry(df)
+        return signal, self.render_reason(signal, mask)
+
+    def entry_decision(self, df, bar_state=None):
+        """
+        on_tick 의 진입 판단 (봉 상태별 캐시). 봉 상태가 마지막 판단 때와 같으면 evaluate_entry 를 건너뜀
+        bar_state: BarSeries.state (closed_version, version). None 이면 캐시 없이 매번 판단
+        - entry_on_close: 확정봉이 같으면 (= 같은 봉 안이면) 같은 판단
+        - 그 외: 진행 중 봉까지 같으면 같은 판단
+        """
+        k = -2 if self.entry_on_close else -1
+        if bar_state is None:
+            return self.evaluate_entry(df, k)
+        key = bar_state[0] if self.entry_on_close else bar_state
+        if key == self._entry_key:
+            return self._entry_cached
+        decision = self.evaluate_entry(df, k)
+        self._entry_key = key
+        self._entry_cached = decision
+        return decision
+
+    def on_tick(self, df, current_price, bar_state=None, ask=None):
+        """
+        df: 실시간 봉 시계열 (BarWindow 또는 DataFrame, 마지막 행 = 진행 중 봉)
+        current_price: 실시간 틱/호가 (bid)
+        bar_state: df 를 식별하는 값 (BarSeries.state, 진입 판단 캐시 키)
+        ask: 매수 호가. 있으면 롱 진입가 (매수 체결 가격 -> TP/SL, 주문, 저널/블로터가 모두 같은 가격), None 이면 current_price
+        """
+        if self.position == 0:
+            signal, mask = self.entry_decision(df, bar_state)
+            if signal == 0:
+                return None
+            price = ask if signal == 1 and ask is not None else current_price
+            self.open_position(signal, price, bar_time(df))
+            return {
+                'signal': 'long_entry' if signal == 1 else 'short_entry',
+                'price': price,
+                'time': self.entry_time,
+                'symbol': self.symbol,
+                'mask': mask,
+                'reason': self.render_reason(signal, mask)
+            }
+
+        return self.check_exit(current_price, bar_time(df))
+
+    def open_position(self, side, price, time):
+        """포지션 진입 상태로 (TP/SL 가격은 여기서 한 번만 계산)"""
+        self.position = side
+        self.entry_price = price
+        self.entry_time = time
+        if side == 1:
+            self.tp_price = price + self.tp_pips
+            self.sl_price = price - self.sl_pips
+        else:
+            self.tp_price = price - self.tp_pips
+            self.sl_price = price + self.sl_pips
+
+    def on_quote(self, bid, ask, time):
+        """
+        틱(호가) 단위 청산 체크. 롱은 bid, 숏은 ask 로 판단. 포지션 없으면 아무것도 안 함
+        """
+        if self.position == 1:
+            return self.check_exit(bid, time)
+        if self.position == -1:
+            return self.check_exit(ask, time)
+        return None
+
+    def check_exit(self, current_price, time):
+        """보유 포지션의 TP/SL 도달 여부 확인 (미리 계산한 가격과 비교만, DataFrame 접근 없음)"""
+        if self.position == 1:
+            if current_price >= self.tp_price:
+                return self._exit('long_exit_tp', self.tp_price, time)
+            elif current_price <= self.sl_price:
+                return self._exit('long_exit_sl', self.sl_price, time)
+            return None
+
+        if self.position == -1:
+            if current_price <= self.tp_price:
+                return self._exit('short_exit_tp', self.tp_price, time)
+            elif current_price >= self.sl_price:
+                return self._exit('short_exit_sl', self.sl_price, time)
+            return None
+
+    def _exit(self, signal, price, time):
+        result = {
+            'signal': signal,
+            'entry': self.entry_price,
+            'exit': price,
+            'time': time,
+            'entry_time': self.entry_time,
+            'symbol': self.symbol,
+            'reason': exit_reason(signal, self.entry_price, price)
+        }
+        self.position = 0
+        self.entry_price = None
+        self.entry_time = None
+        self.tp_price = None
+        self.sl_price = None
+        return result
+
+
+# 청산 신호 -> 판단근거 문구 (engine.trade_journal 이 복구할 때도 같은 문구로)
+EXIT_REASONS = {
+    'long_exit_tp': '롱 익절(TP 도달) / 진입가: {entry}, 목표가: {price}',
+    'long_exit_sl': '롱 손절(SL 도달) / 진입가: {entry}, 손절가: {price}',
+    'short_exit_tp': '숏 익절(TP 도달) / 진입가: {entry}, 목표가: {price}',
+    'short_exit_sl': '숏 손절(SL 도달) / 진입가: {entry}, 손절가: {price}',
+}
+
+
+def exit_reason(signal, entry, price):
+    return EXIT_REASONS[signal].format(entry=entry, price=price)
+
+
+# 전략 이름 -> (모듈, 클래스 이름) 또는 클래스
+_registry = {
+    "Ichimoku Breakout": ('strategy.real_Ichimoku_Strategy', 'IchimokuBreakoutStrategyRT'),
+    "Donchian Breakout": ('strategy.donchian_strategy', 'DonchianBreakoutStrategyRT'),
+}
+
+
+def register_strategy(cls, name=None):
+    """전략 클래스 등록 (name 이 없으면 cls.name). 데코레이터로도 사용 가능"""
+    _registry[name or cls.name] = cls
+    return cls
+
+
+def strategy_names():
+    return list(_registry)
+
+
+def strategy_class(name):
+    entry = _registry[name]
+    if isinstance(entry, tuple):
+        entry = _registry[name] = getattr(importlib.import_module(entry[0]), entry[1])
+    return entry
+
+
+def create_strategy(name, **kwargs):
+    return strategy_class(name)(**kwargs)
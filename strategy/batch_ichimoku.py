@@ -0,0 +1,150 @@
+"""
+여러 심볼을 한 번에 계산하는 이치모쿠 커널 (심볼 x 봉 2차원 배열).
+
+    high, low, close, lengths = stack_ohlc([df_gbpjpy, df_usdjpy, df_xauusd])
+    signal = batch_entry_signal(high, low, close, pip=[0.01, 0.01, 0.1], lengths=lengths)
+    # signal[k] : k번째 심볼의 check_entry_signal 결과 (1 / -1 / 0)
+
+- batch_ichimoku: calculate_ichimoku 와 같은 컬럼을 전 구간 2차원 배열로 (백테스트/분석용)
+- rolling_mid / ichimoku_columns: 1차원 배열에도 그대로 (파라미터 최적화가 기간별 중간값을 재사용)
+- batch_entry_signal: 마지막 봉 판단에 필요한 위치만 계산 (봉 마감마다 관심종목 전체 스캔용)
+히스토리 길이가 다른 심볼은 앞쪽을 NaN 으로 채워 맞춘다 (NaN 이 섞인 창은 rolling 과 같이 NaN).
+"""
+import numpy as np
+
+from strategy.backtest import entry_signals
+
+
+def stack_ohlc(frames, n=None):
+    """
+    DataFrame 목록 -> (high, low, close, lengths). 최근 n개 봉 기준으로 오른쪽 정렬, 모자란 앞쪽은 NaN
+    """
+    if n is None:
+        n = max(len(df) for df in frames)
+    shape = (len(frames), n)
+    high = np.full(shape, np.nan)
+    low = np.full(shape, np.nan)
+    close = np.full(shape, np.nan)
+    lengths = np.zeros(len(frames), dtype=np.int64)
+    for k, df in enumerate(frames):
+        m = min(len(df), n)
+        if m == 0:
+            continue
+        high[k, n - m:] = df['high'].to_numpy(dtype=float)[-m:]
+        low[k, n - m:] = df['low'].to_numpy(dtype=float)[-m:]
+        close[k, n - m:] = df['close'].to_numpy(dtype=float)[-m:]
+        lengths[k] = m
+    return high, low, close, lengths
+
+
+def rolling_extreme(a, window, op):
+    """
+    마지막 축 기준 rolling max/min (op=np.maximum / np.minimum).
+    van Herk/Gil-Werman 블록 누적 방식이라 창 길이와 무관하게 원소당 O(1). 앞 window-1 개는 NaN
+    """
+    n = a.shape[-1]
+    out = np.full(a.shape, np.nan)
+    if n < window:
+        return out
+    pad = (-n) % window
+    fill = -np.inf if op is np.maximum else np.inf
+    padded = np.concatenate([a, np.full(a.shape[:-1] + (pad,), fill)], axis=-1) if pad else a
+    blocks = padded.reshape(a.shape[:-1] + (-1, window))
+    prefix = op.accumulate(blocks, axis=-1).reshape(padded.shape)
+    suffix = np.flip(op.accumulate(np.flip(blocks, axis=-1), axis=-1), axis=-1).reshape(padded.shape)
+    # 창 [i-window+1, i] = suffix[i-window+1] (블록 앞부분) + prefix[i] (블록 뒷부분)
+    out[..., window - 1:] = op(suffix[..., :n - window + 1], prefix[..., window - 1:n])
+    return out
+
+
+def rolling_mid(high, low, window):
+    """마지막 축 기준 (rolling max + rolling min) / 2 (전환선/기준선/스팬2 원값)"""
+    return (rolling_extreme(high, window, np.maximum) + rolling_extreme(low, window, np.minimum)) / 2
+
+
+def _shift(a, d):
+    out = np.full(a.shape, np.nan)
+    if d < a.shape[-1]:
+        out[..., d:] = a[..., :a.shape[-1] - d]
+    return out
+
+
+def ichimoku_columns(conv, base, span2_mid, high, low, close, displacement=26):
+    """
+    기간별 rolling_mid 결과 -> calculate_ichimoku 와 같은 컬럼 dict.
+    중간값을 기간별로 캐시해 두고 조합마다 컬럼만 다시 만드는 쪽(strategy.optimizer)과 공용
+    """
+    span1 = _shift((conv + base) / 2, displacement)
+    span2 = _shift(span2_mid, displacement)
+    return {
+        'conversion': conv,
+        'base': base,
+        'leading_span1': span1,
+        'leading_span2': span2,
+        'kumo_high': np.fmax(span1, span2),
+        'kumo_low': np.fmin(span1, span2),
+        'high26': _shift(high, displacement),
+        'low26': _shift(low, displacement),
+        'close': close,
+    }
+
+
+def batch_ichimoku(high, low, close, conversion_period=9, base_period=26, span2_period=52, displacement=26):
+    """calculate_ichimoku 와 같은 컬럼 dict (각 값은 high 와 같은 모양의 배열)"""
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    return ichimoku_columns(rolling_mid(high, low, conversion_period), rolling_mid(high, low, base_period),
+                            rolling_mid(high, low, span2_period), high, low, np.asarray(close, dtype=float),
+                            displacement)
+
+
+def _mid_at(high, low, window, pos):
+    """위치 pos 에서 끝나는 window 길이 창의 (max+min)/2, 심볼별 벡터"""
+    start = pos - window + 1
+    if start < 0:
+        return np.full(high.shape[0], np.nan)
+    return (high[:, start:pos + 1].max(axis=1) + low[:, start:pos + 1].min(axis=1)) / 2
+
+
+def batch_entry_signal(high, low, close, pip, lengths=None, conversion_period=9, base_period=26,
+                       span2_period=52, displacement=26):
+    """
+    심볼별 마지막 봉의 진입 신호 (check_entry_signal 과 같은 의미). 반환값: (심볼 수,) int8 배열
+    pip: 스칼라 또는 심볼별 배열, lengths: 심볼별 실제 봉 개수 (None 이면 모두 전체 길이)
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    n_sym, n = high.shape
+    i = n - 1
+    d = displacement
+
+    # 마지막 두 봉(i-1, i)의 전환/기준선, i-d 위치의 선행스팬 원값만 계산
+    conv = np.stack([_mid_at(high, low, conversion_period, i - 1), _mid_at(high, low, conversion_period, i)], axis=1)
+    base = np.stack([_mid_at(high, low, base_period, i - 1), _mid_at(high, low, base_period, i)], axis=1)
+    nan2 = np.full((n_sym, 2), np.nan)
+    if i - d >= 0:
+        span1 = (_mid_at(high, low, conversion_period, i - d) + _mid_at(high, low, base_period, i - d)) / 2
+        span2 = _mid_at(high, low, span2_period, i - d)
+        high26, low26 = high[:, i - d], low[:, i - d]
+    else:
+        span1 = span2 = high26 = low26 = nan2[:, 0]
+    cols = {
+        'conversion': conv,
+        'base': base,
+        'kumo_high': np.column_stack([nan2[:, 0], np.fmax(span1, span2)]),
+        'kumo_low': np.column_stack([nan2[:, 0], np.fmin(span1, span2)]),
+        'high26': np.column_stack([nan2[:, 0], high26]),
+        'low26': np.column_stack([nan2[:, 0], low26]),
+        'close': close[:, -2:],
+    }
+    pip = np.asarray(pip, dtype=float)
+    if pip.ndim == 1:
+        pip = pip[:, None]
+    signal = entry_signals(cols, pip, warmup=0)[:, -1]
+
+    # 데이터 부족 (check_entry_signal 의 i < 52 + 26)
+    if lengths is None:
+        lengths = np.full(n_sym, n)
+    signal[np.asarray(lengths) - 1 < span2_period + displacement] = 0
+    return signal
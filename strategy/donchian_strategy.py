@@ -0,0 +1,75 @@
+# donchian_strategy.py
+"""
+돈치안 채널 돌파 (실시간). 현재가가 직전 확정봉까지의 period 봉 최고가를 넘으면 롱, 최저가를 깨면 숏.
+채널은 지표 그래프의 rolling_max(high) / rolling_min(low) 를 그대로 써서
+같은 기간의 이치모쿠 선(기준선 26 등)과 계산을 공유함.
+"""
+import time
+
+from strategy.base import RealtimeStrategy
+from strategy.indicators import CLOSE, HIGH, LOW, rolling_max, rolling_min
+
+# 조건 비트
+BREAK_UP = 1 << 0     # close > 직전 채널 상단
+BREAK_DOWN = 1 << 1   # close < 직전 채널 하단
+NO_DATA = 1 << 15     # 데이터 부족
+
+
+class DonchianBreakoutStrategyRT(RealtimeStrategy):
+    name = "Donchian Breakout"
+
+    def __init__(self, pip=0.01, tp_pips=0.18, sl_pips=0.15, lot=0.01, symbol=None, period=26, margin_pips=0.0,
+                 entry_on_close=False):
+        """margin_pips: 채널을 이 만큼(pip) 넘어야 돌파로 봄"""
+        super().__init__(pip=pip, tp_pips=tp_pips, sl_pips=sl_pips, lot=lot, symbol=symbol,
+                         entry_on_close=entry_on_close)
+        self.period = period
+        self.margin_pips = margin_pips
+        self.upper = rolling_max(HIGH, period)
+        self.lower = rolling_min(LOW, period)
+
+    @property
+    def warmup(self):
+        return self.period
+
+    def indicators(self):
+        return {'upper': self.upper, 'lower': self.lower, 'close': CLOSE}
+
+    def params(self):
+        return dict(super().params(), period=self.period, margin_pips=self.margin_pips)
+
+    def evaluate_entry(self, df, k=-1):
+        if len(df) + k < self.warmup:
+            self.last_mask = NO_DATA
+            return 0, NO_DATA
+        t0 = time.perf_counter_ns()
+        graph = self.graph
+        graph.bind(df)
+        upper = graph.value(self.upper, k - 1)
+        lower = graph.value(self.lower, k - 1)
+        close = graph.value(CLOSE, k)
+        t1 = time.perf_counter_ns()
+        margin = self.margin_pips * self.pip
+        mask = 0
+        if close > upper + margin:
+            mask |= BREAK_UP
+        if close < lower - margin:
+            mask |= BREAK_DOWN
+        self.last_mask = mask
+        if self.latency is not None:
+            self.latency.record(self.symbol, 'ichimoku', t1 - t0)
+            self.latency.record(self.symbol, 'signal', time.perf_counter_ns() - t1)
+        if mask & BREAK_UP:
+            return 1, mask
+        if mask & BREAK_DOWN:
+            return -1, mask
+        return 0, mask
+
+    def render_reason(self, signal, mask):
+        if mask & NO_DATA:
+            return "데이터 부족"
+        if signal == 1:
+            return f"롱 진입: close>{self.period}봉 최고가 돌파"
+        if signal == -1:
+            return f"숏 진입: close<{self.period}봉 최저가 돌파"
+        return "진입 조건 불충족"
@@ -0,0 +1,137 @@
+"""
+이치모쿠 돌파 진입 조건 비트마스크.
+
+조건마다 비트 1개. 진입 판단은 정수 마스크 비교 한 번으로 끝내고,
+판단근거 문자열은 실제로 거래를 기록/표시할 때만 render_reason 으로 만든다.
+마스크(uint16)는 봉마다 저장해 두고 나중에 분석용으로 그대로 쓸 수 있음.
+"""
+import numpy as np
+
+BULL_CROSS = 1 << 0          # conversion>base 골든크로스
+CONV_ABOVE_KUMO = 1 << 1     # conversion>kumo_high
+BASE_ABOVE_KUMO = 1 << 2     # base>kumo_high
+CLOSE_ABOVE_HIGH26 = 1 << 3  # close>high26
+CLOSE_ABOVE_CONV = 1 << 4    # close>conversion
+CONV_RISING = 1 << 5         # conversion 상승
+VALID = 1 << 6               # 유효데이터 (롱/숏 공통)
+BEAR_CROSS = 1 << 7          # conversion<base 데드크로스
+CONV_BELOW_KUMO = 1 << 8     # conversion<kumo_low
+BASE_BELOW_KUMO = 1 << 9     # base<kumo_low
+CLOSE_BELOW_LOW26 = 1 << 10  # close<low26
+CLOSE_BELOW_CONV = 1 << 11   # close<conversion
+CONV_FALLING = 1 << 12       # conversion 하락
+NO_DATA = 1 << 15            # 데이터 부족 (다른 비트는 계산 안 함)
+
+LONG_ALL = (BULL_CROSS | CONV_ABOVE_KUMO | BASE_ABOVE_KUMO | CLOSE_ABOVE_HIGH26
+            | CLOSE_ABOVE_CONV | CONV_RISING | VALID)
+SHORT_ALL = (BEAR_CROSS | CONV_BELOW_KUMO | BASE_BELOW_KUMO | CLOSE_BELOW_LOW26
+             | CLOSE_BELOW_CONV | CONV_FALLING | VALID)
+
+# 판단근거 문구 (기존 check_entry_signal 과 같은 순서/문구)
+LONG_LABELS = [
+    (BULL_CROSS, "conversion>base 골든크로스"),
+    (CONV_ABOVE_KUMO, "conversion>kumo_high"),
+    (BASE_ABOVE_KUMO, "base>kumo_high"),
+    (CLOSE_ABOVE_HIGH26, "close>high26"),
+    (CLOSE_ABOVE_CONV, "close>conversion"),
+    (CONV_RISING, "conversion 상승"),
+    (VALID, "유효데이터"),
+]
+SHORT_LABELS = [
+    (BEAR_CROSS, "conversion<base 데드크로스"),
+    (CONV_BELOW_KUMO, "conversion<kumo_low"),
+    (BASE_BELOW_KUMO, "base<kumo_low"),
+    (CLOSE_BELOW_LOW26, "close<low26"),
+    (CLOSE_BELOW_CONV, "close<conversion"),
+    (CONV_FALLING, "conversion 하락"),
+    (VALID, "유효데이터"),
+]
+
+
+def signal_from_mask(mask):
+    if mask & LONG_ALL == LONG_ALL:
+        return 1
+    if mask & SHORT_ALL == SHORT_ALL:
+        return -1
+    return 0
+
+
+def render_reason(signal, mask):
+    """비트마스크 -> 기존 형식의 판단근거 문자열"""
+    if mask & NO_DATA:
+        return "데이터 부족"
+    long_reason = " / ".join(text for bit, text in LONG_LABELS if mask & bit)
+    short_reason = " / ".join(text for bit, text in SHORT_LABELS if mask & bit)
+    if signal == 1:
+        return long_reason
+    if signal == -1:
+        return short_reason
+    return "조건 불충족: " + long_reason + " // " + short_reason
+
+
+def condition_mask(conversion, base, conversion_prev, base_prev, kumo_high, kumo_low,
+                   high26, low26, close, pip):
+    """스칼라 값 -> 조건 비트마스크 (조건마다 비교 1번)"""
+    mask = 0
+    if conversion > base and conversion_prev <= base_prev:
+        mask |= BULL_CROSS
+    if conversion < base and conversion_prev >= base_prev:
+        mask |= BEAR_CROSS
+    if conversion > kumo_high:
+        mask |= CONV_ABOVE_KUMO
+    if conversion < kumo_low:
+        mask |= CONV_BELOW_KUMO
+    if base > kumo_high:
+        mask |= BASE_ABOVE_KUMO
+    if base < kumo_low:
+        mask |= BASE_BELOW_KUMO
+    if close > high26:
+        mask |= CLOSE_ABOVE_HIGH26
+    if close < low26:
+        mask |= CLOSE_BELOW_LOW26
+    if close > conversion:
+        mask |= CLOSE_ABOVE_CONV
+    if close < conversion:
+        mask |= CLOSE_BELOW_CONV
+    if (conversion - conversion_prev) >= 4 * pip:
+        mask |= CONV_RISING
+    if (conversion_prev - conversion) >= 4 * pip:
+        mask |= CONV_FALLING
+    # NaN 은 자기 자신과 같지 않음
+    if (conversion == conversion and base == base and kumo_high == kumo_high
+            and kumo_low == kumo_low and high26 == high26 and low26 == low26):
+        mask |= VALID
+    return mask
+
+
+def condition_masks(conv, base, conv_prev, base_prev, kumo_high, kumo_low, high26, low26, close, pip):
+    """condition_mask 의 배열 버전 (모양 그대로, uint16)"""
+    with np.errstate(invalid='ignore'):
+        conds = [
+            (BULL_CROSS, (conv > base) & (conv_prev <= base_prev)),
+            (BEAR_CROSS, (conv < base) & (conv_prev >= base_prev)),
+            (CONV_ABOVE_KUMO, conv > kumo_high),
+            (CONV_BELOW_KUMO, conv < kumo_low),
+            (BASE_ABOVE_KUMO, base > kumo_high),
+            (BASE_BELOW_KUMO, base < kumo_low),
+            (CLOSE_ABOVE_HIGH26, close > high26),
+            (CLOSE_BELOW_LOW26, close < low26),
+            (CLOSE_ABOVE_CONV, close > conv),
+            (CLOSE_BELOW_CONV, close < conv),
+            (CONV_RISING, (conv - conv_prev) >= 4 * pip),
+            (CONV_FALLING, (conv_prev - conv) >= 4 * pip),
+            (VALID, ~(np.isnan(conv) | np.isnan(base) | np.isnan(kumo_high) | np.isnan(kumo_low)
+                      | np.isnan(high26) | np.isnan(low26))),
+        ]
+    mask = np.zeros(np.broadcast(conv, close).shape, dtype=np.uint16)
+    for bit, cond in conds:
+        mask[cond] |= np.uint16(bit)
+    return mask
+
+
+def signals_from_masks(mask):
+    """condition_masks 결과 -> 1 / -1 / 0 int8 배열 (롱 우선)"""
+    signal = np.zeros(mask.shape, dtype=np.int8)
+    signal[(mask & SHORT_ALL) == SHORT_ALL] = -1
+    signal[(mask & LONG_ALL) == LONG_ALL] = 1
+    return signal
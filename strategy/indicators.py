@@ -0,0 +1,316 @@
+# indicators.py
+"""
+지표 의존 그래프 + 봉 단위 메모이즈 캐시.
+
+    ICH = ichimoku(9, 26, 52, 26)            # 필드 이름 -> 노드 (노드 = 해시 가능한 tuple)
+    graph = IndicatorGraph()
+    graph.bind(df)                           # BarWindow 또는 get_mt5_ohlcv 형식 DataFrame (마지막 행 = 진행 중 봉)
+    graph.value(ICH['conversion'])           # 진행 중 봉의 값
+    graph.value(ICH['conversion'], -2)       # 직전 확정봉의 값
+
+- 노드는 정의가 같으면 같은 값(tuple)이라 전략이 따로 만들어도 같은 계산으로 합쳐짐
+  (예: 이치모쿠 기준선과 돈치안 26 채널은 rolling_max(high, 26) 를 공유)
+- 전체 시계열을 만들지 않고 전략이 읽는 봉의 값만 계산
+- rolling max/min 은 노드마다 단조 덱 스트림 (RollingExtrema): 새 확정봉 1개당 amortized O(1),
+  진행 중 봉은 덱 앞쪽만 보고 마지막 행 값과 비교. 봉 시각으로 이어 붙이므로 bind 로 df 가 바뀌어도 유지
+  (이어지지 않으면 - 처음 / 이력 교체 / 오래된 봉 요청 - 그 봉의 창만 다시 채움, O(window) 1번)
+- 캐시: 확정봉 값은 봉 이력 객체가 바뀔 때까지 (새 봉 = 새 BarWindow / DataFrame), 진행 중 봉 값은
+  마지막 행 (high/low/close) 이 바뀔 때까지. rolling 확정봉 값은 스트림에 봉 시각별로 최근 RESULT_KEEP 개
+- 같은 (심볼, 타임프레임) 전략들은 SymbolFeed 가 연결한 그래프 1개를 공유
+  -> 변형 전략 10개여도 주기당 지표 계산은 1번
+- 확정봉(마지막 행 제외)은 바뀌지 않는다고 가정 (BarSeries 는 마지막 행만 갱신, 이력을 통째로 바꿀 때는 reset())
+"""
+from collections import deque, namedtuple
+
+import numpy as np
+
+from dataMT5.bar_ring import bar_times, column, last_value
+
+NaN = float('nan')
+RESULT_KEEP = 1024  # rolling 노드마다 보관하는 확정봉 값 개수 (shift 로 과거 봉을 읽을 때 재계산 없이)
+_ROW_FIELDS = {'high': 0, 'low': 1, 'close': 2}  # bind 때 읽는 마지막 행 값 순서
+
+
+# ---- 노드 ----
+
+def col(name):
+    """DataFrame 컬럼 (high / low / close / open)"""
+    return ('col', name)
+
+
+def _check_col(src):
+    if src[0] != 'col':
+        raise ValueError(f"rolling 은 컬럼 노드만 지원: {src!r}")
+
+
+HIGH = col('high')
+LOW = col('low')
+CLOSE = col('close')
+
+
+def rolling_max(src, window):
+    """rolling(window).max() - src 는 컬럼 노드만"""
+    _check_col(src)
+    return ('max', src, window)
+
+
+def rolling_min(src, window):
+    _check_col(src)
+    return ('min', src, window)
+
+
+def mid(a, b):
+    """(a + b) / 2"""
+    return ('mid', a, b)
+
+
+def shift(src, d):
+    """src.shift(d) (d 봉 전 값)"""
+    return ('shift', src, d) if d else src
+
+
+def nanmax(a, b):
+    """np.fmax (한쪽이 NaN 이면 다른 쪽)"""
+    return ('fmax', a, b)
+
+
+def nanmin(a, b):
+    return ('fmin', a, b)
+
+
+def channel_mid(window):
+    """최근 window 봉 (최고가 + 최저가) / 2 - 전환선/기준선/선행스팬2 원값"""
+    return mid(rolling_max(HIGH, window), rolling_min(LOW, window))
+
+
+# calculate_ichimoku 의 한 행과 같은 컬럼 구성
+IchimokuRow = namedtuple('IchimokuRow', [
+    'conversion', 'base', 'leading_span1', 'leading_span2',
+    'kumo_high', 'kumo_low', 'high26', 'low26', 'close'
+])
+
+
+def ichimoku(conversion_period=9, base_period=26, span2_period=52, displacement=26):
+    """calculate_ichimoku 컬럼과 같은 값을 내는 노드 dict (IchimokuRow 필드 순서)"""
+    conversion = channel_mid(conversion_period)
+    base = channel_mid(base_period)
+    span1 = shift(mid(conversion, base), displacement)
+    span2 = shift(channel_mid(span2_period), displacement)
+    return {
+        'conversion': conversion,
+        'base': base,
+        'leading_span1': span1,
+        'leading_span2': span2,
+        'kumo_high': nanmax(span1, span2),
+        'kumo_low': nanmin(span1, span2),
+        'high26': shift(HIGH, displacement),
+        'low26': shift(LOW, displacement),
+        'close': CLOSE,
+    }
+
+
+def _nanmax(a, b):
+    if a != a:
+        return b
+    if b != b:
+        return a
+    return a if a >= b else b
+
+
+def _nanmin(a, b):
+    if a != a:
+        return b
+    if b != b:
+        return a
+    return a if a <= b else b
+
+
+# ---- rolling 스트림 ----
+
+class RollingExtrema:
+    """
+    rolling max/min 1개의 확정봉 스트림 (단조 덱). push 1번 amortized O(1).
+    덱 원소는 (봉 시각, 값): max 는 값 내림차순, min 은 오름차순 -> 창 값은 덱 맨 앞
+    """
+    __slots__ = ('is_max', 'first_time', 'last_time', 'results', '_deque', '_order')
+
+    def __init__(self, is_max):
+        self.is_max = is_max
+        self.first_time = None  # reset 후 처음 넣은 봉 시각 (창이 이 뒤에서 시작해야 값이 완전함)
+        self.last_time = None   # 마지막으로 넣은 확정봉 시각
+        self.results = {}      # 봉 시각 -> 그 봉까지 창 값 (창이 찬 봉만)
+        self._deque = deque()
+        self._order = deque()  # results 키 (오래된 것부터 버림)
+
+    def reset(self):
+        self._deque.clear()
+        self.first_time = None
+        self.last_time = None
+
+    def push(self, t, v, start_time, full):
+        """봉 (t, v) 추가. start_time: 이 봉 기준 창의 첫 봉 시각, full: 창 길이가 찼으면 결과 기록"""
+        if self.first_time is None:
+            self.first_time = t
+        dq = self._deque
+        if self.is_max:
+            while dq and dq[-1][1] <= v:
+                dq.pop()
+        else:
+            while dq and dq[-1][1] >= v:
+                dq.pop()
+        dq.append((t, v))
+        while dq[0][0] < start_time:
+            dq.popleft()
+        self.last_time = t
+        if full and start_time >= self.first_time:
+            self.results[t] = dq[0][1]
+            self._order.append(t)
+            if len(self._order) > RESULT_KEEP:
+                self.results.pop(self._order.popleft(), None)
+
+    def front(self, start_time):
+        """창 [start_time, 마지막으로 넣은 봉] 값 (창 밖 앞쪽 원소만 건너뜀, 상태 변경 없음). 없으면 None"""
+        for t, v in self._deque:
+            if t >= start_time:
+                return v
+        return None
+
+
+# ---- 그래프 ----
+
+class IndicatorGraph:
+    def __init__(self):
+        self._frame = None
+        self._n = 0
+        self._arrays = {}   # 컬럼 -> numpy 배열 (확정봉 부분만 읽음)
+        self._times = None  # 봉 시각 (epoch 초)
+        self._closed = {}   # (노드, 봉 인덱스) -> 값 (확정봉)
+        self._last = {}     # 노드 -> 진행 중 봉 값
+        self._last_row = None
+        self._streams = {}  # rolling 노드 -> RollingExtrema (bind 가 바뀌어도 유지)
+        self.hits = 0
+        self.misses = 0
+
+    def reset(self):
+        """봉 이력을 통째로 바꿨을 때 (확정봉 값이 달라질 수 있음) 스트림/캐시 비움"""
+        self._frame = None
+        self._n = 0
+        self._arrays = {}
+        self._times = None
+        self._closed = {}
+        self._last = {}
+        self._last_row = None
+        self._streams = {}
+
+    def bind(self, df):
+        """
+        이후 value() 가 df (BarWindow / DataFrame) 기준으로 계산되도록 연결. 봉 개수 반환.
+        df 가 바뀌면 확정봉 캐시를, 마지막 행이 바뀌면 진행 중 봉 캐시를 비움
+        """
+        if df is not self._frame or len(df) != self._n:
+            self._frame = df
+            self._n = len(df)
+            self._arrays = {}
+            self._times = None
+            self._closed = {}
+            self._last_row = None
+        row = (float(last_value(df, 'high')), float(last_value(df, 'low')), float(last_value(df, 'close')))
+        if row != self._last_row:
+            self._last_row = row
+            self._last = {}
+        return self._n
+
+    def value(self, node, k=-1):
+        """k: -1 진행 중 봉, -2 직전 확정봉 ... (bind 한 DataFrame 의 음수 인덱스)"""
+        return self._at(node, self._n + k)
+
+    def row(self, nodes, k=-1):
+        """필드 이름 -> 노드 dict (예: ichimoku()) 를 IchimokuRow 로"""
+        return IchimokuRow(*[self._at(nodes[name], self._n + k) for name in IchimokuRow._fields])
+
+    def _array(self, name):
+        arr = self._arrays.get(name)
+        if arr is None:
+            arr = self._arrays[name] = np.asarray(column(self._frame, name), dtype=float)
+        return arr
+
+    def _time_array(self):
+        if self._times is None:
+            self._times = bar_times(self._frame)
+        return self._times
+
+    def _stream(self, node, i):
+        """node 스트림을 확정봉 i 까지 진행 (이어지지 않으면 i 의 창 첫 봉부터 다시 채움)"""
+        stream = self._streams.get(node)
+        if stream is None:
+            stream = self._streams[node] = RollingExtrema(node[0] == 'max')
+        window = node[2]
+        times = self._time_array()
+        arr = self._array(node[1][1])
+        j = -1
+        last_time = stream.last_time
+        if last_time is not None and last_time <= times[i]:
+            j = int(np.searchsorted(times, last_time))
+            if j >= len(times) or times[j] != last_time:
+                j = -1
+        if j < 0:
+            stream.reset()
+            j = max(-1, i - window)
+        for p in range(j + 1, i + 1):
+            s = p - window + 1
+            stream.push(times[p], float(arr[p]), times[s if s > 0 else 0], s >= 0)
+        return stream
+
+    def _at(self, node, i):
+        if i < 0:
+            return NaN
+        last = i == self._n - 1
+        cache = self._last if last else self._closed
+        key = node if last else (node, i)
+        v = cache.get(key)
+        if v is not None:
+            self.hits += 1
+            return v
+        self.misses += 1
+        v = cache[key] = self._compute(node, i, last)
+        return v
+
+    def _compute(self, node, i, last):
+        kind = node[0]
+        if kind == 'col':
+            if not last:
+                return float(self._array(node[1])[i])
+            pos = _ROW_FIELDS.get(node[1])
+            return self._last_row[pos] if pos is not None else float(last_value(self._frame, node[1]))
+        if kind == 'max' or kind == 'min':
+            src, window = node[1], node[2]
+            start = i - window + 1
+            if start < 0:
+                return NaN
+            if not last:
+                t = self._time_array()[i]
+                stream = self._streams.get(node)
+                v = stream.results.get(t) if stream is not None else None
+                if v is None:
+                    v = self._stream(node, i).results[t]
+                return v
+            # 진행 중 봉: 확정봉 window-1 개 (스트림 덱 앞쪽, 봉마다 1번) + 마지막 행 값
+            tail_key = ('tail', node)
+            tail = self._closed.get(tail_key)
+            if tail is None:
+                if start == i:
+                    tail = -np.inf if kind == 'max' else np.inf
+                else:
+                    tail = self._stream(node, i - 1).front(self._time_array()[start])
+                self._closed[tail_key] = tail
+            v = self._at(src, i)
+            return (v if v > tail else tail) if kind == 'max' else (v if v < tail else tail)
+        if kind == 'mid':
+            return (self._at(node[1], i) + self._at(node[2], i)) / 2
+        if kind == 'shift':
+            return self._at(node[1], i - node[2])
+        if kind == 'fmax':
+            return _nanmax(self._at(node[1], i), self._at(node[2], i))
+        if kind == 'fmin':
+            return _nanmin(self._at(node[1], i), self._at(node[2], i))
+        raise ValueError(f"알 수 없는 지표 노드: {node!r}")
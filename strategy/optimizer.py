@@ -0,0 +1,214 @@
+"""
+이치모쿠 돌파 전략 파라미터 최적화 (그리드 / 랜덤 서치)
+
+    python -m strategy.optimizer --csv gbpjpy_m5.csv --trials 1000 --out result.csv
+    python -m strategy.optimizer --symbol GBPJPY --bars 75000 --grid
+
+OHLC 배열은 공유 메모리에 한 번만 올리고, 워커 프로세스는 이름으로 붙어서 복사 없이 읽는다.
+기간(window)별 rolling 중간값도 부모에서 한 번만 계산해 같이 올림 (작업을 잘게 나눠도 워커마다 다시 계산하지 않음).
+작업 = (전환, 기준, 스팬2, pip) 이 같은 조합 묶음 (진입 신호 1번 계산). 큰 묶음은 워커 수에 맞춰 다시 나눔.
+"""
+import argparse
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from strategy.backtest import entry_signals, simulate_trades
+from strategy.batch_ichimoku import ichimoku_columns, rolling_mid
+
+# 기본 탐색 공간
+DEFAULT_SPACE = {
+    'pip': [0.005, 0.01, 0.02],
+    'tp_pips': [0.10, 0.15, 0.18, 0.25, 0.35],
+    'sl_pips': [0.10, 0.15, 0.20, 0.30],
+    'conversion_period': [7, 9, 12],
+    'base_period': [22, 26, 30],
+    'span2_period': [44, 52, 60],
+}
+WINDOW_KEYS = ('conversion_period', 'base_period', 'span2_period')
+DISPLACEMENT = 26
+TASKS_PER_WORKER = 4  # 워커당 작업 수 (묶음 크기가 고르지 않아도 끝날 때 한 워커만 남지 않게)
+
+RESULT_COLUMNS = [
+    'rank', 'total_profit', 'trades', 'win_rate', 'profit_factor', 'max_drawdown',
+    'pip', 'tp_pips', 'sl_pips', 'conversion_period', 'base_period', 'span2_period'
+]
+
+
+class SharedOHLC:
+    """high/low/close 배열 + 기간별 rolling 중간값을 공유 메모리에 올려두는 부모 프로세스 측 핸들"""
+    def __init__(self, df, windows=()):
+        self._blocks = []
+        self.spec = {}
+        arrays = {col: np.ascontiguousarray(df[col].to_numpy(dtype=np.float64)) for col in ('high', 'low', 'close')}
+        for window in sorted(set(windows)):
+            arrays[f'mid{window}'] = rolling_mid(arrays['high'], arrays['low'], window)
+        for name, src in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(src.nbytes, 1))
+            np.ndarray(src.shape, dtype=np.float64, buffer=shm.buf)[:] = src
+            self._blocks.append(shm)
+            self.spec[name] = (shm.name, src.shape[0])
+
+    def close(self):
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---- 워커 프로세스 상태 ----
+_arrays = {}
+_handles = []
+
+
+def _attach(spec):
+    """워커 초기화: 공유 메모리에 붙어서 numpy 뷰 생성 (데이터 복사 없음)"""
+    for col, (name, length) in spec.items():
+        # 정리(unlink)는 부모 SharedOHLC.close() 가 담당, 워커는 붙기만 함
+        shm = shared_memory.SharedMemory(name=name)
+        _handles.append(shm)
+        _arrays[col] = np.ndarray((length,), dtype=np.float64, buffer=shm.buf)
+
+
+def _ichimoku_columns(conversion_period, base_period, span2_period, d=DISPLACEMENT):
+    """calculate_ichimoku 와 같은 컬럼을 numpy 배열 dict 로 구성 (중간값은 공유 메모리에서)"""
+    return ichimoku_columns(_arrays[f'mid{conversion_period}'], _arrays[f'mid{base_period}'],
+                            _arrays[f'mid{span2_period}'], _arrays['high'], _arrays['low'], _arrays['close'], d)
+
+
+def _metrics(profit):
+    n = len(profit)
+    if n == 0:
+        return {'total_profit': 0.0, 'trades': 0, 'win_rate': 0.0, 'profit_factor': 0.0, 'max_drawdown': 0.0}
+    equity = np.cumsum(profit)
+    peak = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:]
+    gain = profit[profit > 0].sum()
+    loss = -profit[profit < 0].sum()
+    return {
+        'total_profit': float(equity[-1]),
+        'trades': n,
+        'win_rate': float((profit > 0).mean()),
+        'profit_factor': float(gain / loss) if loss > 0 else float('inf'),
+        'max_drawdown': float((peak - equity).max()),
+    }
+
+
+def _run_group(windows, pip, combos):
+    """같은 (전환, 기준, 스팬2) 기간과 pip 를 공유하는 조합 묶음을 한 워커에서 처리"""
+    cols = _ichimoku_columns(*windows)
+    signal = entry_signals(cols, pip, windows[2] + DISPLACEMENT)
+    close = cols['close']
+    rows = []
+    for p in combos:
+        trades, _ = simulate_trades(close, signal, p['tp_pips'], p['sl_pips'])
+        row = dict(p)
+        row.update(_metrics(trades['profit']))
+        rows.append(row)
+    return rows
+
+
+def _tasks(params, workers):
+    """
+    (기간, pip) 별 조합 묶음 -> 작업 목록 [(windows, pip, combos)], 큰 작업부터.
+    작업이 워커 수 x TASKS_PER_WORKER 개쯤 되도록 큰 묶음은 나눔 (나눈 조각마다 진입 신호는 다시 계산)
+    """
+    groups = {}
+    for p in params:
+        groups.setdefault((tuple(p[k] for k in WINDOW_KEYS), p['pip']), []).append(p)
+    chunk = max(1, -(-len(params) // (workers * TASKS_PER_WORKER)))
+    tasks = [(windows, pip, combos[s:s + chunk])
+             for (windows, pip), combos in groups.items() for s in range(0, len(combos), chunk)]
+    tasks.sort(key=lambda task: -len(task[2]))
+    return tasks
+
+
+def grid_params(space=None):
+    space = space or DEFAULT_SPACE
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+
+def random_params(n, space=None, seed=None):
+    space = space or DEFAULT_SPACE
+    rng = random.Random(seed)
+    seen = set()
+    total = 1
+    for v in space.values():
+        total *= len(v)
+    out = []
+    while len(out) < min(n, total):
+        combo = tuple((k, rng.choice(v)) for k, v in space.items())
+        if combo not in seen:
+            seen.add(combo)
+            out.append(dict(combo))
+    return out
+
+
+def optimize(df, params, workers=None, sort_by='total_profit'):
+    """
+    df: OHLCV DataFrame (high/low/close)
+    params: 파라미터 dict 목록 (grid_params / random_params)
+    반환값: 순위가 매겨진 결과 DataFrame
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = _tasks(params, workers)
+    windows = {p[k] for p in params for k in WINDOW_KEYS}
+
+    rows = []
+    with SharedOHLC(df, windows) as shared:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(shared.spec,)) as pool:
+            futures = [pool.submit(_run_group, *task) for task in tasks]
+            for fut in as_completed(futures):
+                rows.extend(fut.result())
+
+    result = pd.DataFrame(rows)
+    result = result.sort_values(sort_by, ascending=False, kind='mergesort').reset_index(drop=True)
+    result.insert(0, 'rank', np.arange(1, len(result) + 1))
+    return result[RESULT_COLUMNS]
+
+
+def _load(args):
+    if args.csv:
+        return pd.read_csv(args.csv)
+    from dataMT5.collector import get_mt5_ohlcv
+    return get_mt5_ohlcv(symbol=args.symbol, n=args.bars)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="이치모쿠 돌파 전략 파라미터 최적화")
+    parser.add_argument('--csv', help="high/low/close 컬럼이 있는 OHLCV CSV (없으면 MT5 에서 수집)")
+    parser.add_argument('--symbol', default='GBPJPY')
+    parser.add_argument('--bars', type=int, default=75000, help="MT5 수집 봉 개수 (M5 1년 약 75000)")
+    parser.add_argument('--grid', action='store_true', help="전체 그리드 서치 (기본은 랜덤 서치)")
+    parser.add_argument('--trials', type=int, default=1000, help="랜덤 서치 조합 수")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--sort-by', default='total_profit')
+    parser.add_argument('--out', default='optimize_result.csv')
+    args = parser.parse_args(argv)
+
+    df = _load(args)
+    if df is None:
+        print("데이터 없음")
+        return 1
+    params = grid_params() if args.grid else random_params(args.trials, seed=args.seed)
+    result = optimize(df, params, workers=args.workers, sort_by=args.sort_by)
+    result.to_csv(args.out, index=False)
+    print(result.head(20).to_string(index=False))
+    print(f"{len(result)}개 조합 결과 저장: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
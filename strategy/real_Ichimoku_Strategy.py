@@ -1,176 +1,86 @@
-import pandas as pd
+import time
 
-class IchimokuBreakoutStrategyRT:
-    def __init__(self, pip=0.01, tp_pips=0.18, sl_pips=0.15, lot=0.01, symbol=None):
-        self.pip = pip
-        self.tp_pips = tp_pips
-        self.sl_pips = sl_pips
-        self.lot = lot
-        self.symbol = symbol
-        self.position = 0
-        self.entry_price = None
-        self.entry_time = None
+import numpy as np
 
-    def calculate_ichimoku(self, df):
-        df = df.copy()
-        df['conversion'] = (df['high'].rolling(9).max() + df['low'].rolling(9).min()) / 2
-        df['base'] = (df['high'].rolling(26).max() + df['low'].rolling(26).min()) / 2
-        df['leading_span1'] = ((df['conversion'] + df['base']) / 2).shift(26)
-        df['leading_span2'] = ((df['high'].rolling(52).max() + df['low'].rolling(52).min()) / 2).shift(26)
-        df['kumo_high'] = df[['leading_span1', 'leading_span2']].max(axis=1)
-        df['kumo_low'] = df[['leading_span1', 'leading_span2']].min(axis=1)
-        df['high26'] = df['high'].shift(26)
-        df['low26'] = df['low'].shift(26)
-        return df
+from dataMT5.bar_ring import as_frame
+from strategy.base import RealtimeStrategy
+from strategy.indicators import IchimokuRow, ichimoku
+from strategy.entry_conditions import NO_DATA, condition_mask, signal_from_mask, render_reason
 
-    def check_entry_signal(self, df):
-        df = self.calculate_ichimoku(df)
-        i = len(df) - 1
-        if i < 52 + 26:
-            return 0, "데이터 부족"
-        bull_cross = (df['conversion'].iat[i] > df['base'].iat[i]) and (df['conversion'].iat[i-1] <= df['base'].iat[i-1])
-        bear_cross = (df['conversion'].iat[i] < df['base'].iat[i]) and (df['conversion'].iat[i-1] >= df['base'].iat[i-1])
-        conversion_rising = (df['conversion'].iat[i] - df['conversion'].iat[i-1]) >= 4 * self.pip
-        conversion_falling = (df['conversion'].iat[i-1] - df['conversion'].iat[i]) >= 4 * self.pip
+class IchimokuBreakoutStrategyRT(RealtimeStrategy):
+    name = "Ichimoku Breakout"
 
-        valid = all(pd.notnull([
-            df['conversion'].iat[i], df['base'].iat[i], df['kumo_high'].iat[i], df['kumo_low'].iat[i],
-            df['high26'].iat[i], df['low26'].iat[i]
-        ]))
+    def __init__(self, pip=0.01, tp_pips=0.18, sl_pips=0.15, lot=0.01, symbol=None, incremental=True,
+                 conversion_period=9, base_period=26, span2_period=52, displacement=26, entry_on_close=False):
+        super().__init__(pip=pip, tp_pips=tp_pips, sl_pips=sl_pips, lot=lot, symbol=symbol,
+                         entry_on_close=entry_on_close)
+        # 이치모쿠 기간 (전환선/기준선/선행스팬2, 선행 이동 봉수)
+        self.conversion_period = conversion_period
+        self.base_period = base_period
+        self.span2_period = span2_period
+        self.displacement = displacement
+        # incremental=True 면 매 틱 전체 재계산 대신 지표 그래프에서 필요한 봉 값만 (같은 심볼 전략들과 공유)
+        self.incremental = incremental
+        self.ichimoku = ichimoku(conversion_period, base_period, span2_period, displacement)
 
-        # 각 조건의 참/거짓을 판단근거로 기록
-        long_reason = []
-        short_reason = []
-        if bull_cross: long_reason.append("conversion>base 골든크로스")
-        if df['conversion'].iat[i] > df['kumo_high'].iat[i]: long_reason.append("conversion>kumo_high")
-        if df['base'].iat[i] > df['kumo_high'].iat[i]: long_reason.append("base>kumo_high")
-        if df['close'].iat[i] > df['high26'].iat[i]: long_reason.append("close>high26")
-        if df['close'].iat[i] > df['conversion'].iat[i]: long_reason.append("close>conversion")
-        if conversion_rising: long_reason.append("conversion 상승")
-        if valid: long_reason.append("유효데이터")
+    @property
+    def warmup(self):
+        # 신호 판단에 필요한 최소 봉 인덱스 (기본 52 + 26)
+        return self.span2_period + self.displacement
 
-        if bear_cross: short_reason.append("conversion<base 데드크로스")
-        if df['conversion'].iat[i] < df['kumo_low'].iat[i]: short_reason.append("conversion<kumo_low")
-        if df['base'].iat[i] < df['kumo_low'].iat[i]: short_reason.append("base<kumo_low")
-        if df['close'].iat[i] < df['low26'].iat[i]: short_reason.append("close<low26")
-        if df['close'].iat[i] < df['conversion'].iat[i]: short_reason.append("close<conversion")
-        if conversion_falling: short_reason.append("conversion 하락")
-        if valid: short_reason.append("유효데이터")
+    def indicators(self):
+        return self.ichimoku
 
-        long_cond = (
-            bull_cross and
-            df['conversion'].iat[i] > df['kumo_high'].iat[i] and
-            df['base'].iat[i] > df['kumo_high'].iat[i] and
-            df['close'].iat[i] > df['high26'].iat[i] and
-            df['close'].iat[i] > df['conversion'].iat[i] and
-            conversion_rising and valid
-        )
-        short_cond = (
-            bear_cross and
-            df['conversion'].iat[i] < df['kumo_low'].iat[i] and
-            df['base'].iat[i] < df['kumo_low'].iat[i] and
-            df['close'].iat[i] < df['low26'].iat[i] and
-            df['close'].iat[i] < df['conversion'].iat[i] and
-            conversion_falling and valid
-        )
+    def params(self):
+        return dict(super().params(), conversion_period=self.conversion_period, base_period=self.base_period,
+                    span2_period=self.span2_period, displacement=self.displacement)
 
-        if long_cond:
-            return 1, " / ".join(long_reason)
-        elif short_cond:
-            return -1, " / ".join(short_reason)
-        else:
-            return 0, "조건 불충족: " + " / ".join(long_reason) + " // " + " / ".join(short_reason)
+    def calculate_ichimoku(self, df):
+        df = df.copy()
+        c, b, s, d = self.conversion_period, self.base_period, self.span2_period, self.displacement
+        df['conversion'] = (df['high'].rolling(c).max() + df['low'].rolling(c).min()) / 2
+        df['base'] = (df['high'].rolling(b).max() + df['low'].rolling(b).min()) / 2
+        df['leading_span1'] = ((df['conversion'] + df['base']) / 2).shift(d)
+        df['leading_span2'] = ((df['high'].rolling(s).max() + df['low'].rolling(s).min()) / 2).shift(d)
+        # max(axis=1)/min(axis=1) 과 같이 NaN 은 무시 (fmax/fmin 이 훨씬 빠름)
+        df['kumo_high'] = np.fmax(df['leading_span1'], df['leading_span2'])
+        df['kumo_low'] = np.fmin(df['leading_span1'], df['leading_span2'])
+        df['high26'] = df['high'].shift(d)
+        df['low26'] = df['low'].shift(d)
+        return df
+
+    def latest_ichimoku(self, df, k=-1):
+        """df 의 k-1, k 번째 행(직전봉, 현재봉)의 이치모쿠 값을 IchimokuRow 로 반환"""
+        if self.incremental:
+            graph = self.graph
+            graph.bind(df)
+            return graph.row(self.ichimoku, k - 1), graph.row(self.ichimoku, k)
+        df = self.calculate_ichimoku(as_frame(df))
+        prev = IchimokuRow(*[df[c].iat[k - 1] for c in IchimokuRow._fields])
+        cur = IchimokuRow(*[df[c].iat[k] for c in IchimokuRow._fields])
+        return prev, cur
 
-    def on_tick(self, df, current_price):
+    def evaluate_entry(self, df, k=-1):
         """
-        df: 반드시 실시간으로 받아온 진짜 GBPJPY(등) 최신 봉 시계열 (최신 100개 정도)
-        current_price: 실시간 틱/호가 (진짜 거래소에서 받은 값)
+        df 의 k 번째 봉 기준 진입 신호와 조건 비트마스크 (판단근거 문자열은 만들지 않음)
+        반환값: (1 / -1 / 0, mask)  - mask 비트는 strategy.entry_conditions 참고
         """
-        if self.position == 0:
-            signal, reason = self.check_entry_signal(df)
-            if signal == 1:
-                self.position = 1
-                self.entry_price = current_price
-                self.entry_time = df['time'].iloc[-1]
-                return {
-                    'signal': 'long_entry',
-                    'price': current_price,
-                    'time': self.entry_time,
-                    'symbol': self.symbol,
-                    'reason': reason
-                }
-            elif signal == -1:
-                self.position = -1
-                self.entry_price = current_price
-                self.entry_time = df['time'].iloc[-1]
-                return {
-                    'signal': 'short_entry',
-                    'price': current_price,
-                    'time': self.entry_time,
-                    'symbol': self.symbol,
-                    'reason': reason
-                }
-            else:
-                return None
-
-        if self.position == 1:
-            tp = self.entry_price + self.tp_pips
-            sl = self.entry_price - self.sl_pips
-            if current_price >= tp:
-                result = {
-                    'signal': 'long_exit_tp',
-                    'entry': self.entry_price,
-                    'exit': tp,
-                    'time': df['time'].iloc[-1],
-                    'symbol': self.symbol,
-                    'reason': f'롱 익절(TP 도달) / 진입가: {self.entry_price}, 목표가: {tp}'
-                }
-                self.position = 0
-                self.entry_price = None
-                self.entry_time = None
-                return result
-            elif current_price <= sl:
-                result = {
-                    'signal': 'long_exit_sl',
-                    'entry': self.entry_price,
-                    'exit': sl,
-                    'time': df['time'].iloc[-1],
-                    'symbol': self.symbol,
-                    'reason': f'롱 손절(SL 도달) / 진입가: {self.entry_price}, 손절가: {sl}'
-                }
-                self.position = 0
-                self.entry_price = None
-                self.entry_time = None
-                return result
-            return None
+        i = len(df) + k
+        if i < self.warmup:
+            self.last_mask = NO_DATA
+            return 0, NO_DATA
+        t0 = time.perf_counter_ns()
+        prev, cur = self.latest_ichimoku(df, k)
+        t1 = time.perf_counter_ns()
+        mask = condition_mask(
+            cur.conversion, cur.base, prev.conversion, prev.base,
+            cur.kumo_high, cur.kumo_low, cur.high26, cur.low26, cur.close, self.pip
+        )
+        self.last_mask = mask
+        if self.latency is not None:
+            self.latency.record(self.symbol, 'ichimoku', t1 - t0)
+            self.latency.record(self.symbol, 'signal', time.perf_counter_ns() - t1)
+        return signal_from_mask(mask), mask
 
-        if self.position == -1:
-            tp = self.entry_price - self.tp_pips
-            sl = self.entry_price + self.sl_pips
-            if current_price <= tp:
-                result = {
-                    'signal': 'short_exit_tp',
-                    'entry': self.entry_price,
-                    'exit': tp,
-                    'time': df['time'].iloc[-1],
-                    'symbol': self.symbol,
-                    'reason': f'숏 익절(TP 도달) / 진입가: {self.entry_price}, 목표가: {tp}'
-                }
-                self.position = 0
-                self.entry_price = None
-                self.entry_time = None
-                return result
-            elif current_price >= sl:
-                result = {
-                    'signal': 'short_exit_sl',
-                    'entry': self.entry_price,
-                    'exit': sl,
-                    'time': df['time'].iloc[-1],
-                    'symbol': self.symbol,
-                    'reason': f'숏 손절(SL 도달) / 진입가: {self.entry_price}, 손절가: {sl}'
-                }
-                self.position = 0
-                self.entry_price = None
-                self.entry_time = None
-                return result
-            return None
+    def render_reason(self, signal, mask):
+        return render_reason(signal, mask)
@@ -0,0 +1,30 @@
+# conftest.py
+"""
+테스트 공통 설정.
+- 캐시/저널/틱/로그 경로를 임시 폴더로 (실제 ~/.autoTradeMT5 를 건드리지 않음). dataMT5 import 전에 설정
+- fake_mt5: bench.fake_mt5 가짜 터미널을 공용 세션 backend 로 (로컬 캐시는 테스트마다 비움)
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_ROOT = tempfile.mkdtemp(prefix='autotrade-test-')
+for _name, _sub in (('AUTOTRADE_CACHE_DIR', 'ohlcv'), ('AUTOTRADE_JOURNAL_DIR', 'journal'),
+                    ('AUTOTRADE_TICK_DIR', 'ticks'), ('AUTOTRADE_LOG_DIR', 'logs')):
+    os.environ[_name] = os.path.join(_ROOT, _sub)
+
+
+@pytest.fixture
+def fake_mt5():
+    from bench.fake_mt5 import FakeMT5, install
+    from dataMT5 import ohlcv_store
+
+    with ohlcv_store._stores_lock:
+        ohlcv_store._stores.clear()
+    shutil.rmtree(ohlcv_store.DEFAULT_CACHE_DIR, ignore_errors=True)
+    return install(FakeMT5(history=2000, tick_count=20000))
@@ -0,0 +1,43 @@
+# test_backtest.py
+"""
+백테스트/실시간 전략 결과 일치 확인 (합성 시세, MT5 없이).
+
+    python -m pytest -q tests
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.synthetic import synthetic_frame
+from strategy.backtest import replay_on_tick, run_backtest
+from strategy.real_Ichimoku_Strategy import IchimokuBreakoutStrategyRT
+
+
+@pytest.fixture(scope='module')
+def bars():
+    return synthetic_frame(3000, seed=11)
+
+
+def test_run_backtest_matches_on_tick_replay(bars):
+    fast = run_backtest(bars)
+    slow = replay_on_tick(bars)
+    assert len(fast.trades) > 0
+    pd.testing.assert_frame_equal(fast.trades, slow.trades, check_dtype=False)
+    pd.testing.assert_series_equal(fast.equity, slow.equity)
+    assert (fast.open_trade is None) == (slow.open_trade is None)
+    if fast.open_trade is not None:
+        for key in ('entry_idx', 'position', 'entry_price', 'entry_time'):
+            assert fast.open_trade[key] == slow.open_trade[key]
+
+
+def test_incremental_ichimoku_matches_full_recalc(bars):
+    # 실시간처럼 봉이 하나씩 늘어나는 df 로 봉마다 비교 (지표 그래프 vs 전체 재계산)
+    bars = bars.iloc[:400]
+    fast = IchimokuBreakoutStrategyRT(incremental=True)
+    full = IchimokuBreakoutStrategyRT(incremental=False)
+    for n in range(fast.warmup, len(bars) + 1):
+        df = bars.iloc[:n]
+        for k in (-1, -2):
+            for a, b in zip(fast.latest_ichimoku(df, k), full.latest_ichimoku(df, k)):
+                np.testing.assert_array_equal(np.array(a, dtype=float), np.array(b, dtype=float))
+            assert fast.evaluate_entry(df, k) == full.evaluate_entry(df, k)
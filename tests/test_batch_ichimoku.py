@@ -0,0 +1,50 @@
+# test_batch_ichimoku.py
+"""
+여러 심볼 배치 이치모쿠 커널을 심볼별 전략 계산과 비교 (합성 시세, MT5 없이).
+
+    python -m pytest -q tests/test_batch_ichimoku.py
+"""
+import numpy as np
+import pytest
+
+from bench.synthetic import synthetic_frame
+from strategy.batch_ichimoku import batch_entry_signal, batch_ichimoku, stack_ohlc
+from strategy.real_Ichimoku_Strategy import IchimokuBreakoutStrategyRT
+
+# (봉 개수, 시드, 기준가, pip) - 길이가 다른 심볼 + 워밍업보다 짧은 심볼 포함
+SYMBOLS = [(900, 1, 150.0, 0.01), (520, 2, 160.0, 0.01), (840, 3, 2000.0, 0.1), (60, 4, 1.1, 0.0001),
+           (900, 5, 150.0, 0.001), (700, 6, 1.1, 0.0001)]
+
+
+@pytest.fixture(scope='module')
+def frames():
+    return [synthetic_frame(n, seed=seed, price=price, vol=0.0008, trend_period=120)
+            for n, seed, price, _ in SYMBOLS]
+
+
+def test_batch_ichimoku_matches_calculate_ichimoku(frames):
+    high, low, close, _ = stack_ohlc(frames)
+    cols = batch_ichimoku(high, low, close)
+    strategy = IchimokuBreakoutStrategyRT(incremental=False)
+    for k, df in enumerate(frames):
+        expected = strategy.calculate_ichimoku(df)
+        for name, values in cols.items():
+            np.testing.assert_allclose(values[k, high.shape[1] - len(df):], expected[name].to_numpy(dtype=float),
+                                       rtol=0, atol=1e-12, err_msg=name)
+
+
+def test_batch_entry_signal_matches_check_entry_signal(frames):
+    # 심볼별 전략은 봉이 늘어나는 df 를 받으므로 지표 그래프(증분) 경로 (전체 재계산과 같음은 test_backtest)
+    strategies = [IchimokuBreakoutStrategyRT(pip=pip) for *_, pip in SYMBOLS]
+    pips = [pip for *_, pip in SYMBOLS]
+    n_max = max(len(df) for df in frames)
+    fired = 0
+    # 봉이 하나씩 늘어나는 것처럼 끝 위치를 옮기며 비교 (앞쪽에서 잘린 심볼은 워밍업 규칙으로 0)
+    for end in range(40, n_max + 1):
+        cut = [df.iloc[:max(0, len(df) - (n_max - end))] for df in frames]
+        high, low, close, lengths = stack_ohlc(cut, n=end)
+        got = batch_entry_signal(high, low, close, pip=pips, lengths=lengths)
+        expected = [s.check_entry_signal(df)[0] if len(df) else 0 for s, df in zip(strategies, cut)]
+        assert list(got) == expected, end
+        fired += int(np.count_nonzero(got))
+    assert fired >= 10, fired
@@ -0,0 +1,44 @@
+# test_execution.py
+"""OrderExecutor 주문 가격 (가짜 터미널)"""
+from bench.synthetic import synthetic_frame
+from engine.execution import OrderExecutor
+from strategy.base import RealtimeStrategy
+
+
+class AlwaysStrategy(RealtimeStrategy):
+    name = "Always"
+
+    def __init__(self, side, **kwargs):
+        super().__init__(**kwargs)
+        self.side = side
+
+    def evaluate_entry(self, df, k=-1):
+        return self.side, 0
+
+
+def test_long_entry_uses_ask_for_strategy_and_order(fake_mt5):
+    bars = synthetic_frame(100, seed=1)
+    strategy = AlwaysStrategy(1, symbol="GBPJPY")
+    bid, ask = 150.00, 150.03
+    result = strategy.on_tick(bars, bid, ask=ask)
+    assert result['price'] == ask
+    assert strategy.entry_price == ask
+    assert strategy.tp_price == ask + strategy.tp_pips
+
+    order = OrderExecutor().submit_entry(strategy, result)
+    assert order.price == ask
+    assert order.tp == round(strategy.tp_price, 2)
+    assert order.sl == round(strategy.sl_price, 2)
+
+    # 로컬 청산도 브로커 TP 와 같은 가격에서
+    exit_result = strategy.on_quote(order.tp, order.tp + 0.03, None)
+    assert exit_result['signal'] == 'long_exit_tp'
+    assert exit_result['entry'] == order.price
+
+
+def test_short_entry_uses_bid(fake_mt5):
+    bars = synthetic_frame(100, seed=1)
+    strategy = AlwaysStrategy(-1, symbol="GBPJPY")
+    result = strategy.on_tick(bars, 150.00, ask=150.03)
+    order = OrderExecutor().submit_entry(strategy, result)
+    assert result['price'] == order.price == strategy.entry_price == 150.00
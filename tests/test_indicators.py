@@ -0,0 +1,45 @@
+# test_indicators.py
+"""IndicatorGraph rolling 스트림 (실시간 경로: BarRing 에 봉을 하나씩 추가)"""
+import numpy as np
+
+from bench.synthetic import synthetic_rates
+from dataMT5.bar_ring import BarRing
+from strategy import indicators
+from strategy.indicators import HIGH, LOW, IndicatorGraph, rolling_max, rolling_min
+
+
+def _rolling(arr, window, fn):
+    out = np.full(len(arr), np.nan)
+    for i in range(window - 1, len(arr)):
+        out[i] = fn(arr[i - window + 1:i + 1])
+    return out
+
+
+def test_rolling_stream_matches_full_window_with_o1_pushes(monkeypatch):
+    pushes = []
+    push = indicators.RollingExtrema.push
+    monkeypatch.setattr(indicators.RollingExtrema, 'push',
+                        lambda self, *args: pushes.append(1) or push(self, *args))
+    rates = synthetic_rates(800, seed=5)
+    high_max, low_min = rolling_max(HIGH, 26), rolling_min(LOW, 52)
+    expect_max = _rolling(rates['high'], 26, np.max)
+    expect_min = _rolling(rates['low'], 52, np.min)
+
+    history = 300
+    ring = BarRing(history + 64)
+    ring.load(rates[:history])
+    graph = IndicatorGraph()
+    per_bar = []
+    for n in range(history, len(rates)):
+        bar = rates[n]
+        ring.append(bar['time'], bar['open'], bar['high'], bar['low'], bar['close'])
+        window = ring.window(history)
+        graph.bind(window)
+        before = len(pushes)
+        for k in (-1, -2, -27):
+            i = n + 1 + k  # 전체 rates 기준 인덱스
+            assert graph.value(high_max, k) == expect_max[i]
+            assert graph.value(low_min, k) == expect_min[i]
+        per_bar.append(len(pushes) - before)
+    # 창을 채우는 처음 두 봉 이후로는 새 확정봉마다 스트림당 push 1번 (노드 2개)
+    assert max(per_bar[2:]) == 2
@@ -0,0 +1,77 @@
+# test_ohlcv_store.py
+"""
+로컬 OHLCV 캐시 sync / 캐시 읽기 확인 (가짜 세션/가짜 터미널, MT5 없이).
+
+    python -m pytest -q tests/test_ohlcv_store.py
+"""
+import numpy as np
+import pandas as pd
+
+from bench.synthetic import synthetic_rates
+from dataMT5.collector import get_mt5_ohlcv, get_mt5_rates
+from dataMT5.ohlcv_store import OHLCVStore
+from dataMT5.session import get_session
+
+
+class HistorySession:
+    """copy_rates_from_pos 만 흉내: 전체 봉 중 앞에서 visible 개까지만 보임"""
+    def __init__(self, rates):
+        self.rates = rates
+        self.visible = 0
+
+    def call(self, name, symbol, timeframe, start, count):
+        assert name == 'copy_rates_from_pos'
+        end = self.visible - start
+        return self.rates[max(0, end - count):end]
+
+
+def _assert_contiguous(store, session):
+    times = store.arrays()['time']
+    assert np.all(np.diff(times) == 300)
+    assert times[-1] == session.rates['time'][session.visible - 1]
+
+
+def test_sync_rewrites_short_cache_instead_of_splicing_gap(tmp_path):
+    session = HistorySession(synthetic_rates(5000, seed=1))
+    store = OHLCVStore('GBPJPY', 5, root=str(tmp_path), session=session)
+    session.visible = 100
+    store.sync(n=300)   # 터미널 이력이 짧아서 100개만
+    assert store.count == 100
+    session.visible = 2000   # 캐시 이후로 n 보다 많은 봉이 쌓임
+    store.sync(n=300)
+    assert store.count == 300
+    _assert_contiguous(store, session)
+
+
+def test_sync_rewrites_cache_when_max_fetch_does_not_reach_it(tmp_path):
+    session = HistorySession(synthetic_rates(5000, seed=2))
+    store = OHLCVStore('GBPJPY', 5, root=str(tmp_path), session=session)
+    session.visible = 400
+    store.sync(n=300)
+    session.visible = 4500   # 오래 꺼져 있었음: max_fetch 개로도 마지막 저장 봉까지 안 닿음
+    store.sync(n=300, max_fetch=512)
+    assert store.count == 512
+    _assert_contiguous(store, session)
+    session.visible = 4510   # 이후로는 새 봉만 이어 붙임
+    assert store.sync(n=300, max_fetch=512) == 11
+    assert store.count == 522
+    _assert_contiguous(store, session)
+
+
+def test_cached_bars_are_served_while_mt5_is_down(fake_mt5, monkeypatch):
+    online = get_mt5_ohlcv('GBPJPY', n=300)
+    assert online is not None and len(online) == 300
+    monkeypatch.setattr(get_session(), 'backoff_base', 0.0)
+    monkeypatch.setattr(get_session(), 'health_interval', 0.0)  # 끊김을 바로 감지
+    monkeypatch.setattr(fake_mt5, 'initialize', lambda *a, **k: False)
+    fake_mt5.disconnect()
+    assert not get_session().ensure_connected()
+
+    offline = get_mt5_ohlcv('GBPJPY', n=300)
+    pd.testing.assert_frame_equal(offline, online)
+    rates = get_mt5_rates('GBPJPY', fake_mt5.TIMEFRAME_M5, 300)
+    np.testing.assert_array_equal(rates['close'], online['close'].to_numpy())
+    # 실시간 이력 로드처럼 지금 봉까지 이어져야 하면 캐시만으로는 주지 않음
+    assert get_mt5_rates('GBPJPY', fake_mt5.TIMEFRAME_M5, 300, offline=False) is None
+    # 캐시가 없는 심볼은 그대로 실패
+    assert get_mt5_ohlcv('EURUSD', n=300) is None
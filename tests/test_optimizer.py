@@ -0,0 +1,36 @@
+# test_optimizer.py
+"""
+파라미터 최적화 작업 분할 / 병렬 결과 확인 (합성 시세).
+
+    python -m pytest -q tests/test_optimizer.py
+"""
+import pandas as pd
+
+from bench.synthetic import synthetic_frame
+from strategy.optimizer import DEFAULT_SPACE, WINDOW_KEYS, _tasks, grid_params, optimize, random_params
+
+PARAM_KEYS = list(DEFAULT_SPACE)
+
+
+def test_tasks_cover_every_combination_once_and_scale_with_workers():
+    params = grid_params()
+    for workers in (1, 8, 64):
+        tasks = _tasks(params, workers)
+        combos = [p for _, _, chunk in tasks for p in chunk]
+        assert sorted(map(str, combos)) == sorted(map(str, params))
+        # 한 작업 안은 같은 기간/pip (진입 신호 1번)
+        for windows, pip, chunk in tasks:
+            assert all(tuple(p[k] for k in WINDOW_KEYS) == windows and p['pip'] == pip for p in chunk)
+        assert len(tasks) >= min(len(params), workers * 2)
+    # 기간 조합 수(27)보다 워커가 많아도 작업이 모자라지 않음
+    assert len(_tasks(params, 64)) > 200
+
+
+def test_parallel_result_does_not_depend_on_worker_count():
+    df = synthetic_frame(6000, seed=9)
+    params = random_params(120, seed=3)
+    one = optimize(df, params, workers=1).drop(columns='rank')
+    many = optimize(df, params, workers=3).drop(columns='rank')
+    pd.testing.assert_frame_equal(one.sort_values(PARAM_KEYS).reset_index(drop=True),
+                                  many.sort_values(PARAM_KEYS).reset_index(drop=True))
+    assert len(one) == 120
@@ -0,0 +1,92 @@
+# test_resampler.py
+"""
+틱/M1 -> 상위 봉 집계를 pandas resample 과 비교 (합성 시세, MT5 없이).
+
+    python -m pytest -q tests/test_resampler.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.synthetic import synthetic_rates
+from dataMT5.resampler import Resampler, resample_rates
+from dataMT5.tick_stream import TICK_DTYPE, ReplayTickSource, TickStream
+
+TIMEFRAMES = (60, 300, 900, 3600)
+
+
+@pytest.fixture(scope='module')
+def ticks():
+    # 불규칙한 틱 간격 + 중간중간 몇 봉씩 비는 구간 (주말/장 마감 흉내)
+    rng = np.random.default_rng(5)
+    gaps = rng.exponential(4.0, 40000)
+    gaps[rng.integers(0, len(gaps), 30)] += rng.uniform(600, 7200, 30)
+    time_sec = (1_700_000_123 + np.cumsum(gaps)).astype(np.int64)
+    bid = 150.0 + np.cumsum(rng.standard_normal(len(time_sec))) * 0.01
+    return time_sec, np.round(bid, 3)
+
+
+def _epoch(index):
+    return np.asarray((index - pd.Timestamp(0)) // pd.Timedelta(seconds=1), dtype=np.int64)
+
+
+def _pandas_bars(time_sec, price, seconds):
+    s = pd.Series(price, index=pd.to_datetime(time_sec, unit='s'))
+    bars = s.resample(f'{seconds}s').ohlc()
+    bars['tick_volume'] = s.resample(f'{seconds}s').count()
+    bars = bars[bars['tick_volume'] > 0]
+    bars.index = _epoch(bars.index)
+    return bars
+
+
+def test_tick_aggregation_matches_pandas_resample(ticks):
+    time_sec, bid = ticks
+    closed = {seconds: [] for seconds in TIMEFRAMES}
+    resampler = Resampler()
+    for seconds in TIMEFRAMES:
+        resampler.subscribe(seconds, on_bar=lambda sec, bar: closed[sec].append(bar))
+    for t, p in zip(time_sec.tolist(), bid.tolist()):
+        resampler.update(t, p)
+
+    for seconds in TIMEFRAMES:
+        expected = _pandas_bars(time_sec, bid, seconds)
+        bars = closed[seconds] + [resampler.current(seconds)]   # 마감된 봉 + 진행 중 봉
+        got = pd.DataFrame([(b.time, b.open, b.high, b.low, b.close, b.tick_volume) for b in bars],
+                           columns=['time', 'open', 'high', 'low', 'close', 'tick_volume']).set_index('time')
+        np.testing.assert_array_equal(got.index, expected.index)
+        for column in ('open', 'high', 'low', 'close', 'tick_volume'):
+            np.testing.assert_array_equal(got[column].to_numpy(), expected[column].to_numpy(), err_msg=column)
+
+
+def test_resample_rates_matches_pandas_resample():
+    # 상위 봉 경계 중간에서 시작하는 M1 (잘린 첫 봉은 버림)
+    m1 = synthetic_rates(5000, seed=7, start=1_700_000_000 - 1_700_000_000 % 60 + 17 * 60, seconds=60)
+    m1['tick_volume'] = np.arange(1, len(m1) + 1)
+    frame = pd.DataFrame({c: m1[c] for c in ('open', 'high', 'low', 'close', 'tick_volume')},
+                         index=pd.to_datetime(m1['time'], unit='s'))
+    for seconds in (300, 900, 3600, 14400):
+        got = resample_rates(m1, seconds)
+        expected = frame.resample(f'{seconds}s').agg(
+            {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'tick_volume': 'sum'})
+        expected = expected.iloc[1:] if m1['time'][0] % seconds else expected
+        np.testing.assert_array_equal(got['time'], _epoch(expected.index))
+        for column in ('open', 'high', 'low', 'close', 'tick_volume'):
+            np.testing.assert_array_equal(got[column], expected[column].to_numpy(), err_msg=column)
+
+
+def test_tick_stream_on_bar_does_not_replace_shared_callback():
+    ticks = np.zeros(6, dtype=TICK_DTYPE)
+    ticks['time_msc'] = np.array([0, 30, 61, 90, 121, 400]) * 1000 + 1_700_000_000 // 3600 * 3600 * 1000
+    ticks['bid'] = ticks['ask'] = 1.0
+    shared, first, second = [], [], []
+    resampler = Resampler(on_bar=lambda sec, bar: shared.append(sec))
+    TickStream(ReplayTickSource(ticks), timeframes=(60,), resampler=resampler,
+               on_bar=lambda sec, bar: first.append(sec))
+    stream = TickStream(ReplayTickSource(ticks), timeframes=(300,), resampler=resampler,
+                        on_bar=lambda sec, bar: second.append(sec))
+    while stream.poll():
+        pass
+    # 각 스트림은 자기가 구독한 타임프레임만, 공용 on_bar 는 전부 그대로
+    assert first == [60, 60, 60]
+    assert second == [300]
+    assert sorted(shared) == [60, 60, 60, 300]
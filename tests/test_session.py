@@ -0,0 +1,147 @@
+# test_session.py
+"""
+MT5Session 재연결 / backoff 확인 (가짜 터미널 + 가짜 시계, 실제로 기다리지 않음).
+
+    python -m pytest -q tests/test_session.py
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from bench.fake_mt5 import FakeMT5
+from dataMT5 import session as session_module
+from dataMT5.session import MT5Session
+
+
+class FlakyMT5(FakeMT5):
+    """down 인 동안 initialize 가 실패하는 가짜 터미널"""
+    down = False
+
+    def initialize(self, *args, **kwargs):
+        if self.down:
+            self.calls['initialize'] += 1
+            self.disconnect()
+            return False
+        return super().initialize(*args, **kwargs)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """session 모듈의 time 을 가짜 시계로 (sleep 은 시계만 옮김)"""
+    fake = SimpleNamespace(now=1000.0, sleeps=[])
+    fake.monotonic = lambda: fake.now
+    fake.perf_counter = time.perf_counter
+
+    def sleep(seconds):
+        fake.sleeps.append(seconds)
+        fake.now += seconds
+    fake.sleep = sleep
+    monkeypatch.setattr(session_module, 'time', fake)
+    return fake
+
+
+@pytest.fixture
+def terminal():
+    return FlakyMT5(history=100, tick_count=100)
+
+
+def _session(terminal, **kwargs):
+    kwargs.setdefault('log_fn', lambda text: None)
+    return MT5Session(backend=terminal, backoff_base=0.5, backoff_max=4.0, health_interval=5.0, **kwargs)
+
+
+def test_failed_connects_back_off_exponentially(terminal, clock):
+    session = _session(terminal)
+    terminal.down = True
+    attempts_at = []
+    for _ in range(200):
+        before = terminal.calls['initialize']
+        assert not session.ensure_connected()
+        if terminal.calls['initialize'] > before:
+            attempts_at.append(clock.now)
+        clock.now += 0.25
+    gaps = [b - a for a, b in zip(attempts_at, attempts_at[1:])]
+    # 실패할 때마다 간격 2배 (0.5, 1, 2, 4), backoff_max 에서 멈춤
+    assert gaps[:5] == [0.5, 1.0, 2.0, 4.0, 4.0]
+    assert set(gaps[4:]) == {4.0}
+
+    terminal.down = False
+    clock.now += 4.0
+    assert session.ensure_connected()
+    assert session.connected and session._failures == 0
+    # 연결되면 다음 실패는 다시 짧은 간격부터
+    terminal.down = True
+    session.shutdown()
+    assert not session.ensure_connected()
+    assert session._next_attempt - clock.now == 0.5
+
+
+def test_dropped_connection_is_detected_and_reconnected(terminal, clock):
+    session = _session(terminal)
+    assert session.call('symbol_info_tick', 'GBPJPY') is not None
+    terminal.disconnect()   # 터미널 쪽에서 끊김
+    # 호출이 None 이면 health check -> 재연결 -> 1회 재시도
+    assert session.call('symbol_info_tick', 'GBPJPY') is not None
+    assert session.reconnects == 1
+    assert terminal.calls['initialize'] == 2
+
+    # 한동안 호출이 없었으면 다음 호출 전에 terminal_info 로 확인
+    terminal.disconnect()
+    clock.now += 10.0
+    assert session.ensure_connected()
+    assert session.reconnects == 2
+
+    # 끊긴 동안 재연결이 안 되면 backoff 시각까지는 시도 없이 바로 실패
+    terminal.disconnect()
+    terminal.down = True
+    clock.now += 10.0
+    assert session.call('symbol_info_tick', 'GBPJPY') is None
+    calls = terminal.calls['initialize']
+    assert session.call('symbol_info_tick', 'GBPJPY') is None
+    assert terminal.calls['initialize'] == calls
+    terminal.down = False
+    clock.now += 0.5
+    assert session.call('symbol_info_tick', 'GBPJPY') is not None
+
+
+def test_wait_retries_outside_the_lock(terminal, clock):
+    session = _session(terminal, max_retries=4)
+    terminal.down = True
+    assert not session.ensure_connected(wait=True)
+    assert terminal.calls['initialize'] == 4
+    assert clock.sleeps == [0.5, 1.0, 2.0]
+
+    # 기다리는 동안 락이 풀려 있어서 다른 스레드(매매 주기)가 막히지 않음
+    free = []
+
+    def probe():
+        if session.lock.acquire(blocking=False):
+            session.lock.release()
+            free.append(True)
+        else:
+            free.append(False)
+
+    def sleep(seconds):
+        checker = threading.Thread(target=probe)
+        checker.start()
+        checker.join()
+        clock.now += seconds
+    clock.sleep = sleep
+    clock.now += 10.0
+    assert not session.ensure_connected(wait=True)
+    assert free == [True, True, True]
+
+
+def test_new_backend_connects_without_old_backoff(terminal, clock):
+    session = _session(terminal)
+    terminal.down = True
+    for _ in range(4):
+        clock.now = session._next_attempt
+        assert not session.ensure_connected()
+    assert session._failures == 4 and session._next_attempt > clock.now
+    fresh = FlakyMT5(history=100, tick_count=100)
+    session.set_backend(fresh)
+    assert session.ensure_connected()
+    assert fresh.calls['initialize'] == 1
@@ -0,0 +1,64 @@
+# test_tick_stream.py
+"""
+틱 수집 확인 (가짜 세션, MT5 없이).
+
+    python -m pytest -q tests/test_tick_stream.py
+"""
+from types import SimpleNamespace
+
+import numpy as np
+
+from dataMT5.tick_stream import TICK_DTYPE, MT5TickSource
+
+
+class TickSession:
+    """symbol_info_tick / copy_ticks_from 만 흉내: 지금까지 도착한 틱 중 from 초 이후를 max_count 개까지"""
+    def __init__(self):
+        self.mt5 = SimpleNamespace(COPY_TICKS_ALL=-1)
+        self.ticks = np.empty(0, dtype=TICK_DTYPE)
+
+    def arrive(self, msc, bid):
+        new = np.zeros(len(msc), dtype=TICK_DTYPE)
+        new['time_msc'] = msc
+        new['time'] = np.asarray(msc) // 1000
+        new['bid'] = bid
+        new['ask'] = np.asarray(bid) + 0.01
+        self.ticks = np.concatenate([self.ticks, new])
+
+    def call(self, name, symbol, *args):
+        if name == 'symbol_info_tick':
+            return SimpleNamespace(time_msc=int(self.ticks['time_msc'][-1])) if len(self.ticks) else None
+        assert name == 'copy_ticks_from'
+        from_sec, count, _flags = args
+        return self.ticks[self.ticks['time_msc'] >= from_sec * 1000][:count]
+
+
+def test_ticks_with_equal_time_msc_are_passed_once():
+    session = TickSession()
+    session.arrive([5_000_100], [1.0])
+    source = MT5TickSource('GBPJPY', session=session)
+    seen = [source.fetch()]
+    # 같은 ms 에 틱이 여러 개 + 가져간 뒤 같은 ms 로 또 도착
+    session.arrive([5_000_100, 5_000_200, 5_000_200], [1.1, 1.2, 1.3])
+    seen.append(source.fetch())
+    session.arrive([5_000_200, 5_000_200, 5_000_900], [1.4, 1.5, 1.6])
+    seen.append(source.fetch())
+    seen.append(source.fetch())   # 새 틱 없음
+    session.arrive([5_001_000, 5_001_000], [1.7, 1.8])
+    seen.append(source.fetch())
+
+    assert [len(ticks) for ticks in seen] == [1, 3, 3, 0, 2]
+    bids = np.concatenate([ticks['bid'] for ticks in seen])
+    np.testing.assert_array_equal(bids, session.ticks['bid'])
+
+
+def test_equal_time_msc_run_at_batch_end_is_continued():
+    session = TickSession()
+    session.arrive([7_000_000], [1.0])
+    source = MT5TickSource('GBPJPY', session=session)
+    source.fetch()
+    session.arrive([7_000_500] * 3, [1.1, 1.2, 1.3])
+    assert list(source.fetch()['bid']) == [1.1, 1.2, 1.3]
+    session.arrive([7_000_500] * 2 + [7_000_600], [1.4, 1.5, 1.6])
+    assert list(source.fetch()['bid']) == [1.4, 1.5, 1.6]
+    assert len(source.fetch()) == 0
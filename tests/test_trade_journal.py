@@ -0,0 +1,117 @@
+# test_trade_journal.py
+"""
+거래 저널 기록/복구 확인 (리플레이로 만든 진입/청산, MT5 없이).
+
+    python -m pytest -q tests/test_trade_journal.py
+"""
+import os
+
+import numpy as np
+import pytest
+
+from bench.synthetic import synthetic_frame, synthetic_ticks
+from engine.replay import Replay
+from engine.trade_journal import HEADER_SIZE, JOURNAL_DTYPE, TradeJournal
+from strategy.real_Ichimoku_Strategy import IchimokuBreakoutStrategyRT
+
+SYMBOL = 'GBPJPY'
+
+
+@pytest.fixture(scope='module')
+def market():
+    start = 1_700_000_000 // 300 * 300
+    history = synthetic_frame(400, seed=3, start=start - 400 * 300)
+    ticks = synthetic_ticks(30000, seed=4, start_msc=start * 1000, price=float(history['close'].iat[-1]),
+                            vol=0.0002, trend_period=3000)
+    return history, ticks[:8000]
+
+
+def _entry(price=1.0):
+    return {'signal': 'long_entry', 'price': price, 'time': None, 'mask': 3}
+
+
+def test_restore_positions_and_trades_after_crash(market, tmp_path):
+    history, ticks = market
+    path = str(tmp_path / 'trades.bin')
+    journal = TradeJournal(path, fsync=False)
+    replay = Replay()
+    replay.engine.journal = journal
+    live = IchimokuBreakoutStrategyRT(symbol=SYMBOL)
+    replay.add(live, SYMBOL, ticks, history)
+    replay.run()
+    assert journal.flush()
+    # 이 구간 끝에 청산된 거래와 열린 포지션이 둘 다 있어야 의미 있는 확인
+    assert replay.trades.count > 0 and live.position != 0
+    # close 없이 죽은 것처럼: 쓰다 만 레코드가 꼬리에 남음
+    with open(path, 'ab') as f:
+        f.write(b'\x01' * (JOURNAL_DTYPE.itemsize // 2))
+
+    state = TradeJournal(path, fsync=False).recover()
+    restored = IchimokuBreakoutStrategyRT(symbol=SYMBOL)
+    assert state.restore(restored)
+    assert (restored.position, restored.entry_price, restored.entry_time) == \
+        (live.position, live.entry_price, live.entry_time)
+    assert (restored.tp_price, restored.sl_price) == (live.tp_price, live.sl_price)
+
+    store = state.trades(restored)
+    assert store.count == replay.trades.count
+    for column in ('entry_time', 'exit_time', 'position', 'entry_price', 'exit_price', 'profit', 'lot'):
+        np.testing.assert_array_equal(store.column(column), replay.trades.column(column))
+    assert [store.reason(i) for i in range(store.count)] == \
+        [replay.trades.reason(i) for i in range(store.count)]
+
+    # 설정이 다른 전략은 같은 심볼이라도 따로 복구
+    other = IchimokuBreakoutStrategyRT(symbol=SYMBOL, tp_pips=live.tp_pips + 1)
+    assert not state.restore(other) and other.position == 0
+
+
+def test_truncated_tail_is_ignored_and_cut_on_reopen(tmp_path):
+    path = str(tmp_path / 'trades.bin')
+    strategy = IchimokuBreakoutStrategyRT(symbol=SYMBOL)
+    journal = TradeJournal(path, fsync=False)
+    for k in range(3):
+        journal.record(SYMBOL, strategy, _entry(1.0 + k))
+    assert journal.flush()
+    journal.close()
+    with open(path, 'ab') as f:
+        f.write(b'\x01' * 10)
+
+    reopened = TradeJournal(path, fsync=False)
+    assert len(reopened.recover()) == 3
+    reopened.record(SYMBOL, strategy, _entry(9.0))
+    assert reopened.flush()
+    reopened.close()
+    records = reopened.recover().records
+    assert (os.path.getsize(path) - HEADER_SIZE) % JOURNAL_DTYPE.itemsize == 0
+    assert list(records['price']) == [1.0, 2.0, 3.0, 9.0]
+
+
+def test_failed_writes_are_kept_and_retried(tmp_path):
+    # 저널 폴더 자리에 파일이 있어서 열기 실패 -> 치우면 보류한 레코드를 순서대로 씀
+    blocker = tmp_path / 'journal'
+    blocker.write_bytes(b'')
+    path = str(blocker / 'trades.bin')
+    strategy = IchimokuBreakoutStrategyRT(symbol=SYMBOL)
+    journal = TradeJournal(path, fsync=False, retry_seconds=0.02)
+    for k in range(5):
+        journal.record(SYMBOL, strategy, _entry(1.0 + k))
+    assert not journal.flush(timeout=0.2)
+    assert journal.written == 0 and journal.dropped == 0
+
+    blocker.unlink()
+    journal.record(SYMBOL, strategy, _entry(6.0))
+    assert journal.flush(timeout=5.0)
+    journal.close()
+    assert journal.dropped == 0
+    assert list(journal.recover().records['price']) == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+
+
+def test_unwritten_records_are_counted_as_dropped_on_close(tmp_path):
+    blocker = tmp_path / 'journal'
+    blocker.write_bytes(b'')
+    strategy = IchimokuBreakoutStrategyRT(symbol=SYMBOL)
+    journal = TradeJournal(str(blocker / 'trades.bin'), fsync=False, retry_seconds=0.02)
+    for k in range(4):
+        journal.record(SYMBOL, strategy, _entry(1.0 + k))
+    journal.close()
+    assert journal.written == 0 and journal.dropped == 4
@@ -0,0 +1,50 @@
+# test_trade_store.py
+"""TradeStore / RowOrder (블로터 저장소와 정렬 순서, Qt 없이)"""
+import numpy as np
+import pytest
+
+from engine.trade_store import RowOrder, TradeStore
+
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_row_order_matches_full_sort(descending):
+    rng = np.random.default_rng(3)
+    keys = np.round(rng.standard_normal(5000), 1)  # 같은 키가 많음
+    read = []
+
+    def keys_of(rows):
+        read.append(len(rows))
+        return keys[rows]
+
+    order = RowOrder(keys_of, descending, capacity=16)
+    order.reset(np.arange(100))
+    added = 100
+    while added < len(keys):
+        n = int(rng.integers(1, 50))
+        order.add(np.arange(added, min(added + n, len(keys))))
+        added = min(added + n, len(keys))
+        expect = np.argsort(keys[:added], kind='stable')
+        if descending:
+            expect = expect[::-1]
+        np.testing.assert_array_equal(order.rows(), expect)
+    assert [order.at(i) for i in range(5)] == list(order.rows()[:5])
+    # 추가할 때는 새 행 키만 읽음
+    assert sum(read) == len(keys)
+
+
+def test_row_order_without_keys_keeps_insert_order():
+    order = RowOrder(capacity=2)
+    order.reset([5, 1])
+    order.add([7, 3, 9])
+    np.testing.assert_array_equal(order.rows(), [5, 1, 7, 3, 9])
+
+
+def test_store_reason_is_lazy():
+    store = TradeStore(capacity=2)
+    calls = []
+    cols = {name: np.arange(3) for name in ('entry_time', 'exit_time', 'position', 'entry_price',
+                                            'exit_price', 'profit', 'lot')}
+    store.extend(cols, reason_fn=lambda k: calls.append(k) or f"r{k}")
+    assert store.count == 3 and calls == []
+    assert store.reason(2) == "r2" and store.reason(2) == "r2"
+    assert calls == [2]
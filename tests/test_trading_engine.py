@@ -0,0 +1,42 @@
+# test_trading_engine.py
+"""TradingEngine / SymbolTrader (가짜 터미널, 워커 스레드 없이 run_once 직접 호출)"""
+from dataMT5.session import get_session
+from engine import trading_engine
+from engine.trading_engine import SymbolTrader, TradingEngine
+from strategy.real_Ichimoku_Strategy import IchimokuBreakoutStrategyRT
+
+
+def test_history_load_is_retried_after_reconnect(fake_mt5, monkeypatch):
+    monkeypatch.setattr(trading_engine, 'LOAD_RETRY_SECONDS', 0.0)
+    monkeypatch.setattr(get_session(), 'backoff_base', 0.0)
+    monkeypatch.setattr(fake_mt5, 'initialize', lambda *args, **kwargs: False)  # 시작 시 MT5 꺼져 있음
+    logs = []
+    engine = TradingEngine(log_fn=logs.append)
+    trader = SymbolTrader(IchimokuBreakoutStrategyRT(symbol="GBPJPY"), "GBPJPY")
+    engine.add(trader)
+
+    engine.run_once()
+    assert not trader.series.loaded
+    assert trader in engine._pending_start
+    assert any('초기 봉 로드 실패' in line for line in logs)
+
+    monkeypatch.undo()  # MT5 다시 연결됨
+    monkeypatch.setattr(trading_engine, 'LOAD_RETRY_SECONDS', 0.0)
+    monkeypatch.setattr(get_session(), 'backoff_base', 0.0)
+    fake_mt5.advance(5)
+    engine.run_once()
+    assert trader.series.loaded
+    assert trader.feed.bid is not None
+    assert not engine._pending_start
+    assert any('초기 봉 로드 성공' in line for line in logs)
+
+
+def test_removed_trader_is_not_retried(fake_mt5, monkeypatch):
+    monkeypatch.setattr(fake_mt5, 'initialize', lambda *args, **kwargs: False)
+    engine = TradingEngine(log_fn=lambda line: None)
+    trader = SymbolTrader(IchimokuBreakoutStrategyRT(symbol="GBPJPY"), "GBPJPY")
+    engine.add(trader)
+    engine.run_once()
+    engine.remove(trader)
+    engine.run_once()
+    assert not engine._pending_start